@@ -0,0 +1,52 @@
+from time import perf_counter as _perf_counter
+
+from numpy import abs as _abs, arange as _arange, interp as _interp, mean as _mean, ndarray as _ndarray, sin as _sin, \
+    sqrt as _sqrt
+from numpy.random import default_rng as _default_rng
+
+from leads.data_persistence import lttb_compressor, mean_compressor, minmax_compressor
+
+
+def _speed_signal(n: int, seed: int) -> _ndarray:
+    rng = _default_rng(seed)
+    t = _arange(n)
+    signal = 20 + 10 * _sin(t * 2e-4) + rng.normal(0, .5, n).cumsum() * .01 + rng.normal(0, .2, n)
+    # short spikes such as brake events that averaging tends to erase
+    spikes = rng.choice(n, max(n // 10000, 1), replace=False)
+    for d in range(3):
+        signal[_abs(spikes - d) % n] -= 15
+    return signal
+
+
+def compressor_benchmark(sizes: tuple[int, ...] = (100000, 1000000, 10000000), target_size: int = 1000,
+                         seed: int = 0) -> dict[str, dict[str, float]]:
+    """
+    Compare the compressors on a synthetic speed signal with spikes.
+    The fidelity is measured by the relative error of the extremes and the root mean square error after linear
+    interpolation back to the original points.
+    :param sizes: the numbers of points
+    :param target_size: the expected size after compression
+    :param seed: the random seed
+    :return: {case: {"time": milliseconds, "extreme error": relative error, "rmse": root mean square error}}
+    """
+    r = {}
+    for n in sizes:
+        elements = _speed_signal(n, seed)
+        indexes = _arange(n)
+        value_range = elements.max() - elements.min()
+        for name, compressor in (("mean", mean_compressor), ("lttb", lttb_compressor), ("minmax", minmax_compressor)):
+            start = _perf_counter()
+            e, i = compressor(elements, indexes, target_size)
+            elapsed = _perf_counter() - start
+            r[f"{name} {n}"] = {
+                "time": elapsed * 1000,
+                "extreme error": float(max(elements.max() - e.max(), e.min() - elements.min()) / value_range),
+                "rmse": float(_sqrt(_mean((_interp(indexes, i, e) - elements) ** 2)))
+            }
+    return r
+
+
+if __name__ == "__main__":
+    for case, result in compressor_benchmark().items():
+        print(f"{case}: {result["time"]:.2f} ms, extreme error {result["extreme error"]:.4f}, "
+              f"rmse {result["rmse"]:.4f}")
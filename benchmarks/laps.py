@@ -0,0 +1,88 @@
+from os.path import join as _join
+from tempfile import TemporaryDirectory as _TemporaryDirectory
+from time import perf_counter as _perf_counter
+from typing import Any as _Any
+
+from numpy import arange as _arange, cos as _cos, pi as _pi, sin as _sin
+from numpy.random import default_rng as _default_rng
+from pandas import DataFrame as _DataFrame
+
+from leads import dlat2meters, dlon2meters
+from leads.data_persistence import CSVDataset
+
+
+def _synthetic_session(file: str, num_laps: int, lap_size: int, seed: int) -> None:
+    rng = _default_rng(seed)
+    n = num_laps * lap_size
+    # an elliptical track of about 1.7 km driven at 10 Hz with a few meters of GPS noise
+    angle = _arange(n) * 2 * _pi / lap_size
+    _DataFrame({
+        "t": 1700000000000 + _arange(n) * 100,
+        "speed": 60 + 10 * _sin(angle * 4),
+        "mileage": _arange(n) * 1.7 / lap_size,
+        "gps_valid": rng.random(n) > .05,
+        "latitude": 43 + .0025 * _sin(angle) + rng.normal(0, 1e-5, n),
+        "longitude": -79 + .004 * _cos(angle) + rng.normal(0, 1e-5, n)
+    }).rename_axis("index").to_csv(file)
+
+
+def _path_list_laps(processor: _Any, vehicle_hit_box: float, min_lap_time: float) -> int:
+    # the lap detection as it was before the occupancy grid was hashed
+    path, laps, lap = [], 0, None
+    min_lat, min_lon = processor.grid_origin()
+
+    def unit(row: dict[str, _Any], i: int) -> None:
+        nonlocal laps, lap
+        lat, lon = row["latitude"], row["longitude"]
+        p = (round(dlat2meters(lat - min_lat) / vehicle_hit_box),
+             round(dlon2meters(lon - min_lon, lat) / vehicle_hit_box))
+        try:
+            index = path.index(p)
+        except ValueError:
+            index = -1
+        if lap is None:
+            lap = (int(row["t"]), row["mileage"])
+        duration, distance = int(row["t"]) - lap[0], row["mileage"] - lap[1]
+        if 0 < index < .5 * len(path) and duration >= min_lap_time * 1000 and distance * 2000 > vehicle_hit_box:
+            laps += 1
+            path.clear()
+            lap = None
+        else:
+            path.append(p)
+
+    processor.foreach(unit, skip_gps_invalid_rows=True)
+    return laps
+
+
+def lap_detection_benchmark(num_laps: int = 50, lap_size: int = 1200, vehicle_hit_box: float = 3,
+                            min_lap_time: float = 30, seed: int = 0) -> dict[str, float]:
+    """
+    Compare the lap detection with the path list and with the hashed occupancy grid on a synthetic session.
+    Requires `matplotlib`.
+    :param num_laps: the number of laps in the session
+    :param lap_size: the number of rows in each lap
+    :param vehicle_hit_box: the vehicle hit box in meters
+    :param min_lap_time: the minimum lap time in seconds
+    :param seed: the random seed
+    :return: {case: seconds} and the number of laps each case detected
+    """
+    from leads.data_persistence.analyzer.processor import Processor
+
+    with _TemporaryDirectory() as directory:
+        _synthetic_session(file := _join(directory, "session.csv"), num_laps, lap_size, seed)
+        processor = Processor(CSVDataset(file, 10000))
+        processor.bake()
+        start = _perf_counter()
+        legacy_laps = _path_list_laps(processor, vehicle_hit_box, min_lap_time)
+        legacy = _perf_counter() - start
+        start = _perf_counter()
+        processor.process(vehicle_hit_box=vehicle_hit_box, min_lap_time=min_lap_time)
+        grid = _perf_counter() - start
+        processor.close()
+    return {"path list": legacy, "hashed grid": grid, "path list laps": legacy_laps,
+            "hashed grid laps": processor.num_laps()}
+
+
+if __name__ == "__main__":
+    for case, value in lap_detection_benchmark().items():
+        print(f"{case}: {value}")
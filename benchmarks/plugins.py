@@ -0,0 +1,79 @@
+from typing import Any as _Any, override as _override
+
+from benchmarks.utils import measure
+from leads import Context, DataContainer, LEADS, Plugin, SFT, SuspensionEvent, has_device
+
+
+class _BenchmarkPlugin(Plugin):
+    def __init__(self) -> None:
+        super().__init__(("speed", "front_wheel_speed", "rear_wheel_speed"))
+        self.slip: float = 0
+
+    @_override
+    def pre_update(self, context: Context, kwargs: dict[str, _Any]) -> None:
+        self.slip = kwargs["rear_wheel_speed"] - kwargs["front_wheel_speed"]
+
+
+class _Suspension(Exception):
+    def __init__(self, event: SuspensionEvent) -> None:
+        super().__init__()
+        self.event: SuspensionEvent = event
+
+
+def _reflective_plugin_callback(context: LEADS, plugins: dict[str, Plugin], method: str) -> None:
+    # the dispatch as it was before the table was compiled
+    for key, plugin in plugins.items():
+        if plugin.enabled():
+            try:
+                for tag in plugin.required_devices():
+                    if not has_device(tag) or not SFT.device_ok(tag):
+                        raise _Suspension(SuspensionEvent(context, key, f"Device {tag} not ok"))
+                kwargs = {}
+                for d in plugin.required_data():
+                    try:
+                        kwargs[d] = getattr(context.data(), d)
+                    except AttributeError:
+                        raise _Suspension(SuspensionEvent(context, key, f"No data for `{d}`"))
+                getattr(plugin, method)(context, kwargs)
+            except _Suspension as e:
+                context.suspend(e.event)
+
+
+def plugin_dispatch_benchmark(num_plugins: int = 4, num_frames: int = 10000) -> dict[str, float]:
+    """
+    Compare the per-frame cost of `push()` and `update()` with and without the compiled dispatch table.
+    The reflective case drives a context without plugins and dispatches the hooks itself.
+    :param num_plugins: the number of plugins registered
+    :param num_frames: the number of frames to simulate
+    :return: {case: microseconds per frame}
+    """
+    data = DataContainer(speed=10, front_wheel_speed=10, rear_wheel_speed=11)
+    bare, compiled = LEADS(data), LEADS(data)
+    plugins = {str(i): _BenchmarkPlugin() for i in range(num_plugins)}
+    for key, plugin in plugins.items():
+        compiled.plugin(key, plugin)
+
+    def no_plugins() -> None:
+        bare.push(data)
+        bare.update()
+
+    def reflective() -> None:
+        _reflective_plugin_callback(bare, plugins, "pre_push")
+        bare.push(data)
+        _reflective_plugin_callback(bare, plugins, "post_push")
+        _reflective_plugin_callback(bare, plugins, "pre_update")
+        bare.update()
+        _reflective_plugin_callback(bare, plugins, "post_update")
+
+    def compiled_dispatch() -> None:
+        compiled.push(data)
+        compiled.update()
+
+    return {"no plugins": measure(no_plugins, num_frames) * 1e6,
+            "reflective dispatch": measure(reflective, num_frames) * 1e6,
+            "compiled dispatch": measure(compiled_dispatch, num_frames) * 1e6}
+
+
+if __name__ == "__main__":
+    for case, us in plugin_dispatch_benchmark().items():
+        print(f"{case}: {us:.2f} us/frame")
@@ -0,0 +1,14 @@
+from time import perf_counter as _perf_counter
+from typing import Callable as _Callable
+
+
+def measure(target: _Callable[[], None], num_loops: int = 10000) -> float:
+    """
+    :param target: the workload
+    :param num_loops: the number of repetitions
+    :return: the average time per call in seconds
+    """
+    start = _perf_counter()
+    for _ in range(num_loops):
+        target()
+    return (_perf_counter() - start) / num_loops
@@ -1,11 +1,15 @@
+from leads.codec import *
 from leads.config import *
 from leads.context import *
 from leads.data import *
 from leads.dt import *
 from leads.event import *
+from leads.history import *
 from leads.leads import *
 from leads.logger import Level, L
 from leads.ltm import *
 from leads.plugin import *
 from leads.registry import *
+from leads.rolling import *
+from leads.scheduler import *
 from leads.sft import SFT, mark_device, read_device_marker
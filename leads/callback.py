@@ -1,23 +1,51 @@
-from typing import Self as _Self
-
-from leads.os import _currentframe
+from sys import _getframe
+from types import CodeType as _CodeType, FunctionType as _FunctionType
+from typing import Self as _Self, Callable as _Callable
 
 
 class CallbackChain(object):
+    """
+    The successor of every callback method is resolved when the chain is bound and keyed by the code of the method on
+    this class, so `super()` finds it with a dictionary lookup on the calling frame instead of raising an exception
+    and comparing names.
+    """
+    __callback_methods__: frozenset[str] = frozenset()
+    __callback_codes__: dict[str, _CodeType] = {}
+    _chain: _Self | None = None
+    _successors: dict[_CodeType, _Callable[..., None] | None] = {}
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        methods = set()
+        for base in cls.__mro__[1:]:
+            methods.update(getattr(base, "__callback_methods__", ()))
+        for name, method in cls.__dict__.items():
+            if not name.startswith("_") and name not in ("super", "bind_chain") and isinstance(method, _FunctionType):
+                methods.add(name)
+        cls.__callback_methods__ = frozenset(methods)
+        cls.__callback_codes__ = {name: code for name in methods if (
+            code := getattr(getattr(cls, name), "__code__", None)) is not None}
+
     def __init__(self, chain: _Self | None = None) -> None:
-        self._chain: CallbackChain | None = chain
+        self.bind_chain(chain)
 
     def bind_chain(self, chain: _Self | None) -> None:
         self._chain = chain
+        self._successors = {} if chain is None else {
+            code: getattr(chain, name, None) for name, code in type(self).__callback_codes__.items()}
 
     def super(self, *args, **kwargs) -> None:
         """
         Call the superior method if there is one.
-        This must be called directly in the corresponding successor method.
+        This must be called in the corresponding successor method, either directly or through helpers, in the same
+        thread.
+        :exception RuntimeError: called outside any callback method
         """
-        if not self._chain:
+        if self._chain is None:
             return
-        cf = _currentframe().f_back
-        while (cn := cf.f_code.co_name) == "super":
-            cf = cf.f_back
-        getattr(self._chain, cn)(*args, **kwargs)
+        successors, frame = self._successors, _getframe(1)
+        while (code := frame.f_code) not in successors:
+            if (frame := frame.f_back) is None:
+                raise RuntimeError("`super()` must be called within a callback method")
+        if successor := successors[code]:
+            successor(*args, **kwargs)
@@ -0,0 +1,136 @@
+from base64 import b64encode as _b64encode, b64decode as _b64decode
+from json import dumps as _dumps, loads as _loads
+from struct import Struct as _Struct
+from typing import Any as _Any, Callable as _Callable, get_type_hints as _get_type_hints
+
+from leads.data import DataContainer
+
+CODEC_VERSION: int = 1
+BINARY_PREFIX: bytes = b"#"
+SCHEMA_REQUEST: bytes = b"schema"
+
+_HEADER: _Struct = _Struct("<BBB")
+_KIND_SCHEMA: int = 0
+_KIND_FRAME: int = 1
+
+
+_COERCIONS: dict[str, _Callable[[_Any], _Any]] = {"?": bool, "q": int, "d": float}
+_FORMATS: dict[type, str] = {bool: "?", int: "q", float: "d"}
+
+
+def _format_of(value: _Any) -> str | None:
+    if isinstance(value, bool):
+        return "?"
+    if isinstance(value, (int, float)):
+        return "d"
+    return None
+
+
+def _declared_formats(cls: type[DataContainer]) -> dict[str, str]:
+    hints = _get_type_hints(cls.__init__)
+    r = {"t": "q"}
+    for name in cls.schema() or ():
+        if fmt := _FORMATS.get(hints.get(name)):
+            r[name] = fmt
+    return r
+
+
+def is_binary(msg: bytes) -> bool:
+    """
+    :param msg: the message received
+    :return: True: the message is produced by `BinaryEncoder`; False: otherwise
+    """
+    return msg.startswith(BINARY_PREFIX)
+
+
+class BinaryEncoder(object):
+    """
+    Pack data frames into versioned binary messages.
+    Scalar fields (booleans and numbers) are struct-packed following a schema that is sent ahead of the frames whenever
+    it changes or is requested. The format of a declared field is derived once from the annotation in the container
+    class and the values are coerced to it, so that the schema does not change when a value switches between integer
+    and float. Undeclared numbers are packed as doubles. Any other field is appended as a JSON tail.
+    The packed bytes are Base64 encoded so that the messages never contain the separator of the comm system.
+    """
+
+    def __init__(self) -> None:
+        self._schema: tuple[tuple[str, str], ...] = ()
+        self._schema_id: int = 0
+        self._struct: _Struct = _Struct("<")
+        self._schema_pending: bool = True
+        self._formats: dict[type[DataContainer], dict[str, str]] = {}
+
+    def request_schema(self) -> None:
+        """
+        Send the schema again ahead of the next frame, typically when a new peer connects.
+        """
+        self._schema_pending = True
+
+    def _schema_message(self) -> bytes:
+        return BINARY_PREFIX + _b64encode(_HEADER.pack(CODEC_VERSION, _KIND_SCHEMA, self._schema_id) + _dumps(
+            self._schema).encode())
+
+    def encode(self, d: DataContainer | dict[str, _Any]) -> list[bytes]:
+        """
+        Encode the data into messages.
+        :param d: the data container or its dictionary form
+        :return: the messages to send in order (the schema message comes first if necessary)
+        """
+        cls = type(d) if isinstance(d, DataContainer) else DataContainer
+        if (formats := self._formats.get(cls)) is None:
+            formats = self._formats[cls] = _declared_formats(cls)
+        if isinstance(d, DataContainer):
+            d = d.to_dict()
+        schema, values, tail = [], [], {}
+        for name, value in d.items():
+            if (fmt := _format_of(value)) is None:
+                tail[name] = value
+                continue
+            if declared := formats.get(name):
+                fmt, value = declared, _COERCIONS[declared](value)
+            schema.append((name, fmt))
+            values.append(value)
+        if (schema := tuple(schema)) != self._schema:
+            self._schema = schema
+            self._schema_id = (self._schema_id + 1) % 256
+            self._struct = _Struct(f"<{"".join(fmt for _, fmt in schema)}")
+            self._schema_pending = True
+        r = []
+        if self._schema_pending:
+            r.append(self._schema_message())
+            self._schema_pending = False
+        payload = _HEADER.pack(CODEC_VERSION, _KIND_FRAME, self._schema_id) + self._struct.pack(*values)
+        if tail:
+            payload += _dumps(tail).encode()
+        r.append(BINARY_PREFIX + _b64encode(payload))
+        return r
+
+
+class BinaryDecoder(object):
+    def __init__(self) -> None:
+        self._schemas: dict[int, tuple[tuple[str, ...], _Struct]] = {}
+
+    def decode(self, msg: bytes) -> dict[str, _Any] | None:
+        """
+        Decode a message produced by `BinaryEncoder`.
+        :param msg: the message
+        :return: the data in dictionary or None if the message is a schema
+        :exception ValueError: unsupported codec version
+        :exception LookupError: the schema of the frame has not been received (send `SCHEMA_REQUEST` to the peer)
+        """
+        payload = _b64decode(msg[len(BINARY_PREFIX):])
+        version, kind, schema_id = _HEADER.unpack_from(payload)
+        if version != CODEC_VERSION:
+            raise ValueError(f"Unsupported codec version {version}")
+        if kind == _KIND_SCHEMA:
+            schema = _loads(payload[_HEADER.size:])
+            self._schemas[schema_id] = (tuple(name for name, _ in schema), _Struct(f"<{"".join(
+                fmt for _, fmt in schema)}"))
+            return None
+        if schema_id not in self._schemas:
+            raise LookupError(f"Unknown schema {schema_id}")
+        names, struct = self._schemas[schema_id]
+        r = dict(zip(names, struct.unpack_from(payload, _HEADER.size)))
+        if len(payload) > (offset := _HEADER.size + struct.size):
+            r.update(_loads(payload[offset:]))
+        return r
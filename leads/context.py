@@ -5,6 +5,7 @@ from typing import TypeVar as _TypeVar, Generic as _Generic
 
 from leads.constant import ESCMode
 from leads.data import DataContainer
+from leads.history import ColumnarHistory, numeric_fields
 
 T = _TypeVar("T", bound=DataContainer)
 
@@ -28,8 +29,8 @@ class Context(_Generic[T], metaclass=_ABCMeta):
         self._initial_data_type: type[DataContainer] = type(initial_data)
         if data_seq_size < 1:
             raise ValueError("`data_seq_size` must be greater or equal to 1")
-        self._data_seq: _deque[DataContainer] = _deque((initial_data,), maxlen=data_seq_size)
-        self._speed_seq: _deque[float] = _deque(maxlen=data_seq_size)
+        self._data: DataContainer = initial_data
+        self._history: ColumnarHistory = ColumnarHistory(numeric_fields(initial_data), data_seq_size)
         self._lap_time_seq: _deque[int] = _deque((int(_time() * 1000),), maxlen=num_laps_timed + 1)
         self._esc_mode: ESCMode = ESCMode.STANDARD
         self._brake_indicator: bool = False
@@ -41,7 +42,13 @@ class Context(_Generic[T], metaclass=_ABCMeta):
         """
         :return: a copy of the current data container
         """
-        return self._data_seq[-1]
+        return self._data
+
+    def history(self) -> ColumnarHistory:
+        """
+        :return: the columnar history of the pushed data
+        """
+        return self._history
 
     def push(self, data: T) -> None:
         """
@@ -49,8 +56,8 @@ class Context(_Generic[T], metaclass=_ABCMeta):
         :param data: the new data
         """
         _check_data_type(data, self._initial_data_type)
-        self._data_seq.append(data)
-        self._speed_seq.append(data.speed)
+        self._data = data
+        self._history.append(data)
 
     def esc_mode(self, esc_mode: ESCMode | None = None) -> ESCMode | None:
         """
@@ -81,7 +88,8 @@ class Context(_Generic[T], metaclass=_ABCMeta):
         return [self._lap_time_seq[i] - self._lap_time_seq[i - 1] for i in range(1, len(self._lap_time_seq))]
 
     def speed_trend(self) -> float:
-        return (self._speed_seq[-1] - self._speed_seq[0]) / len(self._speed_seq) if len(self._speed_seq) > 1 else 0
+        return float((speed_seq[-1] - speed_seq[0]) / len(speed_seq)) if len(
+            speed_seq := self._history.last("speed")) > 1 else 0
 
     def brake_indicator(self, brake_indicator: bool | None = None) -> bool | None:
         if brake_indicator is None:
@@ -1,17 +1,70 @@
 from json import dumps as _dumps
+from operator import attrgetter as _attrgetter
 from time import time as _time
-from typing import override as _override, Any as _Any
+from typing import override as _override, Any as _Any, Callable as _Callable, Self as _Self
 
-from numpy import radians as _radians, degrees as _degrees, cos as _cos, sqrt as _sqrt
+from numpy import radians as _radians, degrees as _degrees, cos as _cos, sqrt as _sqrt, ndarray as _ndarray
+
+
+def _compile_getter(fields: tuple[str, ...]) -> _Callable[[_Any], tuple[_Any, ...]]:
+    if len(fields) > 1:
+        return _attrgetter(*fields)
+    if len(fields) == 1:
+        getter = _attrgetter(fields[0])
+        return lambda o: (getter(o),)
+    return lambda _: ()
 
 
 class Serializable(object):
+    """
+    A subclass that declares `__slots__` (and whose bases all do so) is in schema mode: its public slots form a fixed
+    field list from which `to_dict()` is compiled once per class instead of reflecting on `dir(self)` every call.
+    Attributes outside the schema live in the side dictionary if the class keeps a `__dict__` slot.
+    """
+    __slots__: tuple[str, ...] = ()
+    __schema__: tuple[str, ...] | None = ()
+    __schema_getter__: _Callable[[_Any], tuple[_Any, ...]] | None = None
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        bases = tuple(base for base in cls.__bases__ if base is not object)
+        if "__slots__" not in cls.__dict__ or any(getattr(base, "__schema__", None) is None for base in bases):
+            cls.__schema__ = None
+            cls.__schema_getter__ = None
+            return
+        schema = ()
+        for base in bases:
+            schema += tuple(n for n in base.__schema__ if n not in schema)
+        slots = (cls.__slots__,) if isinstance(cls.__slots__, str) else cls.__slots__
+        cls.__schema__ = schema + tuple(n for n in slots if not n.startswith("_") and n not in schema)
+        cls.__schema_getter__ = _compile_getter(cls.__schema__)
+
+    @classmethod
+    def schema(cls) -> tuple[str, ...] | None:
+        """
+        :return: the declared fields or None if the class is not in schema mode
+        """
+        return cls.__schema__
+
     def to_dict(self) -> dict[str, _Any]:
-        return {n: v for n in dir(self) if (v := getattr(self, n)) is not None and not callable(v) and not n.startswith(
-            "_")}
+        if (getter := self.__schema_getter__) is None:
+            return {n: v for n in dir(self) if (v := getattr(self, n)) is not None and not callable(
+                v) and not n.startswith("_")}
+        r = {n: v for n, v in zip(self.__schema__, getter(self)) if v is not None}
+        if hasattr(self, "__dict__"):
+            r.update({n: v for n, v in self.__dict__.items() if v is not None and not callable(
+                v) and not n.startswith("_")})
+        return r
 
 
 class DataContainer(Serializable):
+    __slots__: tuple[str, ...] = (
+        "_time_stamp", "voltage", "speed", "front_wheel_speed", "rear_wheel_speed", "yaw", "pitch", "roll",
+        "forward_acceleration", "lateral_acceleration", "vertical_acceleration", "front_proximity", "left_proximity",
+        "right_proximity", "rear_proximity", "mileage", "gps_valid", "gps_ground_speed", "latitude", "longitude",
+        "steering_position", "throttle", "brake", "__dict__"
+    )
+
     def __init__(self,
                  voltage: float = 0,
                  speed: float = 0,
@@ -90,6 +143,21 @@ class DataContainer(Serializable):
         (r := super().to_dict())["t"] = self._time_stamp
         return r
 
+    @classmethod
+    def from_dict(cls, d: dict[str, _Any]) -> _Self:
+        """
+        Restore the data from a dictionary produced by `to_dict()`.
+        Entries outside the schema are kept as custom attributes.
+        :param d: the dictionary
+        :return: the data container
+        """
+        d = d.copy()
+        t = d.pop("t", None)
+        r = cls(**d)
+        if t is not None:
+            r._time_stamp = int(t)
+        return r
+
     def encode(self) -> bytes:
         """
         Encode the data into bytes for network transaction purposes.
@@ -99,6 +167,11 @@ class DataContainer(Serializable):
 
 
 class VisualDataContainer(DataContainer):
+    __slots__: tuple[str, ...] = (
+        "front_view_base64", "front_view_latency", "left_view_base64", "left_view_latency", "right_view_base64",
+        "right_view_latency", "rear_view_base64", "rear_view_latency"
+    )
+
     def __init__(self,
                  voltage: float = 0,
                  speed: float = 0,
@@ -145,7 +218,7 @@ class VisualDataContainer(DataContainer):
         self.rear_view_latency: int = rear_view_latency
 
 
-def dlat2meters(dlat: float) -> float:
+def dlat2meters(dlat: float | _ndarray) -> float | _ndarray:
     return dlat * 111320
 
 
@@ -153,7 +226,7 @@ def meters2dlat(meters: float) -> float:
     return meters / 111320
 
 
-def dlon2meters(dlon: float, lat: float) -> float:
+def dlon2meters(dlon: float | _ndarray, lat: float | _ndarray) -> float | _ndarray:
     return _radians(6378137 * dlon * _cos(_radians(lat)))
 
 
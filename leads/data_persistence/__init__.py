@@ -1 +1,6 @@
+from leads.data_persistence.binary import *
 from leads.data_persistence.core import *
+from leads.data_persistence.frame_store import *
+from leads.data_persistence.index import *
+from leads.data_persistence.segment import *
+from leads.data_persistence.table import *
@@ -1,3 +1,4 @@
+from leads.data_persistence.analyzer.delta import *
 from leads.data_persistence.analyzer.inference import *
 from leads.data_persistence.analyzer.jarvis import *
 from leads.data_persistence.analyzer.preprocess import *
@@ -0,0 +1,126 @@
+from numpy import ndarray as _ndarray, arange as _arange, concatenate as _concatenate, cumsum as _cumsum, \
+    diff as _diff, hypot as _hypot, interp as _interp, full as _full, nan as _nan, linspace as _linspace, \
+    nanargmin as _nanargmin, nanargmax as _nanargmax, nanmin as _nanmin
+
+from leads.data import dlat2meters, dlon2meters
+
+
+class LapDelta(object):
+    """
+    Laps resampled onto a common distance grid and compared against a reference lap.
+    Every per-lap array has one row per lap. Laps with fewer than two points are filled with NaN.
+    """
+
+    def __init__(self, reference: int, distance: _ndarray, time: _ndarray, speed: _ndarray,
+                 segment_edges: _ndarray) -> None:
+        """
+        :param reference: the index of the reference lap
+        :param distance: the distance grid in meters
+        :param time: the elapsed time in seconds at each grid point
+        :param speed: the speed at each grid point
+        :param segment_edges: the indexes of the grid points that bound the segments
+        """
+        self.reference: int = reference
+        self.distance: _ndarray = distance
+        self.time: _ndarray = time
+        self.speed: _ndarray = speed
+        self.time_delta: _ndarray = time - time[reference]
+        self.speed_delta: _ndarray = speed - speed[reference]
+        self.segment_edges: _ndarray = segment_edges
+        self.segment_times: _ndarray = time[:, segment_edges[1:]] - time[:, segment_edges[:-1]]
+        self.segment_deltas: _ndarray = self.segment_times - self.segment_times[reference]
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+    def gains(self) -> _ndarray:
+        """
+        :return: the segment in which each lap gains the most time on the reference lap
+        """
+        return _nanargmin(_where_all_nan(self.segment_deltas), 1)
+
+    def losses(self) -> _ndarray:
+        """
+        :return: the segment in which each lap loses the most time to the reference lap
+        """
+        return _nanargmax(_where_all_nan(self.segment_deltas), 1)
+
+    def ideal_time(self) -> float:
+        """
+        :return: the sum of the fastest time of each segment among all laps
+        """
+        return float(_nanmin(self.segment_times, 0).sum())
+
+    def summary(self) -> tuple[str, ...]:
+        """
+        :return: one sentence per lap
+        """
+        gains, losses = self.gains(), self.losses()
+        r = []
+        for i in range(len(self)):
+            if i == self.reference:
+                r.append(f"Lap {i + 1} is the reference ({self.time[i, -1]:.2f} S over {self.distance[-1]:.0f} M)")
+            elif self.time[i, -1] != self.time[i, -1]:
+                r.append(f"Lap {i + 1} has too few points to compare")
+            else:
+                r.append(f"Lap {i + 1}: {self.time_delta[i, -1]:+.2f} S, gains most in segment {gains[i] + 1} "
+                         f"({self.segment_deltas[i, gains[i]]:+.2f} S), loses most in segment {losses[i] + 1} "
+                         f"({self.segment_deltas[i, losses[i]]:+.2f} S)")
+        r.append(f"Ideal Lap: {self.ideal_time():.2f} S")
+        return tuple(r)
+
+
+def _where_all_nan(a: _ndarray) -> _ndarray:
+    # rows that are all NaN would make the NaN-aware reductions raise
+    a = a.copy()
+    a[(a != a).all(1)] = 0
+    return a
+
+
+def cumulative_distance(lat: _ndarray, lon: _ndarray) -> _ndarray:
+    """
+    :param lat: the latitudes
+    :param lon: the longitudes
+    :return: the distance traveled from the first point to each point in meters
+    """
+    step = _hypot(dlon2meters(_diff(lon), .5 * (lat[1:] + lat[:-1])), dlat2meters(_diff(lat)))
+    return _concatenate(((0,), _cumsum(step)))
+
+
+def lap_delta(t: _ndarray, lat: _ndarray, lon: _ndarray, speed: _ndarray, bounds: _ndarray,
+              reference: int | None = None, resolution: float = 5, num_segments: int = 10) -> LapDelta:
+    """
+    Resample the laps onto a common distance grid and compare them against a reference lap.
+    :param t: the time stamps in milliseconds
+    :param lat: the latitudes
+    :param lon: the longitudes
+    :param speed: the speeds
+    :param bounds: the [start, stop) positions of each lap in the arrays
+    :param reference: the index of the reference lap, which may be negative, or None to use the fastest lap
+    :param resolution: the spacing of the distance grid in meters
+    :param num_segments: the number of segments of equal distance
+    :return: the comparison
+    """
+    if len(bounds) < 1:
+        raise LookupError("No lap to compare")
+    d = cumulative_distance(lat, lon)
+    starts, stops = bounds[:, 0], bounds[:, 1]
+    valid = stops - starts > 1
+    lengths = _full(len(bounds), _nan)
+    lengths[valid] = d[stops[valid] - 1] - d[starts[valid]]
+    if not valid.any():
+        raise LookupError("No lap has enough points to compare")
+    distance = _arange(0, _nanmin(lengths) + resolution * .5, resolution)
+    time, v = _full((len(bounds), len(distance)), _nan), _full((len(bounds), len(distance)), _nan)
+    for i in _arange(len(bounds))[valid].tolist():
+        a, b = starts[i], stops[i]
+        time[i] = _interp(distance, d[a: b] - d[a], (t[a: b] - t[a]) * .001)
+        v[i] = _interp(distance, d[a: b] - d[a], speed[a: b])
+    if reference is None:
+        reference = int(_nanargmin(time[:, -1]))
+    elif not -len(bounds) <= reference < len(bounds):
+        raise IndexError(f"No lap {reference} among {len(bounds)} laps")
+    elif not valid[reference := reference % len(bounds)]:
+        raise ValueError(f"Lap {reference + 1} has too few points to be the reference")
+    edges = _linspace(0, len(distance) - 1, min(num_segments, max(len(distance) - 1, 1)) + 1).astype(int)
+    return LapDelta(reference, distance, time, v, edges)
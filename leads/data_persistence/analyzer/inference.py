@@ -1,6 +1,8 @@
 from abc import ABCMeta as _ABCMeta, abstractmethod as _abstractmethod
 from typing import Any as _Any, override as _override, Generator as _Generator, Literal as _Literal, \
-    Sequence as _Sequence
+    Sequence as _Sequence, Self as _Self
+
+from numpy import ndarray as _ndarray, array as _array
 
 from leads.data import distance_between
 from leads.data_persistence.analyzer.utils import time_invalid, speed_invalid, acceleration_invalid, \
@@ -263,8 +265,9 @@ class VisualDataRealignmentByLatency(Inference):
 
 
 class InferredDataset(CSVDataset):
-    def __init__(self, file: str, chunk_size: int = 100) -> None:
-        super().__init__(file, chunk_size)
+    def __init__(self, file: str, chunk_size: int = 100, usecols: _Sequence[str] | None = None,
+                 dtype: dict[str, _Any] | None = None) -> None:
+        super().__init__(file, chunk_size, usecols, dtype)
         self._raw_data: tuple[dict[str, _Any], ...] = ()
         self._inferred_data: list[dict[str, _Any]] = []
         self._clear: set[str] = set()
@@ -279,6 +282,34 @@ class InferredDataset(CSVDataset):
     def __len__(self) -> int:
         return len(self._raw_data)
 
+    @_override
+    def __getitem__(self, item: int | slice) -> dict[str, _Any] | list[dict[str, _Any]]:
+        if isinstance(item, slice):
+            return [self._merged(i) for i in range(len(self._raw_data))[item]]
+        return self._merged(range(len(self._raw_data))[item])
+
+    @_override
+    def time_range(self, t0: float | None = None, t1: float | None = None) -> _Generator[dict[str, _Any], None, None]:
+        for row in self:
+            if (t := row["t"]) is not None and (t0 is None or t >= t0) and (t1 is None or t <= t1):
+                yield row
+
+    @_override
+    def project(self, usecols: _Sequence[str] | None, dtype: dict[str, _Any] | None = None) -> _Self:
+        # the inferred data only exist in memory
+        return self
+
+    @_override
+    def source_files(self) -> tuple[str, ...]:
+        return ()
+
+    @_override
+    def columns(self) -> _Generator[dict[str, _ndarray], None, None]:
+        self.require_loaded()
+        for start in range(0, len(self._raw_data), self._chunk_size):
+            rows = self[start: start + self._chunk_size]
+            yield {column: _array([row[column] for row in rows]) for column in self._header}
+
     @staticmethod
     def merge(raw: dict[str, _Any], inferred: dict[str, _Any]) -> None:
         """
@@ -348,11 +379,14 @@ class InferredDataset(CSVDataset):
             self.assume_initial_zeros()
         return self._complete(inferences, enhanced, False) + self._complete(inferences, enhanced, True)
 
+    def _merged(self, i: int) -> dict[str, _Any]:
+        InferredDataset.merge(row := self._raw_data[i], self._inferred_data[i])
+        return row
+
     @_override
     def __iter__(self) -> _Generator[dict[str, _Any], None, None]:
-        for i, row in enumerate(self._raw_data):
-            InferredDataset.merge(row, self._inferred_data[i])
-            yield row
+        for i in range(len(self._raw_data)):
+            yield self._merged(i)
 
     @_override
     def close(self) -> None:
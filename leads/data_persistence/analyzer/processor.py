@@ -3,28 +3,50 @@ from importlib.util import find_spec as _find_spec
 if not _find_spec("matplotlib"):
     raise ImportError("Please install `matplotlib` to run this module\n>>>pip install matplotlib")
 
+from concurrent.futures import ProcessPoolExecutor as _ProcessPoolExecutor
 from datetime import datetime as _datetime
+from itertools import islice as _islice
+from os import makedirs as _makedirs
+from os.path import join as _join
 from typing import Any as _Any, Callable as _Callable, Sequence as _Sequence
-from matplotlib.pyplot import figure as _figure, scatter as _scatter, show as _show, title as _title, \
-    colorbar as _colorbar, bar as _bar, xticks as _xticks, legend as _legend, xlabel as _xlabel, ylabel as _ylabel
+from matplotlib.figure import Figure as _Figure
+from matplotlib.pyplot import figure as _figure, show as _show
+from numpy import ndarray as _ndarray, flatnonzero as _flatnonzero, stack as _stack, rint as _rint, \
+    append as _append, arange as _arange, searchsorted as _searchsorted, array as _array
 
 from leads.data import dlat2meters, dlon2meters, format_duration
-from leads.data_persistence.analyzer.utils import time_invalid, speed_invalid, mileage_invalid, latitude_invalid, \
-    longitude_invalid, latency_invalid
+from leads.data_persistence.analyzer.delta import LapDelta, lap_delta
+from leads.data_persistence.analyzer.utils import time_invalid_mask, speed_invalid_mask, mileage_invalid_mask, \
+    latitude_invalid_mask, longitude_invalid_mask, latency_invalid_mask, falsy_mask
+from leads.data_persistence.binary import BinaryDataset
 from leads.data_persistence.core import CSVDataset, DEFAULT_HEADER
+from leads.data_persistence.table import ColumnarTable
 from .._computational import sqrt as _sqrt
 
 
+PROCESSOR_HEADER: tuple[str, ...] = (
+    "t", "speed", "mileage", "gps_valid", "latitude", "longitude", "front_view_latency", "left_view_latency",
+    "right_view_latency", "rear_view_latency"
+)
+
+
 class Processor(object):
-    def __init__(self, dataset: CSVDataset) -> None:
+    def __init__(self, dataset: CSVDataset | BinaryDataset, cache_dir: str | None = None) -> None:
+        """
+        :param dataset: the dataset
+        :param cache_dir: the directory to cache the loaded columns in or None to disable the on-disk cache
+        """
         if DEFAULT_HEADER in dataset.read_header():
             raise KeyError("Your dataset must include the default header")
-        self._dataset: CSVDataset = dataset
+        self._dataset: CSVDataset | BinaryDataset = dataset
+        self._projection: CSVDataset | BinaryDataset = dataset.project(PROCESSOR_HEADER)
+        self._cache_dir: str | None = cache_dir
+        self._table: ColumnarTable | None = None
 
         # baking variables
         self._read_rows_count: int = 0
         self._valid_rows_count: int = 0
-        self._invalid_rows: list[int] = []
+        self._valid: _ndarray | None = None
         self._start_time: int | None = None
         self._end_time: int | None = None
         self._duration: int | None = None
@@ -35,7 +57,7 @@ class Processor(object):
         self._end_mileage: float | None = None
         self._distance: float | None = None
         self._gps_valid_count: int = 0
-        self._gps_invalid_rows: list[int] = []
+        self._gps_invalid: _ndarray | None = None
         self._min_lat: float | None = None
         self._min_lon: float | None = None
         # visual
@@ -52,68 +74,83 @@ class Processor(object):
         self._lap_start: int | None = None
         self._lap_start_time: int | None = None
         self._lap_start_mileage: float | None = None
-        self._lap_x: list[float] = []
-        self._lap_y: list[float] = []
-        self._lap_d: list[float] = []
-        self._max_lap_x: float | None = None
-        self._max_lap_y: float | None = None
         self._required_time: int = 0
 
-    def dataset(self) -> CSVDataset:
+    def dataset(self) -> CSVDataset | BinaryDataset:
         return self._dataset
 
+    def table(self) -> ColumnarTable:
+        """
+        :return: the columns the processor uses, which are loaded on the first call and shared by all passes
+        """
+        if self._table is None:
+            self._table = ColumnarTable.load(self._projection, self._cache_dir)
+        return self._table
+
     def bake(self) -> None:
         """
         Prepare the prerequisites for `process()`.
         """
-
-        def unit(row: dict[str, _Any], i: int) -> None:
-            self._read_rows_count += 1
-            t = int(row["t"])
-            speed = row["speed"]
-            mileage = row["mileage"]
-            if time_invalid(t) or speed_invalid(speed) or mileage_invalid(mileage):
-                self._invalid_rows.append(i)
-                return
-            if self._start_time is None:
-                self._start_time = t
-            self._end_time = t
-            if self._min_speed is None or speed < self._min_speed:
-                self._min_speed = speed
-            if self._max_speed is None or speed > self._max_speed:
-                self._max_speed = speed
-            if self._start_mileage is None:
-                self._start_mileage = mileage
-            self._end_mileage = mileage
-            lat = row["latitude"]
-            lon = row["longitude"]
-            if not row["gps_valid"] or latitude_invalid(lat) or longitude_invalid(lon):
-                self._gps_invalid_rows.append(i)
-            else:
-                if self._min_lat is None or lat < self._min_lat:
-                    self._min_lat = lat
-                if self._min_lon is None or lon < self._min_lon:
-                    self._min_lon = lon
-                self._gps_valid_count += 1
-            self._valid_rows_count += 1
-            # visual
-            latencies = [row[key] for key in ("front_view_latency", "left_view_latency", "right_view_latency",
-                                              "rear_view_latency") if key in row.keys()]
-            if len(latencies) > 1:
-                latency = min(latencies)
-                if not latency_invalid(latency) and (self._min_latency is None or latency < self._min_latency):
-                    self._min_latency = latency
-                latency = max(latencies)
-                if not latency_invalid(latency) and (self._max_latency is None or latency > self._max_latency):
-                    self._max_latency = latency
-
-        self.foreach(unit, False)
-        if self._valid_rows_count == 0:
+        table = self.table()
+        t, speed, mileage = table.column("t"), table.column("speed"), table.column("mileage")
+        self._valid = ~(time_invalid_mask(t) | speed_invalid_mask(speed) | mileage_invalid_mask(mileage))
+        lat, lon = table.column("latitude"), table.column("longitude")
+        self._gps_invalid = self._valid & (falsy_mask(table.column("gps_valid")) | latitude_invalid_mask(lat) |
+                                           longitude_invalid_mask(lon))
+        self._read_rows_count = len(table)
+        if (valid_count := int(self._valid.sum())) == 0:
+            self._valid_rows_count = 0
             raise LookupError("Failed to bake")
+        self._valid_rows_count = valid_count
+        valid = _flatnonzero(self._valid)
+        self._start_time, self._end_time = int(t[valid[0]]), int(t[valid[-1]])
+        self._min_speed, self._max_speed = float(speed[valid].min()), float(speed[valid].max())
+        self._start_mileage, self._end_mileage = float(mileage[valid[0]]), float(mileage[valid[-1]])
+        gps_valid = self._valid & ~self._gps_invalid
+        self._gps_valid_count = int(gps_valid.sum())
+        if self._gps_valid_count > 0:
+            self._min_lat, self._min_lon = float(lat[gps_valid].min()), float(lon[gps_valid].min())
+        # visual
+        latencies = [table.column(key) for key in ("front_view_latency", "left_view_latency", "right_view_latency",
+                                                   "rear_view_latency") if key in table]
+        if len(latencies) > 1:
+            latencies = _stack([latency[valid].astype(float) for latency in latencies])
+            if (latencies := latencies[:, ~latency_invalid_mask(latencies).any(0)]).size > 0:
+                self._min_latency, self._max_latency = float(latencies.min()), float(latencies.max())
         self._duration = self._end_time - self._start_time
         self._distance = self._end_mileage - self._start_mileage
         self._avg_speed = 3600000 * self._distance / self._duration
 
+    def valid_mask(self) -> _ndarray:
+        """
+        :return: the boolean mask of the rows with a valid time stamp, speed and mileage
+        """
+        if self._valid is None:
+            raise LookupError("Not baked")
+        return self._valid
+
+    def gps_invalid_mask(self) -> _ndarray:
+        """
+        :return: the boolean mask of the valid rows without a GPS fix
+        """
+        if self._gps_invalid is None:
+            raise LookupError("Not baked")
+        return self._gps_invalid
+
+    def grid_origin(self) -> tuple[float, float]:
+        """
+        :return: (latitude, longitude) of the south-west corner of the GPS fixes, from which positions are measured
+        """
+        if self._min_lat is None:
+            raise LookupError("No GPS fix baked")
+        return self._min_lat, self._min_lon
+
+    def invalid_rows(self) -> list[int]:
+        return _flatnonzero(~self.valid_mask()).tolist()
+
+    def gps_invalid_rows(self) -> list[int]:
+        return _flatnonzero(self.gps_invalid_mask()).tolist()
+
     @staticmethod
     def _hide_others(seq: _Sequence[_Any], limit: int) -> str:
         return f"[{", ".join(map(str, seq[:limit]))}, and {diff} others]" if (diff := len(seq) - limit) > 0 else str(
@@ -132,7 +169,7 @@ class Processor(object):
         return (
             f"Baked {self._valid_rows_count} / {self._read_rows_count} ROWS",
             f"Baking Rate: {100 * self._valid_rows_count / self._read_rows_count:.2f}%",
-            f"Skipped Rows: {Processor._hide_others(self._invalid_rows, 5)}",
+            f"Skipped Rows: {Processor._hide_others(self.invalid_rows(), 5)}",
             f"Start Time: {_datetime.fromtimestamp(self._start_time * .001).strftime("%Y-%m-%d %H:%M:%S")}",
             f"End Time: {_datetime.fromtimestamp(self._end_time * .001).strftime("%Y-%m-%d %H:%M:%S")}",
             f"Duration: {format_duration(self._duration * .001)}",
@@ -141,7 +178,7 @@ class Processor(object):
             f"v\u2098\u2090\u2093: {self._max_speed:.2f} KM / H",
             f"v\u2090\u1D65\u1D4D: {self._avg_speed:.2f} KM / H",
             f"GPS Hit Rate: {100 * self._gps_valid_count / self._valid_rows_count:.2f}%",
-            f"GPS Skipped Rows: {Processor._hide_others(self._gps_invalid_rows, 5)}",
+            f"GPS Skipped Rows: {Processor._hide_others(self.gps_invalid_rows(), 5)}",
             "Min Video Latency: N/A" if self._min_latency is None else f"Min Video Latency: {self._min_latency:.2f} MS",
             "Max Video Latency: N/A" if self._max_latency is None else f"Max Video Latency: {self._max_latency:.2f} MS"
         )
@@ -150,22 +187,45 @@ class Processor(object):
         self._lap_start = None
         self._lap_start_time = None
         self._lap_start_mileage = None
-        self._lap_x.clear()
-        self._lap_y.clear()
-        self._lap_d.clear()
-        self._max_lap_x = None
-        self._max_lap_y = None
 
-    def foreach(self, do: _Callable[[dict[str, _Any], int], None], skip_invalid_rows: bool = True,
-                skip_gps_invalid_rows: bool = False) -> None:
+    def _mask(self, skip_invalid_rows: bool, skip_gps_invalid_rows: bool, start: int, stop: int) -> _ndarray | None:
+        mask = None
+        if skip_invalid_rows and self._valid is not None:
+            mask = self._valid[start: stop]
+        if skip_gps_invalid_rows and self._gps_invalid is not None:
+            mask = ~self._gps_invalid[start: stop] if mask is None else mask & ~self._gps_invalid[start: stop]
+        return mask
+
+    def _foreach_projected(self, do: _Callable[[dict[str, _Any], int], None], skip_invalid_rows: bool,
+                           skip_gps_invalid_rows: bool) -> None:
+        # the passes of the processor only need the columns in `PROCESSOR_HEADER`
         self.erase_unit_cache()
-        i = -1
-        for row in self._dataset:
-            i += 1
-            if skip_invalid_rows and i in self._invalid_rows or skip_gps_invalid_rows and i in self._gps_invalid_rows:
-                continue
+        table = self.table()
+        if (mask := self._mask(skip_invalid_rows, skip_gps_invalid_rows, 0, len(table))) is None:
+            for i, row in enumerate(table.rows()):
+                do(row, i)
+            return
+        indexes = _flatnonzero(mask)
+        for i, row in zip(indexes.tolist(), table.select(indexes)):
             do(row, i)
 
+    def foreach(self, do: _Callable[[dict[str, _Any], int], None], skip_invalid_rows: bool = True,
+                skip_gps_invalid_rows: bool = False, start: int = 0, stop: int | None = None) -> None:
+        """
+        Iterate over the rows of the dataset with all their columns.
+        :param do: the callback that receives each row and its index
+        :param skip_invalid_rows: True: skip the rows marked invalid during baking
+        :param skip_gps_invalid_rows: True: skip the rows without a GPS fix
+        :param start: the index of the first row
+        :param stop: the index after the last row or None to iterate to the end
+        """
+        self.erase_unit_cache()
+        stop = len(self.table()) if stop is None else min(stop, len(self.table()))
+        mask = self._mask(skip_invalid_rows, skip_gps_invalid_rows, start, stop)
+        for i, row in enumerate(_islice(self._dataset, start, stop), start):
+            if mask is None or mask[i - start]:
+                do(row, i)
+
     def process(self, lap_time_assertions: _Sequence[float] | None = None, vehicle_hit_box: float = 3,
                 min_lap_time: float = 30) -> None:
         """
@@ -205,28 +265,36 @@ class Processor(object):
                 self._laps.append((self._lap_start, i, duration, distance, avg_speed))
                 self.erase_unit_cache()
 
-        path = []
-
-        def unit(row: dict[str, _Any], i: int) -> None:
-            lat = row["latitude"]
-            lon = row["longitude"]
-            p = (round(dlat2meters(lat - self._min_lat) / vehicle_hit_box),
-                 round(dlon2meters(lon - self._min_lon, lat) / vehicle_hit_box))
-            try:
-                index = path.index(p)
-            except ValueError:
-                index = -1
-            duration, distance, avg_speed = shared_pre(row, i)
-            if (0 < index < .5 * len(path) and self._lap_start is not None and duration >= min_lap_time * 1000 and
-                    distance * 2000 > vehicle_hit_box):
+        if asserted:
+            self._foreach_projected(asserted_unit, True, False)
+            return
+        self.erase_unit_cache()
+        table = self.table()
+        indexes = _flatnonzero(self.valid_mask() & ~self.gps_invalid_mask())
+        lat, lon = table.column("latitude")[indexes].astype(float), table.column("longitude")[indexes].astype(float)
+        min_lat, min_lon = self.grid_origin()
+        y = _rint(dlat2meters(lat - min_lat) / vehicle_hit_box).astype(int)
+        x = _rint(dlon2meters(lon - min_lon, lat) / vehicle_hit_box).astype(int)
+        # the occupancy grid is hashed by packing both coordinates of a cell into one integer
+        cells = (y * (int(x.max(initial=0)) + 1) + x).tolist()
+        ts, mileages = table.column("t")[indexes].astype(int).tolist(), table.column("mileage")[indexes].tolist()
+        first = {}
+        path_length = 0
+        for i, t, mileage, p in zip(indexes.tolist(), ts, mileages, cells):
+            if self._lap_start is None:
+                self._lap_start, self._lap_start_time, self._lap_start_mileage = i, t, mileage
+            index = first.get(p, -1)
+            duration, distance = t - self._lap_start_time, mileage - self._lap_start_mileage
+            if 0 < index < .5 * path_length and duration >= min_lap_time * 1000 and distance * 2000 > vehicle_hit_box:
+                avg_speed = 3600000 * distance / duration
                 shared_post(duration, distance, avg_speed)
                 self._laps.append((self._lap_start, i, duration, distance, avg_speed))
-                path.clear()
+                first.clear()
+                path_length = 0
                 self.erase_unit_cache()
             else:
-                path.append(p)
-
-        self.foreach(asserted_unit if asserted else unit, skip_gps_invalid_rows=not asserted)
+                first.setdefault(p, path_length)
+                path_length += 1
 
     def suggest_on_lap(self, lap_index: int) -> tuple[str, str]:
         a, b, duration, distance, avg_speed = self._laps[lap_index]
@@ -236,6 +304,22 @@ class Processor(object):
             f"{abs(d):.2f} KM / H {"slower" if d < 0 else "faster"} than average"
         )
 
+    def lap_delta(self, reference: int | None = None, resolution: float = 5, num_segments: int = 10) -> LapDelta:
+        """
+        Compare the laps on a common distance grid built from the cumulative GPS distance.
+        :param reference: the index of the reference lap or None to use the fastest lap
+        :param resolution: the spacing of the distance grid in meters
+        :param num_segments: the number of segments of equal distance
+        :return: the comparison
+        """
+        table = self.table()
+        indexes = _flatnonzero(self.valid_mask() & ~self.gps_invalid_mask())
+        # the last row of a lap is inclusive
+        bounds = _searchsorted(indexes, _array([(a, b + 1) for a, b, *_ in self._laps], int).reshape((-1, 2)))
+        return lap_delta(table.column("t")[indexes].astype(float), table.column("latitude")[indexes].astype(float),
+                         table.column("longitude")[indexes].astype(float), table.column("speed")[indexes].astype(float),
+                         bounds, reference, resolution, num_segments)
+
     def num_laps(self) -> int:
         return len(self._laps)
 
@@ -250,72 +334,104 @@ class Processor(object):
         )
 
     def close(self) -> None:
+        self._table = None
+        self._projection.close()
         self._dataset.close()
 
+    def lap_points(self, lap_index: int) -> tuple[_ndarray, _ndarray, _ndarray]:
+        """
+        Slice the cached columns by the row range of a lap.
+        :param lap_index: the lap index
+        :return: (x in meters, y in meters, speed) of the rows with a GPS fix
+        """
+        a, b = self._laps[lap_index][:2]
+        table = self.table()
+        indexes = _flatnonzero(self.valid_mask()[a: b + 1] & ~self.gps_invalid_mask()[a: b + 1]) + a
+        lat, lon = table.column("latitude")[indexes].astype(float), table.column("longitude")[indexes].astype(float)
+        min_lat, min_lon = self.grid_origin()
+        return (dlon2meters(lon - min_lon, lat), dlat2meters(lat - min_lat),
+                table.column("speed")[indexes].astype(float))
+
+    def _lap_title(self, lap_index: int) -> str:
+        return f"Lap {lap_index + 1} ({self._laps[lap_index][3]:.2f} KM @ {format_duration(
+            self._laps[lap_index][2] * .001)})"
+
     def draw_lap(self, lap_index: int = -1) -> None:
         if lap_index < 0:
             for i in range(len(self._laps)):
                 self.draw_lap(i)
+            return
         if lap_index >= len(self._laps):
             raise IndexError("Lap index out of range")
-
-        def unit(row: dict[str, _Any], index: int) -> None:
-            if index < (lap := self._laps[lap_index])[0] or index > lap[1]:
-                return
-            t = int(row["t"])
-            if self._lap_start_time is None:
-                self._lap_start_time = t
-            self._lap_end_time = t
-            lat = row["latitude"]
-            lon = row["longitude"]
-            self._lap_d.append(row["speed"])
-            self._lap_x.append(x := dlon2meters(lon - self._min_lon, lat))
-            self._lap_y.append(y := dlat2meters(lat - self._min_lat))
-            if self._max_lap_x is None or x > self._max_lap_x:
-                self._max_lap_x = x
-            if self._max_lap_y is None or y > self._max_lap_y:
-                self._max_lap_y = y
-
-        self.foreach(unit, skip_gps_invalid_rows=True)
-        far = max(self._max_lap_x, self._max_lap_y)
-        self._lap_x.append(far)
-        self._lap_y.append(far)
-        self._lap_d.append(self._max_speed)
-        _figure(figsize=(6, 5))
-        _title(f"Lap {lap_index + 1} ({self._laps[lap_index][3]:.2f} KM @ {format_duration(
-            self._laps[lap_index][2] * .001)})")
-        _scatter(self._lap_x, self._lap_y, c=self._lap_d, cmap="hot_r")
-        _xlabel("X (M)")
-        _ylabel("Y (M)")
-        cb = _colorbar()
-        cb.set_label("Speed (KM / H)")
-        cb.ax.hlines(self._laps[lap_index][4], 0, 1)
+        _plot_lap(_figure(figsize=(6, 5)), self._lap_title(lap_index), *self.lap_points(lap_index), self._max_speed,
+                  self._laps[lap_index][4])
         _show()
 
+    def _comparison(self) -> tuple[list[float], list[float], list[float]]:
+        return ([lap[2] / self._max_lap_duration for lap in self._laps],
+                [lap[3] / self._max_lap_distance for lap in self._laps],
+                [lap[4] / self._max_lap_avg_speed for lap in self._laps])
+
     def draw_comparison_of_laps(self, width: float = .3) -> None:
-        durations = []
-        x0 = []
-        distances = []
-        x1 = []
-        avg_speeds = []
-        x2 = []
-        x_ticks = []
-        i = 1
-        for lap in self._laps:
-            durations.append(lap[2] / self._max_lap_duration)
-            x0.append(i)
-            distances.append(lap[3] / self._max_lap_distance)
-            x1.append(i + width)
-            avg_speeds.append(lap[4] / self._max_lap_avg_speed)
-            x2.append(i + 2 * width)
-            x_ticks.append(f"L{i}")
-            i += 1
-        _figure(figsize=(5 * _sqrt(len(self._laps)), 5))
-        _bar(x0, durations, width, label="Duration")
-        _bar(x1, distances, width, label="Distance")
-        _bar(x2, avg_speeds, width, label="Average Speed")
-        _xticks(x1, x_ticks)
-        _legend()
-        _xlabel("Lap")
-        _ylabel("Proportion (% / max)")
+        _plot_comparison(_figure(figsize=(5 * _sqrt(len(self._laps)), 5)), *self._comparison(), width)
         _show()
+
+    def export_laps(self, directory: str, file_format: str = "png", dpi: int = 100, width: float = .3,
+                    workers: int = 0) -> list[str]:
+        """
+        Render every lap and the comparison of laps to image files without a display.
+        :param directory: the directory to save the images in
+        :param file_format: the image format supported by matplotlib
+        :param dpi: the resolution in dots per inch
+        :param width: the bar width of the comparison
+        :param workers: the number of worker processes or 0 to render in the current process
+        :return: the paths to the images, the comparison being the last one
+        """
+        _makedirs(directory, exist_ok=True)
+        jobs = [(_join(directory, f"lap_{i + 1}.{file_format}"), dpi, self._lap_title(i), *self.lap_points(i),
+                 self._max_speed, self._laps[i][4]) for i in range(len(self._laps))]
+        if workers > 0:
+            with _ProcessPoolExecutor(workers) as executor:
+                files = list(executor.map(_export_lap, *zip(*jobs)))
+        else:
+            files = [_export_lap(*job) for job in jobs]
+        if self._laps:
+            _plot_comparison(fig := _Figure(figsize=(5 * _sqrt(len(self._laps)), 5)), *self._comparison(), width)
+            fig.savefig(file := _join(directory, f"comparison.{file_format}"), dpi=dpi)
+            files.append(file)
+        return files
+
+
+def _plot_lap(fig: _Figure, title: str, x: _ndarray, y: _ndarray, d: _ndarray, max_speed: float,
+              avg_speed: float) -> None:
+    # the farthest corner and the maximum speed fix the scales so that laps are comparable
+    far = max(x.max(initial=0), y.max(initial=0))
+    ax = fig.add_subplot()
+    ax.set_title(title)
+    points = ax.scatter(_append(x, far), _append(y, far), c=_append(d, max_speed), cmap="hot_r")
+    ax.set_xlabel("X (M)")
+    ax.set_ylabel("Y (M)")
+    cb = fig.colorbar(points, ax=ax)
+    cb.set_label("Speed (KM / H)")
+    cb.ax.hlines(avg_speed, 0, 1)
+
+
+def _export_lap(file: str, dpi: int, title: str, x: _ndarray, y: _ndarray, d: _ndarray, max_speed: float,
+                avg_speed: float) -> str:
+    # figures created without pyplot are rendered by Agg, which needs no display and is safe in worker processes
+    _plot_lap(fig := _Figure(figsize=(6, 5)), title, x, y, d, max_speed, avg_speed)
+    fig.savefig(file, dpi=dpi)
+    return file
+
+
+def _plot_comparison(fig: _Figure, durations: list[float], distances: list[float], avg_speeds: list[float],
+                     width: float) -> None:
+    x = _arange(1, len(durations) + 1)
+    ax = fig.add_subplot()
+    ax.bar(x, durations, width, label="Duration")
+    ax.bar(x + width, distances, width, label="Distance")
+    ax.bar(x + 2 * width, avg_speeds, width, label="Average Speed")
+    ax.set_xticks(x + width, [f"L{i}" for i in x])
+    ax.legend()
+    ax.set_xlabel("Lap")
+    ax.set_ylabel("Proportion (% / max)")
@@ -1,5 +1,7 @@
 from typing import Any as _Any
 
+from numpy import ndarray as _ndarray, array as _array, isnan as _isnan, nan as _nan, zeros as _zeros
+
 
 def time_invalid(o: _Any) -> bool:
     return not isinstance(o, int)
@@ -27,3 +29,56 @@ def longitude_invalid(o: _Any) -> bool:
 
 def latency_invalid(o: _Any) -> bool:
     return not isinstance(o, int | float)
+
+
+def _as_float(a: _ndarray) -> _ndarray:
+    if a.dtype.kind in "biuf":
+        return a.astype(float, copy=False)
+    return _array([o if isinstance(o, int | float) else _nan for o in a.tolist()], float)
+
+
+def time_invalid_mask(a: _ndarray) -> _ndarray:
+    """
+    The array form of `time_invalid()`, in which NaN stands for a missing value.
+    :param a: the column
+    :return: the boolean mask of the invalid entries
+    """
+    if a.dtype.kind in "biu":
+        return _zeros(len(a), bool)
+    return _isnan(x := _as_float(a)) | (x != x.round())
+
+
+def speed_invalid_mask(a: _ndarray) -> _ndarray:
+    return _isnan(x := _as_float(a)) | (x < 0)
+
+
+def acceleration_invalid_mask(a: _ndarray) -> _ndarray:
+    return _isnan(_as_float(a))
+
+
+def mileage_invalid_mask(a: _ndarray) -> _ndarray:
+    return _isnan(_as_float(a))
+
+
+def latitude_invalid_mask(a: _ndarray) -> _ndarray:
+    return ~((-90 < (x := _as_float(a))) & (x < 90))
+
+
+def longitude_invalid_mask(a: _ndarray) -> _ndarray:
+    return ~((-180 < (x := _as_float(a))) & (x < 180))
+
+
+def latency_invalid_mask(a: _ndarray) -> _ndarray:
+    return _isnan(_as_float(a))
+
+
+def falsy_mask(a: _ndarray) -> _ndarray:
+    """
+    :param a: the column
+    :return: the boolean mask of the entries that are false or missing
+    """
+    if a.dtype.kind == "b":
+        return ~a
+    if a.dtype.kind in "iuf":
+        return (a == 0) | (a != a)
+    return _array([not o or o != o for o in a.tolist()], bool)
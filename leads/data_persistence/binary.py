@@ -0,0 +1,364 @@
+from json import dump as _dump, load as _load
+from os import makedirs as _makedirs, replace as _replace
+from os.path import exists as _exists, getsize as _getsize, join as _join
+from typing import Any as _Any, Iterable as _Iterable, Generator as _Generator, Sequence as _Sequence, \
+    override as _override, Self as _Self, TextIO as _TextIO
+
+from numpy import memmap as _memmap, ndarray as _ndarray, array as _array, empty as _empty, isnan as _isnan, \
+    searchsorted as _searchsorted, dtype as _dtype, all as _all, diff as _diff, nonzero as _nonzero, full as _full, \
+    nan as _nan
+
+from leads.data_persistence.core import CSV, CSVDataset
+from ._computational import DataFrame as _DataFrame
+
+BINARY_SESSION_VERSION: int = 1
+STRING: str = "str"
+
+
+def _infer_dtype(name: str, value: _Any) -> str | None:
+    if name == "t":
+        return "<i8"
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return "|b1"
+    if isinstance(value, int | float):
+        return "<f8"
+    return STRING
+
+
+class BinaryWriter(object):
+    """
+    Write a session as a directory of append-only column files.
+    Numeric columns are stored as fixed-width little-endian arrays. String columns are stored as the concatenated
+    UTF-8 bytes plus an array of end offsets, where empty strings stand for missing values. Missing values in the other
+    columns are stored as NaN for floats and 0 (False) for integers and booleans.
+    The schema is inferred from the first non-missing value of each column unless specified. Until then, the column
+    is listed without a dtype and its missing values are held back.
+    """
+
+    def __init__(self, path: str, header: tuple[str, ...], schema: dict[str, str] | None = None,
+                 buffer_size: int = 256) -> None:
+        """
+        :param path: the session directory
+        :param header: the header
+        :param schema: {column: dtype string or "str"} or None to infer from the data
+        :param buffer_size: the number of rows appended to the files at once
+        """
+        if buffer_size < 1:
+            raise ValueError("`buffer_size` must be greater or equal to 1")
+        _makedirs(path, exist_ok=True)
+        self._path: str = path
+        self._header: tuple[str, ...] = header
+        self._schema: dict[str, str | None] | None = schema
+        self._num_pending: dict[str, int] = {}
+        self._buffer_size: int = buffer_size
+        self._buffer: list[list[_Any]] = [[] for _ in header]
+        self._blob_sizes: dict[str, int] = {}
+        self._files: dict[str, _Any] = {}
+        if schema:
+            self._open()
+
+    def header(self) -> tuple[str, ...]:
+        return self._header
+
+    def _write_schema(self) -> None:
+        with open(tmp := _join(self._path, "schema.json.tmp"), "w") as f:
+            _dump({"version": BINARY_SESSION_VERSION,
+                   "columns": [{"name": n, "dtype": self._schema[n]} for n in self._header]}, f)
+        _replace(tmp, _join(self._path, "schema.json"))
+
+    def _open_column(self, name: str) -> None:
+        self._files[name] = open(_join(self._path, f"{name}.col"), "ab")
+        if self._schema[name] == STRING:
+            self._files[f"{name}.blob"] = f = open(_join(self._path, f"{name}.blob"), "ab")
+            self._blob_sizes[name] = f.tell()
+
+    def _open(self) -> None:
+        self._write_schema()
+        for name in self._header:
+            if self._schema[name] is None:
+                self._num_pending[name] = 0
+            else:
+                self._open_column(name)
+
+    def _resolve(self, name: str, dtype: str) -> None:
+        self._schema[name] = dtype
+        self._write_schema()
+        self._open_column(name)
+
+    def write_frame(self, *data: _Any) -> None:
+        if len(data) != len(self._header):
+            raise ValueError("Unmatched data and header")
+        if self._schema is None:
+            self._schema = {n: _infer_dtype(n, v) for n, v in zip(self._header, data)}
+            self._open()
+        for i, d in enumerate(data):
+            self._buffer[i].append(d)
+        if len(self._buffer[0]) >= self._buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._buffer or not self._buffer[0] or self._schema is None:
+            return
+        for i, name in enumerate(self._header):
+            values, self._buffer[i] = self._buffer[i], []
+            if self._schema[name] is None:
+                if (value := next((v for v in values if v is not None), None)) is None:
+                    self._num_pending[name] += len(values)
+                    continue
+                self._resolve(name, _infer_dtype(name, value))
+                values = [None] * self._num_pending.pop(name) + values
+            self._write_values(name, values)
+        for f in self._files.values():
+            f.flush()
+
+    def _write_values(self, name: str, values: list[_Any]) -> None:
+        if (dtype := self._schema[name]) != STRING:
+            fill = float("nan") if dtype == "<f8" else 0
+            values = [fill if v is None else v for v in values]
+            _array(values, dtype).tofile(self._files[name])
+            return
+        chunks = [b"" if v is None else str(v).encode() for v in values]
+        offsets = _empty(len(chunks), "<i8")
+        size = self._blob_sizes[name]
+        for j, chunk in enumerate(chunks):
+            offsets[j] = size = size + len(chunk)
+        self._blob_sizes[name] = size
+        self._files[f"{name}.blob"].write(b"".join(chunks))
+        offsets.tofile(self._files[name])
+
+    def close(self) -> None:
+        self.flush()
+        # columns that never received a value are stored as missing floats
+        for name in tuple(self._num_pending):
+            self._resolve(name, "<f8")
+            self._write_values(name, [None] * self._num_pending.pop(name))
+        for f in self._files.values():
+            f.close()
+        self._files.clear()
+
+
+class _StringColumn(object):
+    def __init__(self, offsets: _ndarray, blob: _ndarray) -> None:
+        self._offsets: _ndarray = offsets
+        self._blob: _ndarray = blob
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def slice(self, start: int, stop: int) -> list[str | None]:
+        base = int(self._offsets[start - 1]) if start > 0 else 0
+        ends = (self._offsets[start: stop] - base).tolist()
+        blob = self._blob[base: base + ends[-1]].tobytes() if ends else b""
+        r, i = [], 0
+        for end in ends:
+            r.append(blob[i: end].decode() or None)
+            i = end
+        return r
+
+
+class BinaryDataset(_Iterable[dict[str, _Any]]):
+    """
+    A memory-mapped reader of a binary session with the same row API as `CSVDataset`.
+    Opening a session only maps the files, and the numeric columns can be used directly as arrays.
+    """
+
+    def __init__(self, path: str, chunk_size: int = 1000, usecols: _Sequence[str] | None = None) -> None:
+        """
+        :param path: the session directory
+        :param chunk_size: the number of rows converted at once during iteration
+        :param usecols: the columns to load or None to load all columns
+        """
+        self._path: str = path
+        self._chunk_size: int = chunk_size
+        self._usecols: tuple[str, ...] | None = None if usecols is None else tuple(usecols)
+        self._header: tuple[str, ...] | None = None
+        self._schema: dict[str, str | None] = {}
+        self._columns: dict[str, _ndarray | _StringColumn] = {}
+        self._length: int = 0
+        self._t_sorted: bool | None = None
+
+    def require_loaded(self) -> None:
+        if self._header is None:
+            self.load()
+
+    def _map(self, file: str, dtype: str) -> _ndarray:
+        file = _join(self._path, file)
+        size = _getsize(file) // _dtype(dtype).itemsize
+        return _memmap(file, dtype, "r", shape=(size,)) if size > 0 else _empty(0, dtype)
+
+    def load(self) -> None:
+        if self._header is not None:
+            return
+        with open(_join(self._path, "schema.json")) as f:
+            d = _load(f)
+        if d["version"] != BINARY_SESSION_VERSION:
+            raise ValueError(f"Unsupported binary session version {d["version"]}")
+        self._schema = {c["name"]: c["dtype"] for c in d["columns"]}
+        self._header = tuple(n for n in self._schema if self._usecols is None or n in self._usecols)
+        for name in self._header:
+            if (dtype := self._schema[name]) == STRING:
+                self._columns[name] = _StringColumn(self._map(f"{name}.col", "<i8"), self._map(f"{name}.blob", "u1"))
+            elif dtype:
+                self._columns[name] = self._map(f"{name}.col", dtype)
+        # a partially flushed tail is ignored
+        self._length = min((len(c) for c in self._columns.values()), default=0)
+        # columns without a dtype have not received any value yet
+        for name in self._header:
+            if name not in self._columns:
+                self._columns[name] = _full(self._length, _nan)
+
+    def read_header(self) -> tuple[str, ...]:
+        self.require_loaded()
+        return self._header
+
+    def source_files(self) -> tuple[str, ...]:
+        """
+        :return: the files that fully determine the loaded columns
+        """
+        self.require_loaded()
+        files = [_join(self._path, "schema.json")]
+        for name in self._header:
+            if (dtype := self._schema[name]) is None:
+                continue
+            files.append(_join(self._path, f"{name}.col"))
+            if dtype == STRING:
+                files.append(_join(self._path, f"{name}.blob"))
+        return tuple(files)
+
+    def project(self, usecols: _Sequence[str] | None) -> _Self:
+        """
+        Create a dataset over the same session that only loads the specified columns.
+        Columns that do not exist in the session are ignored.
+        :param usecols: the columns to load or None to load all columns
+        :return: the new dataset
+        """
+        return BinaryDataset(self._path, self._chunk_size, usecols)
+
+    def schema(self) -> dict[str, str | None]:
+        self.require_loaded()
+        return {n: self._schema[n] for n in self._header}
+
+    def __len__(self) -> int:
+        self.require_loaded()
+        return self._length
+
+    def column(self, name: str) -> _ndarray:
+        """
+        :param name: the numeric column name
+        :return: the memory-mapped column
+        """
+        self.require_loaded()
+        if isinstance(c := self._columns[name], _StringColumn):
+            raise TypeError(f"Column {name} is not numeric")
+        return c[:self._length]
+
+    def _column_values(self, name: str, start: int, stop: int) -> list[_Any]:
+        if isinstance(c := self._columns[name], _StringColumn):
+            return c.slice(start, stop)
+        values = c[start: stop]
+        if values.dtype.kind == "f" and (mask := _isnan(values)).any():
+            values = values.astype(object)
+            values[mask] = None
+        return values.tolist()
+
+    def _rows(self, start: int, stop: int) -> list[dict[str, _Any]]:
+        columns = [self._column_values(n, start, stop) for n in self._header]
+        return [dict(zip(self._header, row)) for row in zip(*columns)]
+
+    def columns(self) -> _Generator[dict[str, _ndarray | list[str | None]], None, None]:
+        """
+        Iterate over the chunks as column arrays. Missing numeric values are kept as NaN.
+        """
+        self.require_loaded()
+        for start in range(0, self._length, self._chunk_size):
+            stop = min(start + self._chunk_size, self._length)
+            yield {n: c.slice(start, stop) if isinstance(c := self._columns[n], _StringColumn) else c[start: stop] for
+                   n in self._header}
+
+    def chunks(self) -> _Generator[_DataFrame, None, None]:
+        """
+        Iterate over the chunks as data frames in the same form as `CSVDataset`.
+        """
+        for chunk in self.columns():
+            yield _DataFrame(chunk)
+
+    @_override
+    def __iter__(self) -> _Generator[dict[str, _Any], None, None]:
+        self.require_loaded()
+        for start in range(0, self._length, self._chunk_size):
+            yield from self._rows(start, min(start + self._chunk_size, self._length))
+
+    def __getitem__(self, item: int | slice) -> dict[str, _Any] | list[dict[str, _Any]]:
+        rows = range(len(self))[item]
+        if isinstance(rows, int):
+            return self._rows(rows, rows + 1)[0]
+        if len(rows) < 1:
+            return []
+        start, stop = min(rows[0], rows[-1]), max(rows[0], rows[-1]) + 1
+        records = self._rows(start, stop)
+        return [records[i - start] for i in rows]
+
+    def time_range(self, t0: float | None = None, t1: float | None = None) -> _Generator[dict[str, _Any], None, None]:
+        """
+        Iterate over the rows whose time stamps are in [t0, t1].
+        :param t0: the lower bound or None if unbounded
+        :param t1: the upper bound or None if unbounded
+        """
+        t = self.column("t")
+        if self._t_sorted is None:
+            self._t_sorted = bool(_all(_diff(t) >= 0))
+        if self._t_sorted:
+            start = 0 if t0 is None else int(_searchsorted(t, t0, "left"))
+            stop = len(t) if t1 is None else int(_searchsorted(t, t1, "right"))
+            for i in range(start, stop, self._chunk_size):
+                yield from self._rows(i, min(i + self._chunk_size, stop))
+            return
+        mask = t == t
+        if t0 is not None:
+            mask &= t >= t0
+        if t1 is not None:
+            mask &= t <= t1
+        for i in _nonzero(mask)[0].tolist():
+            yield self._rows(i, i + 1)[0]
+
+    def save(self, file: str | _TextIO) -> None:
+        csv = CSV(file, self.read_header(), buffer_size=self._chunk_size)
+        for row in self:
+            csv.write_frame(*row.values())
+        csv.close()
+
+    def close(self) -> None:
+        self._columns.clear()
+        self._header = None
+        self._length = 0
+
+
+def csv_to_binary(csv_file: str, path: str, schema: dict[str, str] | None = None) -> None:
+    """
+    Convert a session CSV file into a binary session.
+    :param csv_file: the CSV file
+    :param path: the session directory (must not exist)
+    :param schema: {column: dtype string or "str"} or None to infer from the data
+    """
+    if _exists(path):
+        raise FileExistsError(f"{path} already exists")
+    dataset = CSVDataset(csv_file, 1000)
+    writer = BinaryWriter(path, dataset.read_header(), schema, 1000)
+    for chunk in dataset.chunks():
+        for row in CSVDataset._records(chunk):
+            writer.write_frame(*row.values())
+    writer.close()
+    dataset.close()
+
+
+def binary_to_csv(path: str, csv_file: str) -> None:
+    """
+    Convert a binary session into a session CSV file.
+    :param path: the session directory
+    :param csv_file: the CSV file
+    """
+    dataset = BinaryDataset(path)
+    dataset.save(csv_file)
+    dataset.close()
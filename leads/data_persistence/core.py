@@ -1,106 +1,32 @@
+from atexit import register as _register, unregister as _unregister
+from inspect import signature as _signature
 from operator import add as _add, sub as _sub, mul as _mul, truediv as _truediv, floordiv as _floordiv, lt as _lt, \
     le as _le, gt as _gt, ge as _ge
-from typing import TextIO as _TextIO, TypeVar as _TypeVar, Generic as _Generic, Sequence as _Sequence, \
-    override as _override, Self as _Self, Iterator as _Iterator, Callable as _Callable, Iterable as _Iterable, \
-    Generator as _Generator, Any as _Any, SupportsFloat as _SupportsFloat
+from queue import Queue as _Queue, Full as _Full, Empty as _Empty
+from threading import Thread as _Thread, Lock as _Lock
+from time import time as _time
+from typing import Any as _Any, BinaryIO as _BinaryIO, Callable as _Callable, Generator as _Generator, \
+    Generic as _Generic, Iterable as _Iterable, Iterator as _Iterator, Literal as _Literal, Self as _Self, \
+    Sequence as _Sequence, SupportsFloat as _SupportsFloat, TextIO as _TextIO, TypeVar as _TypeVar, \
+    overload as _overload, override as _override
 
-from numpy import nan as _nan
+from numpy import nan as _nan, empty as _empty, searchsorted as _searchsorted, result_type as _result_type, \
+    concatenate as _concatenate, arange as _arange, add as _add_ufunc, linspace as _linspace, full as _full, \
+    unique as _unique, minimum as _minimum, asarray as _asarray
 
-from leads.types import Compressor as _Compressor, VisualHeader as _VisualHeader, \
-    VisualHeaderFull as _VisualHeaderFull, DefaultHeaderFull as _DefaultHeaderFull, DefaultHeader as _DefaultHeader
+from leads.types import ArrayCompressor as _ArrayCompressor, Compressor as _Compressor, \
+    VisualHeader as _VisualHeader, VisualHeaderFull as _VisualHeaderFull, DefaultHeaderFull as _DefaultHeaderFull, \
+    DefaultHeader as _DefaultHeader
+from .segment import Compression as _Compression, SegmentCompressor as _SegmentCompressor, \
+    segment_path as _segment_path, list_segments as _list_segments, open_segment as _open_segment
+from .index import DatasetIndex as _DatasetIndex, SegmentedIndex as _SegmentedIndex, build_index as _build_index, \
+    extend_index as _extend_index
 from ._computational import array as _array, norm as _norm, read_csv as _read_csv, DataFrame as _DataFrame, \
     TextFileReader as _TextFileReader, diff as _diff, ndarray as _ndarray
 
 T = _TypeVar("T", bound=_SupportsFloat)
 
 
-def weighed_sum(elements: tuple[T, ...], indexes: tuple[float, ...], a: int = 0, b: int | None = None) -> T:
-    e = _array(elements[a: b if b else -1])
-    w = _diff(_array(indexes[a: b + 1] if b else indexes[a:] + (1,)))
-    if len(e.shape) > 1:
-        w = w.reshape((-1, 1))
-    return Vector(*tuple(s)) if isinstance(s := (e * w).sum(0, keepdims=True)[0], _ndarray) else float(s)
-
-
-def weighed_mean(elements: tuple[T, ...], indexes: tuple[float, ...], a: int = 0, b: int | None = None) -> T:
-    return weighed_sum(elements, indexes, a, b) / (indexes[b] - indexes[a]) if b else weighed_sum(
-        elements, indexes, a, b) / (indexes[-1] - indexes[a] + 1)
-
-
-def mean_compressor(sequence: dict[T, float], target_size: int) -> dict[T, float]:
-    """
-    A compression method that reduces data memory usage by averaging adjacent numbers and merging them.
-    :param sequence: the sequence to compress
-    :param target_size: the expected size
-    :return: the compressed sequence
-    """
-    elements, indexes = tuple(sequence.keys()), tuple(sequence.values())
-    chunk_size = int(len(sequence) / target_size)
-    if chunk_size < 2:
-        return sequence
-    r = {weighed_mean(elements, indexes, i * chunk_size, (i + 1) * chunk_size): indexes[i * chunk_size] for i in range(
-        target_size - 1)}
-    r[weighed_mean(elements, indexes, (target_size - 1) * chunk_size)] = indexes[(target_size - 1) * chunk_size]
-    return r
-
-
-class DataPersistence(_Sequence[T], _Generic[T]):
-    def __init__(self, max_size: int = -1, crop_ratio: int = 2, compressor: _Compressor[T] = mean_compressor) -> None:
-        """
-        :param max_size: the maximum cached size
-        :param crop_ratio: new size = max size / crop ratio
-        :param compressor: the compressor interface
-        """
-        if max_size % crop_ratio != 0:
-            raise ValueError("Max size must be divisible by crop ratio")
-        self._max_size: int = max_size
-        self._crop_ratio: int = crop_ratio
-        self._new_size: int = max_size // crop_ratio
-        self._compressor: _Compressor[T] = compressor
-        self._chunk: dict[T, float] = {}
-        self._size: int = 0
-
-    @_override
-    def __len__(self) -> int:
-        return self._size
-
-    @_override
-    def __getitem__(self, index: int) -> T | list[T]:
-        if index < 0:
-            index += len(self)
-        if self._max_size < 2:
-            return index
-        last = None
-        for e, i in self._chunk.items():
-            if i == index:
-                return i
-            if i > index:
-                return last
-            last = e
-
-    @_override
-    def __str__(self) -> str:
-        return str(self.to_list())
-
-    def sum(self) -> T:
-        return weighed_sum(tuple(self._chunk.keys()), tuple(self._chunk.values()))
-
-    def indexes(self) -> list[float]:
-        return list(self._chunk.values())
-
-    def weights(self) -> list[float]:
-        return list(_diff(self._chunk.values())) + [1]
-
-    def to_list(self) -> list[T]:
-        return list(self._chunk.keys())
-
-    def append(self, element: T) -> None:
-        if 1 < self._max_size < len(self._chunk) + 1:
-            self._chunk = self._compressor(self._chunk, self._new_size)
-        self._chunk[element] = self._size
-        self._size += 1
-
-
 E = _TypeVar("E")
 
 
@@ -164,11 +90,14 @@ class Vector(_Sequence[E], _Iterable[E], _Generic[E]):
     def __floordiv__(self, other: _Self | E) -> _Self:
         return self._operate(other, _floordiv)
 
+    def __array__(self, dtype: _Any = None, copy: bool | None = None) -> _ndarray:
+        return _asarray(self._coordinates, dtype)
+
     def distance(self, other: _Self) -> float:
         return float(_norm(_array(self._coordinates) - _array(other._coordinates)))
 
     def magnitude(self) -> float:
-        return self.distance(Vector(*(0,) * self._d))
+        return float(_norm(_array(self._coordinates)))
 
     def _compare(self, other: _Self | E, comparer: _Callable[[E, E], bool]) -> bool:
         return comparer(self.magnitude(), other.magnitude() if isinstance(other, Vector) else other)
@@ -186,9 +115,474 @@ class Vector(_Sequence[E], _Iterable[E], _Generic[E]):
         return self._compare(other, _ge)
 
 
+class VectorArray(_Sequence[Vector[float]]):
+    """
+    A batch of vectors of the same dimension stored as an N x d array, so that every operation applies to all the
+    vectors at once. Vectors and scalars are broadcast to each row.
+    """
+
+    def __init__(self, data: _ndarray | _Sequence[_Sequence[float]], d: int | None = None) -> None:
+        """
+        :param data: the N x d array or the vectors
+        :param d: the dimension, required only if there is no vector
+        """
+        data = _asarray(data, float)
+        if data.size < 1 and d is not None:
+            data = data.reshape((0, d))
+        if data.ndim != 2:
+            raise ValueError("Vector arrays must be two-dimensional")
+        self._data: _ndarray = data
+
+    def array(self) -> _ndarray:
+        """
+        :return: the underlying N x d array
+        """
+        return self._data
+
+    def __array__(self, dtype: _Any = None, copy: bool | None = None) -> _ndarray:
+        return self._data if dtype is None else self._data.astype(dtype)
+
+    def dimension(self) -> int:
+        return self._data.shape[1]
+
+    @_override
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @_override
+    def __iter__(self) -> _Iterator[Vector[float]]:
+        return (Vector(*row) for row in self._data.tolist())
+
+    @_override
+    def __getitem__(self, item: int | slice) -> Vector[float] | _Self:
+        return VectorArray(self._data[item]) if isinstance(item, slice) else Vector(*self._data[item].tolist())
+
+    @_override
+    def __str__(self) -> str:
+        return str(self._data)
+
+    @_override
+    def __eq__(self, other: _Self) -> bool:
+        return isinstance(other, VectorArray) and self._data.shape == other._data.shape and bool(
+            (self._data == other._data).all())
+
+    @staticmethod
+    def _operand(other: _Self | Vector | _ndarray | float) -> _ndarray | float:
+        if isinstance(other, VectorArray):
+            return other._data
+        if isinstance(other, Vector):
+            return _asarray(other, float)
+        return other
+
+    def _operate(self, other: _Self | Vector | _ndarray | float, operator: _Callable[[_Any, _Any], _Any]) -> _Self:
+        return VectorArray(operator(self._data, VectorArray._operand(other)))
+
+    def __neg__(self) -> _Self:
+        return VectorArray(-self._data)
+
+    def __abs__(self) -> _Self:
+        return VectorArray(abs(self._data))
+
+    def __add__(self, other: _Self | Vector | _ndarray | float) -> _Self:
+        return self._operate(other, _add)
+
+    def __sub__(self, other: _Self | Vector | _ndarray | float) -> _Self:
+        return self._operate(other, _sub)
+
+    def __mul__(self, other: _Self | Vector | _ndarray | float) -> _Self:
+        return self._operate(other, _mul)
+
+    def __truediv__(self, other: _Self | Vector | _ndarray | float) -> _Self:
+        return self._operate(other, _truediv)
+
+    def __floordiv__(self, other: _Self | Vector | _ndarray | float) -> _Self:
+        return self._operate(other, _floordiv)
+
+    def magnitudes(self) -> _ndarray:
+        """
+        :return: the magnitude of each vector
+        """
+        return _magnitudes(self._data)
+
+    def distances(self, other: _Self | Vector) -> _ndarray:
+        """
+        :param other: the vectors of the same length or one vector
+        :return: the distance from each vector to its counterpart
+        """
+        return _magnitudes(self._data - VectorArray._operand(other))
+
+    def dot(self, other: _Self | Vector) -> _ndarray:
+        """
+        :param other: the vectors of the same length or one vector
+        :return: the dot product of each vector and its counterpart
+        """
+        return (self._data * VectorArray._operand(other)).sum(1)
+
+    def sum(self) -> Vector[float]:
+        return Vector(*self._data.sum(0).tolist())
+
+    def mean(self) -> Vector[float]:
+        return Vector(*self._data.mean(0).tolist())
+
+    def weighed_sum(self, weights: _Sequence[float] | _ndarray) -> Vector[float]:
+        """
+        :param weights: the weight of each vector
+        :return: the weighed sum
+        """
+        return Vector(*(self._data * _asarray(weights, float).reshape((-1, 1))).sum(0).tolist())
+
+
+def _weights(indexes: _Sequence[float] | _ndarray, a: int, b: int | None, end: float | None = None) -> _ndarray:
+    i = _asarray(indexes[a: b + 1] if b else indexes[a:], dtype=float)
+    if b:
+        return _diff(i)
+    return _diff(_concatenate((i, (i[-1] + 1 if end is None else end,))))
+
+
+def weighed_sum(elements: _Sequence[T] | _ndarray | VectorArray, indexes: _Sequence[float] | _ndarray, a: int = 0,
+                b: int | None = None) -> T:
+    """
+    :param elements: the elements
+    :param indexes: the index of each element, each element weighs until the next index and the last one weighs 1
+    :param a: the first element
+    :param b: the element to stop at or None to include the last one
+    :return: the weighed sum
+    """
+    e = elements.array()[a: b] if isinstance(elements, VectorArray) else _array(elements[a: b])
+    w = _weights(indexes, a, b)
+    if len(e.shape) > 1:
+        w = w.reshape((-1, 1))
+    return Vector(*tuple(s)) if isinstance(s := (e * w).sum(0, keepdims=True)[0], _ndarray) else float(s)
+
+
+def weighed_mean(elements: _Sequence[T] | _ndarray | VectorArray, indexes: _Sequence[float] | _ndarray, a: int = 0,
+                 b: int | None = None) -> T:
+    return weighed_sum(elements, indexes, a, b) / (indexes[b] - indexes[a]) if b else weighed_sum(
+        elements, indexes, a, b) / (indexes[-1] - indexes[a] + 1)
+
+
+def _sequence_to_arrays(sequence: dict[T, float]) -> tuple[_ndarray, _ndarray]:
+    items = sorted(sequence.items(), key=lambda item: item[1])
+    return _asarray([tuple(e) if isinstance(e, Vector) else e for e, _ in items]), _asarray(
+        [i for _, i in items], "<i8")
+
+
+def _arrays_to_sequence(elements: _ndarray, indexes: _ndarray) -> dict[T, float]:
+    return dict(zip([Vector(*e) for e in elements.tolist()] if elements.ndim > 1 else elements.tolist(),
+                    indexes.tolist()))
+
+
+@_overload
+def mean_compressor(sequence: dict[T, float], target_size: int) -> dict[T, float]: ...
+
+
+@_overload
+def mean_compressor(elements: _ndarray, indexes: _ndarray, target_size: int) -> tuple[_ndarray, _ndarray]: ...
+
+
+def mean_compressor(elements: _ndarray | dict[T, float], indexes: _ndarray | int,
+                    target_size: int | None = None) -> tuple[_ndarray, _ndarray] | dict[T, float]:
+    """
+    A compression method that reduces data memory usage by averaging adjacent numbers and merging them.
+    It also accepts a dict of element to index and the target size, in which case it returns a dict.
+    :param elements: the elements to compress
+    :param indexes: the index of each element
+    :param target_size: the expected size
+    :return: the compressed elements and their indexes
+    """
+    if isinstance(elements, dict):
+        if len(elements) // indexes < 2:
+            return elements
+        return _arrays_to_sequence(*mean_compressor(*_sequence_to_arrays(elements), indexes))
+    chunk_size = len(elements) // target_size
+    if chunk_size < 2:
+        return elements, indexes
+    starts = _arange(target_size) * chunk_size
+    w = _weights(indexes, 0, None)
+    if elements.ndim > 1:
+        w = w.reshape((-1, 1))
+    sums, spans = _add_ufunc.reduceat(elements * w, starts), _add_ufunc.reduceat(w, starts)
+    return sums / spans, indexes[starts]
+
+
+def _magnitudes(elements: _ndarray) -> _ndarray:
+    return (elements * elements).sum(1) ** .5 if elements.ndim > 1 else elements.astype(float)
+
+
+def lttb_compressor(elements: _ndarray, indexes: _ndarray, target_size: int) -> tuple[_ndarray, _ndarray]:
+    """
+    A compression method that keeps the points forming the largest triangles with their neighboring buckets
+    (Largest-Triangle-Three-Buckets), which preserves the visual shape including the peaks.
+    Vectors are compared by their magnitudes. Target sizes below 3 fall back to `mean_compressor()`.
+    :param elements: the elements to compress
+    :param indexes: the index of each element
+    :param target_size: the expected size
+    :return: the selected elements and their indexes
+    """
+    if (n := len(elements)) <= target_size:
+        return elements, indexes
+    if target_size < 3:
+        return mean_compressor(elements, indexes, target_size)
+    x, y = indexes.astype(float), _magnitudes(elements)
+    # the first and the last points are always kept, and the rest are split into target size - 2 buckets
+    edges = _linspace(1, n - 1, target_size - 1).astype(int)
+    counts = _diff(edges)
+    cx = _concatenate((_add_ufunc.reduceat(x[:n - 1], edges[:-1])[1:] / counts[1:], x[-1:]))
+    cy = _concatenate((_add_ufunc.reduceat(y[:n - 1], edges[:-1])[1:] / counts[1:], y[-1:]))
+    selected = _empty(target_size, int)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(target_size - 2):
+        start, stop = edges[i], edges[i + 1]
+        ax, ay = x[a], y[a]
+        a = start + int(abs((ax - cx[i]) * (y[start: stop] - ay) - (ax - x[start: stop]) * (cy[i] - ay)).argmax())
+        selected[i + 1] = a
+    return elements[selected], indexes[selected]
+
+
+def minmax_compressor(elements: _ndarray, indexes: _ndarray, target_size: int) -> tuple[_ndarray, _ndarray]:
+    """
+    A compression method that keeps the minimum and the maximum of each bucket in their original order, so that
+    extremes such as the top speed or brake spikes are never lost.
+    Vectors are compared by their magnitudes. Target sizes below 4 fall back to `mean_compressor()`.
+    :param elements: the elements to compress
+    :param indexes: the index of each element
+    :param target_size: the expected size
+    :return: the selected elements and their indexes
+    """
+    if (n := len(elements)) <= target_size:
+        return elements, indexes
+    if target_size < 4:
+        return mean_compressor(elements, indexes, target_size)
+    y = _magnitudes(elements)
+    num_buckets = (target_size - 2) // 2
+    bucket_size = -(-n // num_buckets)
+    # the padding repeats the last point so that it can only be selected where the last point is
+    buckets = _concatenate((y, _full(num_buckets * bucket_size - n, y[-1]))).reshape((num_buckets, bucket_size))
+    offsets = _arange(num_buckets) * bucket_size
+    selected = _unique(_concatenate(((0, n - 1), _minimum(buckets.argmin(1) + offsets, n - 1),
+                                     _minimum(buckets.argmax(1) + offsets, n - 1))))
+    return elements[selected], indexes[selected]
+
+
+def _adapt_compressor(compressor: _ArrayCompressor[T] | _Compressor[T]) -> _ArrayCompressor[T]:
+    try:
+        if len(_signature(compressor).parameters) > 2:
+            return compressor
+    except (TypeError, ValueError):
+        return compressor
+
+    def _(elements: _ndarray, indexes: _ndarray, target_size: int) -> tuple[_ndarray, _ndarray]:
+        return _sequence_to_arrays(compressor(_arrays_to_sequence(elements, indexes), target_size))
+
+    return _
+
+
+_INITIAL_CAPACITY: int = 16
+
+
+class DataPersistence(_Sequence[T], _Generic[T]):
+    """
+    A sequence that keeps every appended element until it reaches the maximum size, after which it is compressed.
+    The elements are stored in an array in the order they are appended, each with the index it was appended at, so
+    that duplicate elements are kept and any index is looked up by bisection.
+    In the incremental mode, only the elements appended since the last compression are compressed, and the whole
+    sequence is compressed when that leaves less than max size / crop ratio ^ 2 of room or when the compressor cannot
+    reduce the new elements to their share.
+    """
+
+    def __init__(self, max_size: int = -1, crop_ratio: int = 2,
+                 compressor: _ArrayCompressor[T] | _Compressor[T] = mean_compressor, incremental: bool = False) -> None:
+        """
+        :param max_size: the maximum cached size
+        :param crop_ratio: new size = max size / crop ratio
+        :param compressor: the compressor interface, either on the elements and their indexes as arrays or on a dict
+            of element to index
+        :param incremental: True: compress only the newly overflowed region; False: compress the whole sequence
+        """
+        if max_size > 1 and max_size % crop_ratio != 0:
+            raise ValueError("Max size must be divisible by crop ratio")
+        self._max_size: int = max_size
+        self._crop_ratio: int = crop_ratio
+        self._new_size: int = max_size // crop_ratio
+        self._compressor: _ArrayCompressor[T] = _adapt_compressor(compressor)
+        self._incremental: bool = incremental
+        self._head: int = 0
+        self._elements: _ndarray | None = None
+        self._indexes: _ndarray = _empty(0, "<i8")
+        self._n: int = 0
+        self._size: int = 0
+
+    @_override
+    def __len__(self) -> int:
+        return self._size
+
+    def _element(self, i: int) -> T:
+        return Vector(*e.tolist()) if isinstance(e := self._elements[i], _ndarray) else e.item()
+
+    def _locate(self, index: int) -> int:
+        # the first and the last elements are the most frequently accessed ones
+        if index >= self._indexes[self._n - 1]:
+            return self._n - 1
+        if index <= self._indexes[0]:
+            return 0
+        return int(_searchsorted(self._indexes[:self._n], index, "right")) - 1
+
+    @_override
+    def __getitem__(self, index: int | slice) -> T | list[T]:
+        """
+        :param index: the index at which the element was appended or a slice of indexes
+        :return: the element or the compressed element that covers the index
+        """
+        if isinstance(index, slice):
+            return [self[i] for i in range(self._size)[index]]
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("Index out of range")
+        return self._element(self._locate(index))
+
+    @_override
+    def __iter__(self) -> _Iterator[T]:
+        return iter(self.to_list())
+
+    @_override
+    def __str__(self) -> str:
+        return str(self.to_list())
+
+    def first(self) -> T:
+        if self._n < 1:
+            raise IndexError("Empty data persistence")
+        return self._element(0)
+
+    def last(self) -> T:
+        if self._n < 1:
+            raise IndexError("Empty data persistence")
+        return self._element(self._n - 1)
+
+    def sum(self) -> T:
+        return weighed_sum(self._elements[:self._n], self._indexes[:self._n])
+
+    def indexes(self) -> list[float]:
+        return self._indexes[:self._n].tolist()
+
+    def weights(self) -> list[float]:
+        return _weights(self._indexes[:self._n], 0, None, self._size).tolist()
+
+    def to_array(self) -> _ndarray | VectorArray:
+        """
+        :return: a copy of the stored elements as an array or a vector array if the elements are vectors
+        """
+        if self._n < 1:
+            return _empty(0)
+        return VectorArray(self._elements[:self._n]) if self._elements.ndim > 1 else self._elements[:self._n].copy()
+
+    def to_list(self) -> list[T]:
+        if self._n < 1:
+            return []
+        return [Vector(*e) for e in self._elements[:self._n].tolist()] if self._elements.ndim > 1 else self._elements[
+            :self._n].tolist()
+
+    def _reserve(self, capacity: int, dtype: _Any) -> None:
+        elements = _empty((capacity, *self._elements.shape[1:]), dtype)
+        elements[:self._n] = self._elements[:self._n]
+        indexes = _empty(capacity, "<i8")
+        indexes[:self._n] = self._indexes[:self._n]
+        self._elements, self._indexes = elements, indexes
+
+    def _grow(self, required: int, dtype: _Any) -> None:
+        capacity = max(self._n * 2, _INITIAL_CAPACITY, required) if required > len(self._indexes) else len(
+            self._indexes)
+        if self._max_size > 1:
+            capacity = max(min(capacity, self._max_size), required)
+        self._reserve(capacity, dtype)
+
+    def _compress(self) -> None:
+        if self._incremental and 0 < (tail := (self._n - self._head) // self._crop_ratio) <= self._max_size - max(
+                self._new_size // self._crop_ratio, 1) - self._head:
+            elements, indexes = self._compressor(self._elements[self._head: self._n],
+                                                 self._indexes[self._head: self._n], tail)
+            if len(indexes) <= tail:
+                self._store(self._head, elements, indexes)
+                return
+        self._store(0, *self._compressor(self._elements[:self._n], self._indexes[:self._n], self._new_size))
+
+    def _store(self, start: int, elements: _ndarray, indexes: _ndarray) -> None:
+        if (dtype := _result_type(self._elements, elements)) != self._elements.dtype:
+            self._reserve(len(self._indexes), dtype)
+        self._n = self._head = start + len(indexes)
+        self._elements[start: self._n], self._indexes[start: self._n] = elements, indexes
+
+    def append(self, element: T) -> None:
+        if 1 < self._max_size <= self._n:
+            self._compress()
+        e = _asarray(element)
+        if self._elements is None:
+            self._elements = _empty((0, *e.shape), e.dtype)
+        dtype = _result_type(self._elements, e)
+        if self._n >= len(self._indexes) or dtype != self._elements.dtype:
+            self._grow(self._n + 1, dtype)
+        self._elements[self._n] = e
+        self._indexes[self._n] = self._size
+        self._n += 1
+        self._size += 1
+
+    def extend(self, elements: _Sequence[T] | _ndarray | VectorArray) -> None:
+        """
+        Append the elements in batches, which is equivalent to but much faster than appending them one by one.
+        :param elements: the elements
+        """
+        e = elements.array() if isinstance(elements, VectorArray) else _asarray(elements)
+        if len(e) < 1:
+            return
+        if self._elements is None:
+            self._elements = _empty((0, *e.shape[1:]), e.dtype)
+        i = 0
+        while i < len(e):
+            if 1 < self._max_size <= self._n:
+                self._compress()
+            m = len(e) - i if self._max_size < 2 else max(min(len(e) - i, self._max_size - self._n), 1)
+            dtype = _result_type(self._elements, e)
+            if self._n + m > len(self._indexes) or dtype != self._elements.dtype:
+                self._grow(self._n + m, dtype)
+            self._elements[self._n: self._n + m] = e[i: i + m]
+            self._indexes[self._n: self._n + m] = _arange(self._size, self._size + m)
+            self._n += m
+            self._size += m
+            i += m
+
+
 class CSV(object):
-    def __init__(self, file: str | _TextIO, header: tuple[str, ...], *columns: DataPersistence | None) -> None:
+    def __init__(self, file: str | _TextIO, header: tuple[str, ...], *columns: DataPersistence | None,
+                 buffer_size: int = 0, flush_interval: float = 1, queue_size: int = 16,
+                 backpressure: _Literal["block", "drop"] = "block", segment_size: int = 0,
+                 segment_duration: float = 0, compression: _Compression | None = None) -> None:
+        """
+        :param file: the file path or the file object (must be a path if segmented)
+        :param header: the header
+        :param columns: the data persistence objects that the columns are appended to
+        :param buffer_size: the number of rows written in one batch by a background thread or 0 to write every frame
+            synchronously
+        :param flush_interval: the maximum time in seconds a row stays in the buffer
+        :param queue_size: the maximum number of batches waiting to be written
+        :param backpressure: the policy when the queue is full, "block": wait; "drop": discard the batch
+        :param segment_size: the size in bytes after which a new segment is started or 0 if unlimited
+        :param segment_duration: the period in seconds after which a new segment is started or 0 if unlimited
+        :param compression: the method to compress closed segments in the background or None to keep them as they are
+        """
+        self._path: str | None = None
+        if segment_size > 0 or segment_duration > 0:
+            if not isinstance(file, str):
+                raise TypeError("Segmented logs require a file path")
+            self._path = file
+            file = _segment_path(file, 0)
         self._file: _TextIO = open(file, "w") if isinstance(file, str) else file
+        self._segment: int = 0
+        self._segment_size: int = segment_size
+        self._segment_duration: float = segment_duration
+        self._segment_start: float = _time()
+        self._compressor: _SegmentCompressor | None = _SegmentCompressor(compression) if self._path and compression \
+            else None
         self._d: int = len(header)
         self._header: tuple[str, ...] = header
         if (d := self._d - len(columns)) >= 0:
@@ -197,20 +591,143 @@ class CSV(object):
             raise ValueError("Unmatched columns and header")
         self._columns: tuple[DataPersistence | None, ...] = columns
         self._i: int = 0
+        self._buffer_size: int = buffer_size
+        self._flush_interval: float = flush_interval
+        self._backpressure: _Literal["block", "drop"] = backpressure
+        self._buffer: list[list[_Any]] = self._allocate_buffer()
+        self._buffer_start: int = 0
+        self._buffer_lock: _Lock = _Lock()
+        # held while a batch is taken and enqueued so that the batches stay in order, always before the buffer lock
+        self._submit_lock: _Lock = _Lock()
+        self._queue: _Queue[tuple[int, int, list[list[_Any]]] | None] = _Queue(queue_size)
+        self._num_dropped_frames: int = 0
+        self._writer: _Thread | None = None
+        self._closed: bool = False
         self.write_header()
+        if buffer_size > 0:
+            self._writer = _Thread(name=f"{id(self)} csv writer", target=self._write_batches, daemon=True)
+            self._writer.start()
+            _register(self.close)
 
     def header(self) -> tuple[str, ...]:
         return self._header
 
+    def num_dropped_frames(self) -> int:
+        """
+        :return: the number of frames discarded because the queue was full
+        """
+        return self._num_dropped_frames
+
     def write_header(self) -> None:
         header = f"{",".join(self._header)}\n"
         if not header.startswith("index"):
             header = f"index,{header}"
         self._file.write(header)
 
+    def _allocate_buffer(self) -> list[list[_Any]]:
+        return [[] for _ in range(self._d)]
+
+    def segment(self) -> int:
+        """
+        :return: the number of the current segment
+        """
+        return self._segment
+
+    def _close_segment(self) -> None:
+        self._file.close()
+        if self._compressor:
+            self._compressor.submit(_segment_path(self._path, self._segment))
+
+    def _rotate(self) -> None:
+        if not self._path:
+            return
+        if not (0 < self._segment_size <= self._file.tell() or
+                0 < self._segment_duration <= _time() - self._segment_start):
+            return
+        self._close_segment()
+        self._segment += 1
+        self._file = open(_segment_path(self._path, self._segment), "w")
+        self._segment_start = _time()
+        self.write_header()
+
+    def _write_batch(self, start: int, n: int, buffer: list[list[_Any]]) -> None:
+        _DataFrame({self._header[i]: buffer[i][:n] for i in range(self._d)}, range(start, start + n),
+                   dtype=object).to_csv(self._file, mode="a", header=False)
+        self._rotate()
+
+    def _take_batch(self) -> tuple[int, int, list[list[_Any]]] | None:
+        # must be called with the buffer lock held
+        if (n := self._i - self._buffer_start) < 1:
+            return None
+        batch = (self._buffer_start, n, self._buffer)
+        self._buffer = self._allocate_buffer()
+        self._buffer_start = self._i
+        return batch
+
+    def _submit(self) -> None:
+        # the buffer lock is released before waiting for the queue so that the writer is never blocked by a producer
+        with self._submit_lock:
+            with self._buffer_lock:
+                batch = self._take_batch()
+            if batch is None:
+                return
+            if self._backpressure == "block":
+                self._queue.put(batch)
+                return
+            try:
+                self._queue.put_nowait(batch)
+            except _Full:
+                self._num_dropped_frames += batch[1]
+
+    def _collect_batches(self) -> list[tuple[int, int, list[list[_Any]]] | None]:
+        # the writer never enqueues, instead it takes the queued batches and the buffer in order
+        # a producer that holds the submit lock may be waiting for the queue to be drained, in which case it is left
+        # to the producer to submit the buffer
+        if not self._submit_lock.acquire(False):
+            return []
+        try:
+            batches = []
+            while True:
+                try:
+                    batches.append(self._queue.get_nowait())
+                except _Empty:
+                    break
+            with self._buffer_lock:
+                if batch := self._take_batch():
+                    batches.append(batch)
+            return batches
+        finally:
+            self._submit_lock.release()
+
+    def _write_batches(self) -> None:
+        while True:
+            try:
+                batches = [self._queue.get(timeout=self._flush_interval)]
+            except _Empty:
+                batches = self._collect_batches()
+            for batch in batches:
+                if batch is None:
+                    return
+                self._write_batch(*batch)
+
     def write_frame(self, *data: _Any) -> None:
         if len(data) != self._d:
             raise ValueError("Unmatched data and header")
+        if self._writer:
+            with self._buffer_lock:
+                if self._closed:
+                    raise IOError("The file is closed")
+                for i in range(self._d):
+                    self._buffer[i].append(d := data[i])
+                    if column := self._columns[i]:
+                        column.append(d)
+                self._i += 1
+                full = self._i - self._buffer_start >= self._buffer_size
+            if full:
+                self._submit()
+            return
+        if self._closed:
+            raise IOError("The file is closed")
         frame = {}
         for i in range(self._d):
             frame[self._header[i]] = d = data[i]
@@ -218,57 +735,205 @@ class CSV(object):
                 column.append(d)
         _DataFrame(frame, [self._i]).to_csv(self._file, mode="a", header=False)
         self._i += 1
+        self._rotate()
+
+    def flush(self) -> None:
+        """
+        Submit the buffered frames to the background writer.
+        """
+        if self._writer:
+            self._submit()
 
     def close(self) -> None:
-        self._file.close()
+        if self._closed:
+            return
+        if self._writer:
+            _unregister(self.close)
+            with self._submit_lock:
+                with self._buffer_lock:
+                    self._closed = True
+                    batch = self._take_batch()
+                # the last batch is never dropped
+                if batch:
+                    self._queue.put(batch)
+                self._queue.put(None)
+            self._writer.join()
+        self._closed = True
+        if self._path:
+            self._close_segment()
+        else:
+            self._file.close()
+        if self._compressor:
+            self._compressor.close()
 
 
 class CSVDataset(_Iterable[dict[str, _Any]]):
-    def __init__(self, file: str, chunk_size: int = 100) -> None:
+    def __init__(self, file: str, chunk_size: int = 100, usecols: _Sequence[str] | None = None,
+                 dtype: dict[str, _Any] | None = None) -> None:
+        """
+        :param file: the file path
+        :param chunk_size: the number of rows read at once
+        :param usecols: the columns to load or None to load all columns
+        :param dtype: the explicit data types of the columns
+        """
         self._file: str = file
         self._chunk_size: int = chunk_size
+        self._usecols: tuple[str, ...] | None = None if usecols is None else tuple(usecols)
+        self._dtype: dict[str, _Any] | None = dtype
         self._csv: _TextFileReader | None = None
+        self._raw_header: tuple[str, ...] | None = None
+        self._file_header: tuple[str, ...] | None = None
         self._header: tuple[str, ...] | None = None
-        self._contains_index: bool = False
+        self._index: _DatasetIndex | None = None
 
     def require_loaded(self) -> None:
         if not self._csv or not self._header:
             self.load()
 
+    def file_header(self) -> tuple[str, ...]:
+        """
+        :return: all the columns in the file except the index
+        """
+        if self._file_header is None:
+            self._raw_header = header = tuple(_read_csv(self._file, nrows=0).columns)
+            self._file_header = header[1:] if header and header[0] == "index" else header
+        return self._file_header
+
+    def _projected_header(self) -> tuple[str, ...]:
+        return self.file_header() if self._usecols is None else tuple(
+            column for column in self.file_header() if column in self._usecols)
+
     def read_header(self) -> tuple[str, ...]:
+        """
+        :return: the loaded columns
+        """
         self.require_loaded()
         return self._header
 
-    @_override
-    def __iter__(self) -> _Generator[dict[str, _Any], None, None]:
+    def source_files(self) -> tuple[str, ...]:
+        """
+        :return: the files that fully determine the contents or an empty tuple if the contents only exist in memory
+        """
+        return self._file,
+
+    def project(self, usecols: _Sequence[str] | None, dtype: dict[str, _Any] | None = None) -> _Self:
+        """
+        Create a dataset over the same file that only loads the specified columns.
+        Columns that do not exist in the file are ignored.
+        :param usecols: the columns to load or None to load all columns
+        :param dtype: the explicit data types of the columns
+        :return: the new dataset
+        """
+        return CSVDataset(self._file, self._chunk_size, usecols, dtype)
+
+    def chunks(self) -> _Generator[_DataFrame, None, None]:
+        """
+        Iterate over the raw chunks.
+        """
         self.require_loaded()
         while True:
             try:
                 chunk = next(self._csv)
             except StopIteration:
                 break
-            for i in range(len(chunk)):
-                r = chunk.iloc[i].replace(_nan, None).to_dict()
-                if self._contains_index:
-                    r.pop("index")
-                yield r
+            yield chunk
         self._csv.close()
         self._csv = None
 
+    def columns(self) -> _Generator[dict[str, _ndarray], None, None]:
+        """
+        Iterate over the chunks as column arrays, which avoids constructing any row.
+        Missing values are kept as NaN.
+        """
+        for chunk in self.chunks():
+            yield {column: chunk[column].to_numpy() for column in chunk.columns}
+
+    @staticmethod
+    def _records(chunk: _DataFrame) -> list[dict[str, _Any]]:
+        return chunk.astype(object).where(chunk.notna(), None).to_dict("records")
+
+    @_override
+    def __iter__(self) -> _Generator[dict[str, _Any], None, None]:
+        for chunk in self.chunks():
+            yield from CSVDataset._records(chunk)
+
+    def index(self, block_size: int = 1000, persist: bool = False) -> _DatasetIndex:
+        """
+        Get the row-offset index, which is loaded from the sidecar file if possible and built otherwise.
+        If the file has grown, only the appended rows are indexed.
+        :param block_size: the number of rows in each block if the index has to be built
+        :param persist: True: save the index to the sidecar file; False: keep it in memory
+        :return: the index
+        """
+        if self._index is None:
+            self._index = _DatasetIndex.load(self._file)
+        if self._index is None:
+            self._index = _build_index(self._file, block_size)
+        elif self._index.grown():
+            self._index = _extend_index(self._index)
+        elif not self._index.up_to_date():
+            self._index = _build_index(self._file, self._index.block_size())
+        if persist:
+            self._index.save()
+        return self._index
+
     def __len__(self) -> int:
-        self.require_loaded()
-        return self._csv.shape[0]
+        return len(self.index())
+
+    def _read_rows(self, f: _BinaryIO, row: int, num_rows: int,
+                   chunk_size: int | None = None) -> _DataFrame | _TextFileReader:
+        offset, skip = self.index().locate(row)
+        self.file_header()
+        f.seek(offset)
+        return _read_csv(f, header=None, names=self._raw_header, skiprows=skip, nrows=num_rows, chunksize=chunk_size,
+                         low_memory=False, usecols=self._projected_header(), dtype=self._dtype)
+
+    def __getitem__(self, item: int | slice) -> dict[str, _Any] | list[dict[str, _Any]]:
+        """
+        Read rows directly from their offsets without streaming from the start.
+        :param item: the row index or a slice of row indexes
+        :return: the row or the rows
+        """
+        rows = range(len(self))[item]
+        with _open_segment(self._file) as f:
+            if isinstance(rows, int):
+                return CSVDataset._records(self._read_rows(f, rows, 1))[0]
+            if len(rows) < 1:
+                return []
+            start, stop = min(rows[0], rows[-1]), max(rows[0], rows[-1]) + 1
+            records = CSVDataset._records(self._read_rows(f, start, stop - start))
+        return [records[i - start] for i in rows]
+
+    def time_range(self, t0: float | None = None, t1: float | None = None) -> _Generator[dict[str, _Any], None, None]:
+        """
+        Iterate over the rows whose time stamps are in [t0, t1], skipping the blocks out of the range.
+        :param t0: the lower bound or None if unbounded
+        :param t1: the upper bound or None if unbounded
+        """
+        if "t" not in self._projected_header():
+            raise KeyError("Time range queries require the column \"t\"")
+        index = self.index()
+        first, last = index.blocks_within(t0, t1)
+        if first >= last:
+            return
+        start = first * (bs := index.block_size())
+        with _open_segment(self._file) as f, self._read_rows(f, start, min(last * bs, len(index)) - start,
+                                                           self._chunk_size) as reader:
+            for chunk in reader:
+                mask = chunk["t"].notna()
+                if t0 is not None:
+                    mask &= chunk["t"] >= t0
+                if t1 is not None:
+                    mask &= chunk["t"] <= t1
+                yield from CSVDataset._records(chunk[mask])
 
     def load(self) -> None:
         if self._csv:
             return
-        header_csv = _read_csv(self._file, chunksize=1)
-        self._header = tuple(header_csv.get_chunk().columns)
-        if self._header[0] == "index":
-            self._header = self._header[1:]
-            self._contains_index = True
-        header_csv.close()
-        self._csv = _read_csv(self._file, chunksize=self._chunk_size, low_memory=False)
+        self._header = self._projected_header()
+        # the index column is excluded because it is not listed
+        self._csv = _read_csv(self._file, chunksize=self._chunk_size, low_memory=False, usecols=self._header,
+                              dtype=self._dtype)
 
     def save(self, file: str | _TextIO) -> None:
         self.require_loaded()
@@ -282,6 +947,118 @@ class CSVDataset(_Iterable[dict[str, _Any]]):
             self._csv.close()
 
 
+class SegmentedCSVDataset(CSVDataset):
+    """
+    A reader of a log written by `CSV` in segments, which are read in order as if they were one file.
+    Compressed segments are decompressed on the fly, so random access into them is as slow as reading up to the row.
+    """
+
+    def __init__(self, file: str, chunk_size: int = 100, usecols: _Sequence[str] | None = None,
+                 dtype: dict[str, _Any] | None = None) -> None:
+        """
+        :param file: the path of the whole log, such as "data/session.csv"
+        :param chunk_size: the number of rows read at once
+        :param usecols: the columns to load or None to load all columns
+        :param dtype: the explicit data types of the columns
+        """
+        super().__init__(file, chunk_size, usecols, dtype)
+        self._segments: list[CSVDataset] = []
+        self._chunks: _Generator[_DataFrame, None, None] | None = None
+
+    def segments(self) -> list[CSVDataset]:
+        """
+        :return: the datasets of the segments that exist at the moment
+        """
+        paths = _list_segments(self._file)
+        if [s._file for s in self._segments] != paths:
+            self._segments = [CSVDataset(path, self._chunk_size, self._usecols, self._dtype) for path in paths]
+        return self._segments
+
+    @_override
+    def source_files(self) -> tuple[str, ...]:
+        return tuple(segment._file for segment in self.segments())
+
+    @_override
+    def file_header(self) -> tuple[str, ...]:
+        if self._file_header is None:
+            if not (segments := self.segments()):
+                raise FileNotFoundError(f"No segment of {self._file} found")
+            self._file_header = segments[0].file_header()
+        return self._file_header
+
+    @_override
+    def project(self, usecols: _Sequence[str] | None, dtype: dict[str, _Any] | None = None) -> _Self:
+        return SegmentedCSVDataset(self._file, self._chunk_size, usecols, dtype)
+
+    def _iterate_chunks(self) -> _Generator[_DataFrame, None, None]:
+        for segment in self.segments():
+            yield from segment.chunks()
+
+    @_override
+    def chunks(self) -> _Generator[_DataFrame, None, None]:
+        self.require_loaded()
+        yield from self._chunks
+        self._chunks = None
+
+    def _indexed_segments(self, block_size: int = 1000,
+                          persist: bool = False) -> tuple[list[CSVDataset], _SegmentedIndex]:
+        segments = self.segments()
+        return segments, _SegmentedIndex([segment.index(block_size, persist) for segment in segments])
+
+    @_override
+    def index(self, block_size: int = 1000, persist: bool = False) -> _SegmentedIndex:
+        """
+        Get the combined index of the segments, each of which is indexed as a `CSVDataset`.
+        :param block_size: the number of rows in each block if an index has to be built
+        :param persist: True: save the index of each segment to its sidecar file; False: keep them in memory
+        :return: the index
+        """
+        return self._indexed_segments(block_size, persist)[1]
+
+    @_override
+    def __getitem__(self, item: int | slice) -> dict[str, _Any] | list[dict[str, _Any]]:
+        segments, index = self._indexed_segments()
+        rows = range(len(index))[item]
+        if isinstance(rows, int):
+            segment, row = index.find(rows)
+            return segments[segment][row]
+        if len(rows) < 1:
+            return []
+        start, stop = min(rows[0], rows[-1]), max(rows[0], rows[-1]) + 1
+        records = []
+        for segment in range(index.find(start)[0], index.find(stop - 1)[0] + 1):
+            offset = index.start(segment)
+            records += segments[segment][max(start - offset, 0): min(stop - offset, len(index.segment(segment)))]
+        return [records[i - start] for i in rows]
+
+    @_override
+    def time_range(self, t0: float | None = None, t1: float | None = None) -> _Generator[dict[str, _Any], None, None]:
+        if "t" not in self._projected_header():
+            raise KeyError("Time range queries require the column \"t\"")
+        for segment in self.segments():
+            yield from segment.time_range(t0, t1)
+
+    @_override
+    def load(self) -> None:
+        if self._chunks:
+            return
+        self._header = self._projected_header()
+        self._chunks = self._iterate_chunks()
+
+    @_override
+    def require_loaded(self) -> None:
+        if not self._chunks or not self._header:
+            self.load()
+
+    @_override
+    def close(self) -> None:
+        if self._chunks:
+            self._chunks.close()
+            self._chunks = None
+        for segment in self._segments:
+            segment.close()
+
+
 DEFAULT_HEADER: _DefaultHeader = (
     "t", "voltage", "speed", "front_wheel_speed", "rear_wheel_speed", "yaw", "pitch", "roll", "forward_acceleration",
     "lateral_acceleration", "vertical_acceleration", "front_proximity", "left_proximity", "right_proximity",
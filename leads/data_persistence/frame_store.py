@@ -0,0 +1,123 @@
+from os.path import getsize as _getsize, exists as _exists
+from typing import Literal as _Literal
+
+from numpy import memmap as _memmap, ndarray as _ndarray, dtype as _dtype, empty as _empty, array as _array, \
+    searchsorted as _searchsorted, all as _all, diff as _diff, abs as _abs, argmin as _argmin
+
+FRAME_INDEX_DTYPE: _dtype = _dtype([("offset", "<u8"), ("length", "<u4"), ("t", "<i8")])
+
+
+def frame_column(channel: _Literal["front", "left", "right", "rear"]) -> str:
+    """
+    :param channel: the camera channel
+    :return: the name of the column that carries the frame references of the channel
+    """
+    return f"{channel}_view_frame"
+
+
+class FrameStoreWriter(object):
+    """
+    Append encoded frames (usually JPEG) of one camera channel to `<path>.frames` and their offsets, lengths and time
+    stamps to `<path>.fidx`. The telemetry log only needs to carry the returned frame references.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        :param path: the path without extensions
+        """
+        self._frames = open(f"{path}.frames", "ab")
+        self._index = open(f"{path}.fidx", "ab")
+        self._offset: int = self._frames.tell()
+        self._num_frames: int = self._index.tell() // FRAME_INDEX_DTYPE.itemsize
+
+    def __len__(self) -> int:
+        return self._num_frames
+
+    def append(self, t: int, frame: bytes | memoryview) -> int:
+        """
+        :param t: the time stamp in milliseconds
+        :param frame: the encoded frame
+        :return: the frame reference
+        """
+        self._frames.write(frame)
+        _array([(self._offset, len(frame), t)], FRAME_INDEX_DTYPE).tofile(self._index)
+        self._offset += len(frame)
+        self._num_frames += 1
+        return self._num_frames - 1
+
+    def flush(self) -> None:
+        # the frames go first so that an index entry never points to missing bytes
+        self._frames.flush()
+        self._index.flush()
+
+    def close(self) -> None:
+        self.flush()
+        self._frames.close()
+        self._index.close()
+
+
+class FrameStore(object):
+    """
+    A memory-mapped reader of a frame store that hands out zero-copy views of the frames.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        :param path: the path without extensions
+        """
+        if not _exists(f"{path}.fidx"):
+            raise FileNotFoundError(f"Frame store {path} not found")
+        self._path: str = path
+        self._frames: _ndarray = _empty(0, "u1")
+        self._index: _ndarray = _empty(0, FRAME_INDEX_DTYPE)
+        self._t_sorted: bool = True
+        self.refresh()
+
+    def refresh(self) -> None:
+        """
+        Map the frames appended since the store was opened.
+        """
+        if (n := _getsize(f"{self._path}.fidx") // FRAME_INDEX_DTYPE.itemsize) > 0:
+            self._index = _memmap(f"{self._path}.fidx", FRAME_INDEX_DTYPE, "r", shape=(n,))
+        if (size := _getsize(f"{self._path}.frames")) > 0:
+            self._frames = _memmap(f"{self._path}.frames", "u1", "r", shape=(size,))
+        # entries whose frames have not been flushed yet are excluded
+        while len(self._index) > 0 and (e := self._index[-1])["offset"] + e["length"] > len(self._frames):
+            self._index = self._index[:-1]
+        self._t_sorted = bool(_all(_diff(self._index["t"]) >= 0))
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __getitem__(self, ref: int) -> memoryview:
+        """
+        :param ref: the frame reference
+        :return: the encoded frame as a view into the mapped file
+        """
+        entry = self._index[ref]
+        return memoryview(self._frames)[int(entry["offset"]): int(entry["offset"]) + int(entry["length"])]
+
+    def time_stamp(self, ref: int) -> int:
+        return int(self._index[ref]["t"])
+
+    def time_stamps(self) -> _ndarray:
+        return self._index["t"]
+
+    def nearest(self, t: int) -> int:
+        """
+        :param t: the time stamp in milliseconds
+        :return: the reference of the frame whose time stamp is the closest
+        """
+        if len(self._index) < 1:
+            raise LookupError("The frame store is empty")
+        ts = self._index["t"]
+        if not self._t_sorted:
+            return int(_argmin(_abs(ts - t)))
+        i = int(_searchsorted(ts, t))
+        if i >= len(ts) or i > 0 and t - ts[i - 1] <= ts[i] - t:
+            return i - 1
+        return i
+
+    def close(self) -> None:
+        self._frames = _empty(0, "u1")
+        self._index = _empty(0, FRAME_INDEX_DTYPE)
@@ -0,0 +1,251 @@
+from bisect import bisect_right as _bisect_right
+from json import dump as _dump, load as _load, JSONDecodeError as _JSONDecodeError
+from os import stat as _stat
+from typing import Self as _Self
+
+from .segment import open_segment as _open_segment
+
+INDEX_VERSION: int = 1
+
+
+class DatasetIndex(object):
+    """
+    A sparse index of a session CSV file that records the byte offset of every `block_size`-th row and the range of
+    the time stamps in each block.
+    Rows must not contain line breaks, which holds for every file written by `CSV`.
+    Offsets in a compressed file refer to the decompressed stream.
+    """
+
+    def __init__(self, file: str, block_size: int, num_rows: int, file_size: int, file_mtime: float,
+                 blocks: list[tuple[int, float, float]]) -> None:
+        """
+        :param file: the path to the CSV file
+        :param block_size: the number of rows in each block
+        :param num_rows: the number of rows in the file
+        :param file_size: the size of the file when it was indexed
+        :param file_mtime: the modification time of the file when it was indexed
+        :param blocks: [(byte offset, min time stamp, max time stamp), ...]
+        """
+        self._file: str = file
+        self._block_size: int = block_size
+        self._num_rows: int = num_rows
+        self._file_size: int = file_size
+        self._file_mtime: float = file_mtime
+        self._blocks: list[tuple[int, float, float]] = blocks
+
+    def __len__(self) -> int:
+        return self._num_rows
+
+    def file(self) -> str:
+        return self._file
+
+    def block_size(self) -> int:
+        return self._block_size
+
+    def num_blocks(self) -> int:
+        return len(self._blocks)
+
+    def block(self, block: int) -> tuple[int, float, float]:
+        """
+        :param block: the block index
+        :return: (byte offset, min time stamp, max time stamp)
+        """
+        return self._blocks[block]
+
+    def offset(self, block: int) -> int:
+        """
+        :param block: the block index
+        :return: the byte offset of the first row in the block
+        """
+        return self._blocks[block][0]
+
+    def locate(self, row: int) -> tuple[int, int]:
+        """
+        :param row: the row index
+        :return: (byte offset of the block, number of rows to skip in the block)
+        """
+        return self._blocks[row // self._block_size][0], row % self._block_size
+
+    def blocks_within(self, t0: float | None, t1: float | None) -> tuple[int, int]:
+        """
+        Find the blocks that may contain rows with time stamps in [t0, t1].
+        :param t0: the lower bound or None if unbounded
+        :param t1: the upper bound or None if unbounded
+        :return: (first block, last block + 1), empty if no block overlaps
+        """
+        first, last = len(self._blocks), 0
+        for i, (_, t_min, t_max) in enumerate(self._blocks):
+            if (t0 is None or t_max >= t0) and (t1 is None or t_min <= t1):
+                first = min(first, i)
+                last = i + 1
+        return (first, last) if first < last else (0, 0)
+
+    def up_to_date(self) -> bool:
+        """
+        :return: True: the file has not changed since it was indexed; False: the index is outdated
+        """
+        try:
+            s = _stat(self._file)
+        except OSError:
+            return False
+        return s.st_size == self._file_size and s.st_mtime == self._file_mtime
+
+    def grown(self) -> bool:
+        """
+        :return: True: the file has grown since it was indexed, which is assumed to be an append; False: otherwise
+        """
+        try:
+            return _stat(self._file).st_size > self._file_size
+        except OSError:
+            return False
+
+    def save(self, file: str | None = None) -> None:
+        """
+        :param file: the path to the sidecar file or None to use the default path
+        """
+        with open(sidecar_path(self._file) if file is None else file, "w") as f:
+            _dump({"version": INDEX_VERSION, "block_size": self._block_size, "num_rows": self._num_rows,
+                   "file_size": self._file_size, "file_mtime": self._file_mtime, "blocks": self._blocks}, f)
+
+    @classmethod
+    def load(cls, file: str) -> _Self | None:
+        """
+        :param file: the path to the CSV file
+        :return: the index or None if the sidecar file is missing or invalid or the file has been modified other than
+            by appending
+        """
+        try:
+            with open(sidecar_path(file)) as f:
+                d = _load(f)
+        except (OSError, _JSONDecodeError):
+            return None
+        if d.get("version") != INDEX_VERSION:
+            return None
+        index = cls(file, d["block_size"], d["num_rows"], d["file_size"], d["file_mtime"],
+                    [tuple(block) for block in d["blocks"]])
+        return index if index.up_to_date() or index.grown() else None
+
+
+class SegmentedIndex(object):
+    """
+    A combined index of the segments of a log, which locates a row by the segment number and the position in the
+    segment.
+    """
+
+    def __init__(self, indexes: list[DatasetIndex]) -> None:
+        """
+        :param indexes: the indexes of the segments in order
+        """
+        self._indexes: list[DatasetIndex] = indexes
+        self._starts: list[int] = []
+        num_rows = 0
+        for index in indexes:
+            self._starts.append(num_rows)
+            num_rows += len(index)
+        self._num_rows: int = num_rows
+
+    def __len__(self) -> int:
+        return self._num_rows
+
+    def num_segments(self) -> int:
+        return len(self._indexes)
+
+    def segment(self, segment: int) -> DatasetIndex:
+        """
+        :param segment: the segment number
+        :return: the index of the segment
+        """
+        return self._indexes[segment]
+
+    def start(self, segment: int) -> int:
+        """
+        :param segment: the segment number
+        :return: the index of the first row in the segment
+        """
+        return self._starts[segment]
+
+    def find(self, row: int) -> tuple[int, int]:
+        """
+        :param row: the row index
+        :return: (segment number, row index in the segment)
+        """
+        if not 0 <= row < self._num_rows:
+            raise IndexError(f"Row {row} out of range")
+        # empty segments share the start of the next segment, so the last match is the one that holds the row
+        segment = _bisect_right(self._starts, row) - 1
+        return segment, row - self._starts[segment]
+
+    def locate(self, row: int) -> tuple[int, int, int]:
+        """
+        :param row: the row index
+        :return: (segment number, byte offset of the block, number of rows to skip in the block)
+        """
+        segment, row = self.find(row)
+        return segment, *self._indexes[segment].locate(row)
+
+    def up_to_date(self) -> bool:
+        return all(index.up_to_date() for index in self._indexes)
+
+
+def sidecar_path(file: str) -> str:
+    return f"{file}.idx"
+
+
+def _parse_time_stamp(line: bytes, column: int) -> float:
+    try:
+        return float(line.split(b",", column + 1)[column])
+    except (IndexError, ValueError):
+        return float("nan")
+
+
+def _scan(file: str, block_size: int, blocks: list[tuple[int, float, float]], offset: int | None,
+          save: bool) -> DatasetIndex:
+    s = _stat(file)
+    # blocks without valid time stamps never match a time range
+    num_rows = len(blocks) * block_size
+    with _open_segment(file) as f:
+        header = f.readline().rstrip(b"\r\n").split(b",")
+        column = header.index(b"t") if b"t" in header else -1
+        if offset is None:
+            offset = f.tell()
+        else:
+            f.seek(offset)
+        for line in f:
+            if num_rows % block_size == 0:
+                blocks.append((offset, float("inf"), float("-inf")))
+            offset += len(line)
+            num_rows += 1
+            if column < 0 or (t := _parse_time_stamp(line, column)) != t:
+                continue
+            if t < (block := blocks[-1])[1] or t > block[2]:
+                blocks[-1] = (block[0], min(t, block[1]), max(t, block[2]))
+    index = DatasetIndex(file, block_size, num_rows, s.st_size, s.st_mtime, blocks)
+    if save:
+        index.save()
+    return index
+
+
+def build_index(file: str, block_size: int = 1000, save: bool = False) -> DatasetIndex:
+    """
+    Scan a session CSV file and index it.
+    :param file: the path to the CSV file
+    :param block_size: the number of rows in each block
+    :param save: True: write the sidecar file next to the CSV file; False: keep the index in memory
+    :return: the index
+    """
+    if block_size < 1:
+        raise ValueError("`block_size` must be greater or equal to 1")
+    return _scan(file, block_size, [], None, save)
+
+
+def extend_index(index: DatasetIndex, save: bool = False) -> DatasetIndex:
+    """
+    Index the rows appended to a file since it was indexed.
+    The last block is scanned again because it may be incomplete or end with a partially written row.
+    :param index: the outdated index
+    :param save: True: write the sidecar file next to the CSV file; False: keep the index in memory
+    :return: the new index
+    """
+    if (n := index.num_blocks()) < 1:
+        return build_index(index.file(), index.block_size(), save)
+    return _scan(index.file(), index.block_size(), [index.block(i) for i in range(n - 1)], index.offset(n - 1), save)
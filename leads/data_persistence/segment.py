@@ -0,0 +1,100 @@
+from glob import glob as _glob, escape as _escape
+from gzip import open as _gzip_open
+from lzma import open as _lzma_open
+from os import remove as _remove, replace as _replace
+from os.path import splitext as _splitext
+from queue import Queue as _Queue
+from shutil import copyfileobj as _copyfileobj
+from threading import Thread as _Thread
+from typing import BinaryIO as _BinaryIO, Literal as _Literal
+
+from leads.logger import L
+
+type Compression = _Literal["gzip", "lzma"]
+
+_EXTENSIONS: dict[Compression, str] = {"gzip": ".gz", "lzma": ".xz"}
+
+
+def segment_path(file: str, n: int) -> str:
+    """
+    :param file: the path of the whole log, such as "data/session.csv"
+    :param n: the segment number
+    :return: the path of the segment, such as "data/session.0000.csv"
+    """
+    stem, ext = _splitext(file)
+    return f"{stem}.{n:04d}{ext}"
+
+
+def list_segments(file: str) -> list[str]:
+    """
+    Find the segments of a log in order. A segment being compressed is listed by its uncompressed path.
+    :param file: the path of the whole log
+    :return: the paths of the segments
+    """
+    stem, ext = _splitext(file)
+    segments = {}
+    for path in _glob(f"{_escape(stem)}.[0-9][0-9][0-9][0-9]{_escape(ext)}*"):
+        name, suffix = path[len(stem) + 1:len(stem) + 5], path[len(stem) + 5:]
+        if not name.isdigit() or suffix not in (ext, *(ext + e for e in _EXTENSIONS.values())):
+            continue
+        if (n := int(name)) not in segments or suffix == ext:
+            segments[n] = path
+    return [segments[n] for n in sorted(segments)]
+
+
+def open_segment(path: str) -> _BinaryIO:
+    """
+    Open a segment for reading bytes, decompressing it on the fly if it is compressed.
+    A compressed segment can be sought, but seeking is as slow as reading up to the position.
+    :param path: the path of the segment
+    :return: the file object
+    """
+    if path.endswith(_EXTENSIONS["gzip"]):
+        return _gzip_open(path, "rb")
+    if path.endswith(_EXTENSIONS["lzma"]):
+        return _lzma_open(path, "rb")
+    return open(path, "rb")
+
+
+def compress_segment(path: str, compression: Compression) -> str:
+    """
+    Compress a closed segment and remove the original.
+    :param path: the path of the segment
+    :param compression: the compression method
+    :return: the path of the compressed segment
+    """
+    target = path + _EXTENSIONS[compression]
+    with open(path, "rb") as src, (_gzip_open if compression == "gzip" else _lzma_open)(f"{target}.tmp", "wb") as dst:
+        _copyfileobj(src, dst)
+    _replace(f"{target}.tmp", target)
+    _remove(path)
+    return target
+
+
+class SegmentCompressor(object):
+    """
+    Compress closed segments one by one in a background thread.
+    """
+
+    def __init__(self, compression: Compression) -> None:
+        self._compression: Compression = compression
+        self._queue: _Queue[str | None] = _Queue()
+        self._thread: _Thread = _Thread(name=f"{id(self)} segment compressor", target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while (path := self._queue.get()) is not None:
+            try:
+                compress_segment(path, self._compression)
+            except OSError as e:
+                L.error(f"Failed to compress {path}: {repr(e)}")
+
+    def submit(self, path: str) -> None:
+        self._queue.put(path)
+
+    def close(self) -> None:
+        """
+        Wait until all the submitted segments are compressed.
+        """
+        self._queue.put(None)
+        self._thread.join()
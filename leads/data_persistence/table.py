@@ -0,0 +1,119 @@
+from hashlib import sha1 as _sha1
+from os import makedirs as _makedirs, replace as _replace, stat as _stat
+from os.path import abspath as _abspath, exists as _exists, join as _join
+from typing import Any as _Any, Generator as _Generator, Self as _Self
+
+from numpy import ndarray as _ndarray, concatenate as _concatenate, empty as _empty, load as _load, \
+    savez as _savez
+
+from leads.data_persistence.binary import BinaryDataset
+from leads.data_persistence.core import CSVDataset
+from leads.logger import L
+
+TABLE_CACHE_VERSION: int = 1
+
+
+def _cache_key(dataset: CSVDataset | BinaryDataset) -> str | None:
+    if not (files := dataset.source_files()):
+        return None
+    h = _sha1(f"{TABLE_CACHE_VERSION};{",".join(dataset.read_header())}".encode())
+    for file in files:
+        s = _stat(file)
+        h.update(f";{_abspath(file)};{s.st_size};{s.st_mtime_ns}".encode())
+    return h.hexdigest()
+
+
+class ColumnarTable(object):
+    """
+    An in-memory table that holds each column of a dataset as an array, so that the file is parsed only once no
+    matter how many passes run over it.
+    Missing values are kept as NaN in numeric columns and as None in the others.
+    """
+
+    def __init__(self, columns: dict[str, _ndarray]) -> None:
+        """
+        :param columns: {column: array}, all of the same length
+        """
+        if len({len(c) for c in columns.values()}) > 1:
+            raise ValueError("Columns must be of the same length")
+        self._columns: dict[str, _ndarray] = columns
+        self._header: tuple[str, ...] = tuple(columns.keys())
+        self._length: int = len(next(iter(columns.values()))) if columns else 0
+
+    @classmethod
+    def load(cls, dataset: CSVDataset | BinaryDataset, cache_dir: str | None = None) -> _Self:
+        """
+        Materialize the loaded columns of a dataset.
+        :param dataset: the dataset
+        :param cache_dir: the directory of the on-disk cache, which is keyed by the path, size and modification time
+            of the source files, or None to disable caching
+        :return: the table
+        """
+        key = _cache_key(dataset) if cache_dir else None
+        if key and _exists(cache := _join(cache_dir, f"{key}.npz")):
+            with _load(cache) as f:
+                return cls({name: f[name] for name in dataset.read_header()})
+        chunks = {name: [] for name in dataset.read_header()}
+        for chunk in dataset.columns():
+            # empty chunks, such as those of a segment with only the header, carry no meaningful types
+            if len(next(iter(chunk.values()), ())) < 1:
+                continue
+            for name, column in chunk.items():
+                chunks[name].append(column)
+        table = cls({name: _concatenate(c) if c else _empty(0) for name, c in chunks.items()})
+        if key:
+            table.save(cache_dir, key)
+        return table
+
+    def save(self, cache_dir: str, key: str) -> None:
+        if any(c.dtype.hasobject for c in self._columns.values()):
+            L.debug("The table is not cached because some columns are not numeric")
+            return
+        _makedirs(cache_dir, exist_ok=True)
+        with open(tmp := _join(cache_dir, f"{key}.tmp.npz"), "wb") as f:
+            _savez(f, **self._columns)
+        _replace(tmp, _join(cache_dir, f"{key}.npz"))
+
+    def header(self) -> tuple[str, ...]:
+        return self._header
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._columns
+
+    def column(self, name: str) -> _ndarray:
+        return self._columns[name]
+
+    def _values(self, name: str, key: slice | _ndarray) -> list[_Any]:
+        values = self._columns[name][key]
+        if values.dtype.kind in "fO" and (mask := values != values).any():
+            values = values.astype(object)
+            values[mask] = None
+        return values.tolist()
+
+    def _rows(self, key: slice | _ndarray) -> _Generator[dict[str, _Any], None, None]:
+        for row in zip(*(self._values(name, key) for name in self._header)):
+            yield dict(zip(self._header, row))
+
+    def rows(self, start: int = 0, stop: int | None = None,
+             chunk_size: int = 10000) -> _Generator[dict[str, _Any], None, None]:
+        """
+        Iterate over the rows in the same form as `CSVDataset`.
+        :param start: the index of the first row
+        :param stop: the index after the last row or None to iterate to the end
+        :param chunk_size: the number of rows converted at once
+        """
+        stop = self._length if stop is None else min(stop, self._length)
+        for i in range(start, stop, chunk_size):
+            yield from self._rows(slice(i, min(i + chunk_size, stop)))
+
+    def select(self, indexes: _ndarray, chunk_size: int = 10000) -> _Generator[dict[str, _Any], None, None]:
+        """
+        Iterate over the specified rows in the same form as `CSVDataset`.
+        :param indexes: the row indexes
+        :param chunk_size: the number of rows converted at once
+        """
+        for i in range(0, len(indexes), chunk_size):
+            yield from self._rows(indexes[i: i + chunk_size])
@@ -1,5 +1,7 @@
 from leads.dt.controller import *
 from leads.dt.device import *
+from leads.dt.instrumentation import *
 from leads.dt.odometer import *
 from leads.dt.predefined_tags import *
 from leads.dt.registry import *
+from leads.dt.sampler import *
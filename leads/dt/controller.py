@@ -1,6 +1,7 @@
-from typing import override as _override, overload as _overload
+from typing import override as _override, overload as _overload, Any as _Any
 
 from leads.dt.device import Device
+from leads.dt.sampler import SamplingEngine
 
 
 class Controller(Device):
@@ -11,6 +12,8 @@ class Controller(Device):
     def __init__(self) -> None:
         super().__init__()
         self._devices: dict[str, Device] = {}
+        self._sampling_engine: SamplingEngine | None = None
+        self._staleness: dict[str, float] = {}
 
     def _attach_device(self, tag: str, device: Device) -> None:
         self._devices[tag] = device
@@ -34,6 +37,38 @@ class Controller(Device):
             return self._devices[tag]
         self._attach_device(tag, device)
 
+    def sampling_engine(self, sampling_engine: SamplingEngine | None = None) -> SamplingEngine | None:
+        """
+        Set or get the sampling engine that caches the values of the devices.
+        :param sampling_engine: the sampling engine or None if getter mode
+        :return: the sampling engine or None if setter mode
+        """
+        if sampling_engine is None:
+            return self._sampling_engine
+        self._sampling_engine = sampling_engine
+
+    def read_device(self, tag: str, *fields: str) -> _Any:
+        """
+        Read a device without blocking if it is sampled by the sampling engine, otherwise read it synchronously.
+        :param tag: tag of the device
+        :param fields: the fields the value contributes to (if not specified, the keys are used if the value is a
+            dictionary, otherwise the tag)
+        :return: the latest value
+        """
+        if self._sampling_engine and (sample := self._sampling_engine.sample(tag)):
+            value, age = sample.value, sample.age()
+        else:
+            value, age = self._devices[tag].read(), 0
+        for field in fields or (value if isinstance(value, dict) else (tag,)):
+            self._staleness[field] = age
+        return value
+
+    def staleness(self) -> dict[str, float]:
+        """
+        :return: {field: the age of the value in milliseconds when it was last read by `read_device()`}
+        """
+        return self._staleness.copy()
+
     @_override
     def initialize(self, *parent_tags: str) -> None:
         super().initialize(*parent_tags)
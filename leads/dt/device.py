@@ -15,6 +15,7 @@ class Device(object):
         self._tag_locked: bool = False
         self._parent_tags: tuple[str, ...] = ()
         self._pins: tuple[int | str, ...] = pins
+        self._sampling_rate: float = 0
 
     @_override
     def __str__(self) -> str:
@@ -44,6 +45,16 @@ class Device(object):
         """
         self._tag_locked = True
 
+    def sampling_rate(self, rate: float | None = None) -> float | None:
+        """
+        Set or get the rate at which a sampling engine should read the device.
+        :param rate: the rate in Hz (0 to read synchronously) or None if getter mode
+        :return: the rate or None if setter mode
+        """
+        if rate is None:
+            return self._sampling_rate
+        self._sampling_rate = rate
+
     def parent_tags(self) -> tuple[str, ...]:
         """
         Get the parent tags of the device.
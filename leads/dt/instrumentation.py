@@ -0,0 +1,189 @@
+from functools import wraps as _wraps
+from json import dumps as _dumps
+from math import log10 as _log10
+from threading import Thread as _Thread
+from time import perf_counter as _perf_counter, sleep as _sleep
+from typing import Any as _Any, Callable as _Callable, Literal as _Literal
+
+from leads.dt.device import Device
+from leads.dt.registry import _devices, _controllers
+from leads.logger import L
+from leads.os import _thread_flags
+from leads.types import DeviceStatistics as _DeviceStatistics
+
+_BUCKETS_PER_DECADE: int = 20
+_MIN_DECADE: int = -7  # 100 ns
+_NUM_BUCKETS: int = 10 * _BUCKETS_PER_DECADE  # up to 1000 s
+
+type _Operation = _Literal["read", "write", "update"]
+
+
+class LatencyHistogram(object):
+    """
+    A histogram with logarithmic buckets, each about 12% wide, so that recording costs O(1) and the percentiles are
+    accurate to one bucket regardless of the number of samples.
+    """
+
+    def __init__(self) -> None:
+        self._buckets: list[int] = [0] * _NUM_BUCKETS
+        self._count: int = 0
+        self._num_errors: int = 0
+        self._sum: float = 0
+        self._max: float = 0
+
+    def record(self, latency: float, error: bool = False) -> None:
+        """
+        :param latency: the latency in seconds
+        :param error: True: the call raised an exception
+        """
+        i = int((_log10(latency) - _MIN_DECADE) * _BUCKETS_PER_DECADE) if latency > 0 else 0
+        self._buckets[min(max(i, 0), _NUM_BUCKETS - 1)] += 1
+        self._count += 1
+        self._sum += latency
+        if latency > self._max:
+            self._max = latency
+        if error:
+            self._num_errors += 1
+
+    def count(self) -> int:
+        return self._count
+
+    def num_errors(self) -> int:
+        return self._num_errors
+
+    def error_rate(self) -> float:
+        return self._num_errors / self._count if self._count > 0 else 0
+
+    def mean(self) -> float:
+        return self._sum / self._count if self._count > 0 else 0
+
+    def maximum(self) -> float:
+        return self._max
+
+    def percentile(self, q: float) -> float:
+        """
+        :param q: the percentile in [0, 100]
+        :return: the upper bound of the bucket that contains the percentile in seconds
+        """
+        if self._count < 1:
+            return 0
+        rank, n = q * .01 * self._count, 0
+        for i, c in enumerate(self._buckets):
+            if (n := n + c) >= rank and c > 0:
+                return min(10 ** ((i + 1) / _BUCKETS_PER_DECADE + _MIN_DECADE), self._max)
+        return self._max
+
+    def summary(self) -> dict[str, float]:
+        """
+        :return: the summary in milliseconds
+        """
+        return {"count": self._count, "error_rate": self.error_rate(), "mean": self.mean() * 1000,
+                "p50": self.percentile(50) * 1000, "p99": self.percentile(99) * 1000, "max": self._max * 1000}
+
+    def clear(self) -> None:
+        self._buckets = [0] * _NUM_BUCKETS
+        self._count = self._num_errors = 0
+        self._sum = self._max = 0
+
+
+_statistics: dict[str, dict[_Operation, LatencyHistogram]] = {}
+
+
+def _instrumented(histogram: LatencyHistogram, method: _Callable[..., _Any]) -> _Callable[..., _Any]:
+    @_wraps(method)
+    def _(*args, **kwargs) -> _Any:
+        start = _perf_counter()
+        try:
+            r = method(*args, **kwargs)
+        except BaseException:
+            histogram.record(_perf_counter() - start, True)
+            raise
+        histogram.record(_perf_counter() - start)
+        return r
+
+    return _
+
+
+def instrument(device: Device) -> None:
+    """
+    Record the latency of `read()`, `write()` and `update()` of the device under its tag.
+    Only this instance is affected. Instrumenting a device twice has no effect.
+    :param device: the device to instrument (must be tagged)
+    """
+    if (tag := device.tag()) in _statistics:
+        return
+    _statistics[tag] = statistics = {}
+    for operation in ("read", "write", "update"):
+        statistics[operation] = histogram = LatencyHistogram()
+        setattr(device, operation, _instrumented(histogram, getattr(device, operation)))
+
+
+def instrument_registered_devices() -> None:
+    """
+    Instrument every controller and device in the registry.
+    """
+    for c in _controllers.values():
+        instrument(c)
+    for d in _devices.values():
+        instrument(d)
+
+
+def device_statistics(tag: str | None = None) -> _DeviceStatistics:
+    """
+    :param tag: the device tag or None to include all instrumented devices
+    :return: {tag: {operation: summary}}, operations never called are omitted
+    """
+    tags = _statistics.keys() if tag is None else (tag,)
+    return {t: {operation: histogram.summary() for operation, histogram in _statistics[t].items() if
+                histogram.count() > 0} for t in tags}
+
+
+def clear_device_statistics() -> None:
+    for statistics in _statistics.values():
+        for histogram in statistics.values():
+            histogram.clear()
+
+
+def format_device_statistics(statistics: _DeviceStatistics | None = None) -> str:
+    """
+    :param statistics: the statistics or None to use the current statistics
+    :return: one line per device and operation sorted by the maximum latency in descending order
+    """
+    lines = sorted(((s["max"], f"{tag}.{operation}: {s["count"]} calls, p50 {s["p50"]:.2f} MS, p99 {s["p99"]:.2f} MS,"
+                                f" max {s["max"]:.2f} MS, {s["error_rate"] * 100:.1f}% errors") for tag, o in
+                    (statistics or device_statistics()).items() for operation, s in o.items()), reverse=True)
+    return "\n".join(line for _, line in lines)
+
+
+def dump_device_statistics(interval: float, sink: _Callable[[_DeviceStatistics], None] | None = None,
+                           reset: bool = False) -> _Thread:
+    """
+    Periodically dump the device statistics in a background thread.
+    :param interval: the interval in seconds
+    :param sink: the receiver of the statistics or None to print them through the logger
+    :param reset: True: clear the statistics after each dump so that each dump covers one interval
+    :return: the thread
+    """
+
+    def _() -> None:
+        while _thread_flags.active:
+            _sleep(interval)
+            if sink:
+                sink(device_statistics())
+            else:
+                L.debug(f"DEVICE STATISTICS\n{format_device_statistics()}")
+            if reset:
+                clear_device_statistics()
+
+    thread = _Thread(name="device statistics", target=_, daemon=True)
+    thread.start()
+    return thread
+
+
+def encode_device_statistics(statistics: _DeviceStatistics) -> bytes:
+    """
+    Encode the statistics into a message that can be broadcast through the comm channel.
+    :param statistics: the statistics
+    :return: the message
+    """
+    return b"device_statistics:" + _dumps(statistics).encode()
@@ -0,0 +1,111 @@
+from threading import Thread as _Thread
+from time import perf_counter as _perf_counter, sleep as _sleep
+from typing import Any as _Any
+
+from leads.dt.device import Device
+from leads.logger import L
+from leads.os import _thread_flags
+
+
+class Sample(object):
+    __slots__ = ("value", "time_stamp", "latency")
+
+    def __init__(self, value: _Any, time_stamp: float, latency: float) -> None:
+        """
+        :param value: the value read from the device
+        :param time_stamp: the time when the read finished in seconds (`time.perf_counter()`)
+        :param latency: the duration of the read in seconds
+        """
+        self.value: _Any = value
+        self.time_stamp: float = time_stamp
+        self.latency: float = latency
+
+    def age(self) -> float:
+        """
+        :return: the time since the value was read in milliseconds
+        """
+        return (_perf_counter() - self.time_stamp) * 1000
+
+
+class SamplingEngine(object):
+    """
+    Sample every registered device at its own rate in a background worker and keep the latest value of each device so
+    that a frame can be assembled without waiting for any device.
+    """
+
+    def __init__(self) -> None:
+        self._devices: dict[str, tuple[Device, float]] = {}
+        self._cache: dict[str, Sample] = {}
+        self._num_errors: dict[str, int] = {}
+        self._threads: list[_Thread] = []
+        self._active: bool = False
+
+    def register(self, device: Device, rate: float | None = None) -> None:
+        """
+        :param device: the device to sample (must be tagged)
+        :param rate: the sampling rate in Hz or None to use the device's own rate
+        """
+        if self._active:
+            raise RuntimeError("Cannot register devices while the engine is running")
+        if not (rate := device.sampling_rate() if rate is None else rate) or rate < 0:
+            raise ValueError(f"Device {device.tag()} does not declare a sampling rate")
+        self._devices[device.tag()] = (device, rate)
+        self._num_errors[device.tag()] = 0
+
+    def sampled(self, tag: str) -> bool:
+        return tag in self._devices
+
+    def active(self) -> bool:
+        return self._active
+
+    def _run(self, tag: str, device: Device, period: float) -> None:
+        deadline = _perf_counter()
+        while self._active and _thread_flags.active:
+            start = _perf_counter()
+            try:
+                self._cache[tag] = Sample(device.read(), t := _perf_counter(), t - start)
+            except Exception as e:
+                self._num_errors[tag] += 1
+                L.debug(f"Failed to sample {tag}: {repr(e)}")
+            deadline += period
+            if (delay := deadline - _perf_counter()) > 0:
+                _sleep(delay)
+            else:
+                deadline = _perf_counter()
+
+    def start(self) -> None:
+        if self._active:
+            return
+        self._active = True
+        self._threads = [_Thread(name=f"{tag} sampler", target=self._run, args=(tag, device, 1 / rate), daemon=True)
+                         for tag, (device, rate) in self._devices.items()]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self) -> None:
+        self._active = False
+
+    def sample(self, tag: str) -> Sample | None:
+        """
+        :param tag: the device tag
+        :return: the latest sample or None if the device has not been sampled yet
+        """
+        return self._cache.get(tag)
+
+    def read(self, tag: str, default: _Any = None) -> _Any:
+        """
+        Get the latest value without blocking.
+        :param tag: the device tag
+        :param default: the value to return if the device has not been sampled yet
+        :return: the latest value
+        """
+        return default if (sample := self._cache.get(tag)) is None else sample.value
+
+    def num_errors(self, tag: str) -> int:
+        return self._num_errors[tag]
+
+    def staleness(self) -> dict[str, float]:
+        """
+        :return: {tag: the age of the latest value in milliseconds}
+        """
+        return {tag: sample.age() for tag, sample in tuple(self._cache.items())}
@@ -58,9 +58,19 @@ class SuspensionExitEvent(SuspensionEvent):
 
 
 class EventListener(CallbackChain):
-    @_override
-    def super(self, e: Event) -> None:
-        super().super(e)
+    def capabilities(self) -> frozenset[str]:
+        """
+        Find the hooks overridden by this listener or any listener down the chain.
+        :return: the names of the overridden hooks
+        """
+        r = set()
+        listener = self
+        while listener is not None:
+            for name in EventListener.__callback_methods__:
+                if getattr(type(listener), name) is not getattr(EventListener, name):
+                    r.add(name)
+            listener = listener._chain
+        return frozenset(r)
 
     def pre_push(self, event: DataPushedEvent) -> None: ...
 
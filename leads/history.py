@@ -0,0 +1,99 @@
+from typing import Any as _Any, Callable as _Callable
+
+from numpy import zeros as _zeros, dtype as _dtype, ndarray as _ndarray, searchsorted as _searchsorted, nan as _nan
+
+from leads.data import DataContainer
+
+
+def numeric_fields(data: DataContainer) -> tuple[str, ...]:
+    """
+    Select the fields that can be stored in a columnar history.
+    :param data: a sample data container
+    :return: the names of the fields whose values are booleans or numbers
+    """
+    return tuple(n for n, v in data.to_dict().items() if n != "t" and isinstance(v, bool | int | float))
+
+
+class ColumnarHistory(object):
+    """
+    A preallocated ring buffer that stores the history data column by column.
+    Every row is written twice so that the latest rows are always contiguous, which makes windowed queries zero-copy
+    views into the buffer.
+    """
+
+    def __init__(self, fields: tuple[str, ...], capacity: int) -> None:
+        """
+        :param fields: the fields to record (the time stamp is always recorded as "t")
+        :param capacity: the maximum number of rows retained
+        """
+        if capacity < 1:
+            raise ValueError("`capacity` must be greater or equal to 1")
+        self._fields: tuple[str, ...] = tuple(f for f in fields if f != "t")
+        self._capacity: int = capacity
+        self._buffer: _ndarray = _zeros(capacity * 2, _dtype([("t", "i8")] + [
+            (f, "?" if f == "gps_valid" else "f8") for f in self._fields]))
+        self._head: int = 0
+        self._size: int = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def fields(self) -> tuple[str, ...]:
+        return self._fields
+
+    def capacity(self) -> int:
+        return self._capacity
+
+    def append(self, data: DataContainer) -> None:
+        """
+        Record a new row. Missing fields are recorded as NaN.
+        :param data: the new data
+        """
+        row = (data.time_stamp(), *(getattr(data, f, _nan) for f in self._fields))
+        self._buffer[self._head] = self._buffer[self._head + self._capacity] = row
+        self._head = (self._head + 1) % self._capacity
+        if self._size < self._capacity:
+            self._size += 1
+
+    def clear(self) -> None:
+        self._head = 0
+        self._size = 0
+
+    def _rows(self, n: int | None = None) -> _ndarray:
+        end = self._head + self._capacity
+        n = self._size if n is None else min(n, self._size)
+        return self._buffer[end - n: end]
+
+    def last(self, field: str, n: int | None = None) -> _ndarray:
+        """
+        Get the latest values of a field in chronological order.
+        The result is a view into the buffer and will be overwritten by later appends. Copy it if it is retained.
+        :param field: the field name or "t"
+        :param n: the number of rows or None to include all retained rows
+        :return: the values
+        """
+        return self._rows(n)[field]
+
+    def within(self, field: str, duration: int) -> _ndarray:
+        """
+        Get the values of a field recorded in the latest period of time.
+        :param field: the field name or "t"
+        :param duration: the period in milliseconds
+        :return: the values as a view into the buffer
+        """
+        if self._size < 1:
+            return self._rows()[field]
+        t = self._rows()["t"]
+        return self._rows(self._size - int(_searchsorted(t, t[-1] - duration)))[field]
+
+    def reduce(self, field: str, reducer: _Callable[[_ndarray], _Any], n: int | None = None,
+               duration: int | None = None) -> _Any:
+        """
+        Apply a vectorized reduction such as `numpy.mean` over a window.
+        :param field: the field name
+        :param reducer: the reduction method
+        :param n: the number of rows
+        :param duration: the period in milliseconds (overrides `n`)
+        :return: the result of the reduction
+        """
+        return reducer(self.last(field, n) if duration is None else self.within(field, duration))
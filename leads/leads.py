@@ -1,15 +1,24 @@
-from typing import TypeVar as _TypeVar, Any as _Any, override as _override, Literal as _Literal
+from typing import TypeVar as _TypeVar, Any as _Any, override as _override, Literal as _Literal, \
+    Callable as _Callable
 
+from leads.constant import ESCMode
 from leads.context import Context
-from leads.data import DataContainer
+from leads.data import DataContainer, _compile_getter
 from leads.dt import has_device
 from leads.event import EventListener, Event, DataPushedEvent, UpdateEvent, SuspensionEvent, InterventionEvent, \
     InterventionExitEvent, SuspensionExitEvent
 from leads.plugin import Plugin
+from leads.rolling import RollingStatistics
 from leads.sft import SFT
 
 T = _TypeVar("T", bound=DataContainer)
 
+type _Hook = _Literal["pre_push", "post_push", "pre_update", "post_update"]
+type _DispatchEntry = tuple[str, _Callable[[Context, dict[str, _Any]], None] | None, tuple[str, ...], _Callable[
+    [_Any], tuple[_Any, ...]], str | None]
+
+_HOOKS: tuple[_Hook, _Hook, _Hook, _Hook] = ("pre_push", "post_push", "pre_update", "post_update")
+
 
 class _SuspensionException(Exception):
     def __init__(self, event: SuspensionEvent) -> None:
@@ -22,22 +31,40 @@ class LEADS(Context[T]):
         super().__init__(initial_data, data_seq_size, num_laps_timed)
         self._plugins: dict[str, Plugin] = {}
         self._event_listener: EventListener = EventListener()
+        self._event_capabilities: frozenset[str] = frozenset()
+        self._statistics: dict[str, RollingStatistics] = {}
+        self._dispatch_table: dict[_Hook, list[_DispatchEntry]] = {}
+        self._dispatch_key: tuple[ESCMode, int, int] | None = None
 
     def plugin(self, key: str, plugin: Plugin | None = None) -> Plugin | None:
         if plugin is None:
             return self._plugins[key]
         self._plugins[key] = plugin
+        self._dispatch_key = None
         plugin.on_load(self)
 
+    def statistics(self, key: str, statistics: RollingStatistics | None = None) -> RollingStatistics | None:
+        """
+        Set or get the rolling statistics updated on every push.
+        :param key: the key of the statistics
+        :param statistics: the statistics or None if getter mode
+        :return: the statistics or None if setter mode
+        """
+        if statistics is None:
+            return self._statistics[key]
+        self._statistics[key] = statistics
+
     def set_event_listener(self, event_listener: EventListener) -> None:
         event_listener.bind_chain(self._event_listener)
         self._event_listener = event_listener
+        self._event_capabilities = event_listener.capabilities()
 
     @_override
     def suspend(self, event: SuspensionEvent) -> None:
         if isinstance(event, SuspensionExitEvent):
-            self._event_listener.post_suspend(event)
-        else:
+            if "post_suspend" in self._event_capabilities:
+                self._event_listener.post_suspend(event)
+        elif "pre_suspend" in self._event_capabilities:
             self._event_listener.pre_suspend(event)
 
     def _acquire_data(self, name: str, key: str, mandatory: bool = True) -> _Any | None:
@@ -47,36 +74,74 @@ class LEADS(Context[T]):
             if mandatory:
                 raise _SuspensionException(SuspensionEvent(self, key, f"No data for `{name}`"))
 
-    def _do_plugin_callback(self, method: _Literal["pre_push", "post_push", "pre_update", "post_update"]) -> None:
+    def _compile_plugin_dispatch(self) -> bool:
+        """
+        Build the dispatch table for the current plugins, enablement, ESC mode and device states.
+        Hooks that a plugin does not override are left out unless the plugin is to be suspended.
+        :return: True: the table can be cached; False: it depends on devices that are not registered yet
+        """
+        cacheable = True
+        table = {method: [] for method in _HOOKS}
         for key, plugin in self._plugins.items():
-            if plugin.enabled():
+            if not plugin.enabled():
+                continue
+            failure = None
+            for tag in plugin.required_devices():
+                if not has_device(tag):
+                    cacheable = False
+                elif SFT.device_ok(tag):
+                    continue
+                failure = f"Device {tag} not ok"
+                break
+            names = plugin.required_data()
+            for method in _HOOKS:
+                if failure or getattr(type(plugin), method) is not getattr(Plugin, method):
+                    table[method].append((key, getattr(plugin, method), names, _compile_getter(names), failure))
+        self._dispatch_table = table
+        return cacheable
+
+    def _do_plugin_callback(self, method: _Hook) -> None:
+        if (dispatch_key := (self._esc_mode, SFT.revision(), sum(
+                plugin.revision() for plugin in self._plugins.values()))) != self._dispatch_key:
+            self._dispatch_key = dispatch_key if self._compile_plugin_dispatch() else None
+        data = self.data()
+        for key, hook, names, getter, failure in self._dispatch_table[method]:
+            try:
+                if failure:
+                    raise _SuspensionException(SuspensionEvent(self, key, failure))
                 try:
-                    for tag in plugin.required_devices():
-                        if not has_device(tag) or not SFT.device_ok(tag):
-                            raise _SuspensionException(SuspensionEvent(self, key, f"Device {tag} not ok"))
-                    getattr(plugin, method)(self, {d: self._acquire_data(d, key) for d in plugin.required_data()})
-                except _SuspensionException as e:
-                    self.suspend(e.event)
+                    kwargs = dict(zip(names, getter(data)))
+                except AttributeError:
+                    kwargs = {d: self._acquire_data(d, key) for d in names}
+                hook(self, kwargs)
+            except _SuspensionException as e:
+                self.suspend(e.event)
 
     @_override
     def push(self, data: T) -> None:
-        self._event_listener.pre_push(DataPushedEvent(self, data))
+        if "pre_push" in self._event_capabilities:
+            self._event_listener.pre_push(DataPushedEvent(self, data))
         self._do_plugin_callback("pre_push")
         super().push(data)
+        for statistics in self._statistics.values():
+            statistics.push(data)
         self._do_plugin_callback("post_push")
-        self._event_listener.post_push(DataPushedEvent(self, data))
+        if "post_push" in self._event_capabilities:
+            self._event_listener.post_push(DataPushedEvent(self, data))
 
     @_override
     def intervene(self, event: InterventionEvent) -> None:
         if isinstance(event, InterventionExitEvent):
-            self._event_listener.post_intervene(event)
-        else:
+            if "post_intervene" in self._event_capabilities:
+                self._event_listener.post_intervene(event)
+        elif "pre_intervene" in self._event_capabilities:
             self._event_listener.pre_intervene(event)
 
     @_override
     def update(self) -> None:
         self._do_plugin_callback("pre_update")
-        self._event_listener.on_update(UpdateEvent(self))
+        if "on_update" in self._event_capabilities:
+            self._event_listener.on_update(UpdateEvent(self))
         self._do_plugin_callback("post_update")
 
     @_override
@@ -85,7 +150,7 @@ class LEADS(Context[T]):
         try:
             return super().brake_indicator(brake_indicator)
         finally:
-            if self._brake_indicator != initial_state:
+            if self._brake_indicator != initial_state and "brake_indicator" in self._event_capabilities:
                 self._event_listener.brake_indicator(Event("BRAKE_INDICATOR", self), brake_indicator)
 
     @_override
@@ -94,7 +159,7 @@ class LEADS(Context[T]):
         try:
             return super().left_indicator(left_indicator, override)
         finally:
-            if self._left_indicator != initial_state:
+            if self._left_indicator != initial_state and "left_indicator" in self._event_capabilities:
                 self._event_listener.left_indicator(Event("LEFT_INDICATOR", self), left_indicator)
 
     @_override
@@ -103,11 +168,11 @@ class LEADS(Context[T]):
         try:
             return super().right_indicator(right_indicator, override)
         finally:
-            if self._right_indicator != initial_state:
+            if self._right_indicator != initial_state and "right_indicator" in self._event_capabilities:
                 self._event_listener.right_indicator(Event("RIGHT_INDICATOR", self), right_indicator)
 
     @_override
     def hazard(self, hazard: bool | None = None) -> bool | None:
-        if (r := super().hazard(hazard)) is None:
+        if (r := super().hazard(hazard)) is None and "hazard" in self._event_capabilities:
             self._event_listener.hazard(Event("HAZARD", self), hazard)
         return r
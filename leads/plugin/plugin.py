@@ -15,11 +15,27 @@ class Plugin(object):
         self._required_data: tuple[str, ...] = required_data
         self._required_devices: tuple[str, ...] = required_devices
         self._enabled: bool = True
+        self._revision: int = 0
+
+    def revision(self) -> int:
+        """
+        The context caches its dispatch table until the revision changes.
+        Call `touch()` if `enabled()` depends on anything other than the ESC mode and the setter.
+        :return: a number that changes whenever the plugin's enablement changes
+        """
+        return self._revision
+
+    def touch(self) -> None:
+        """
+        Invalidate the cached dispatch table.
+        """
+        self._revision += 1
 
     def enabled(self, enabled: bool | None = None) -> bool | None:
         if enabled is None:
             return self._enabled
         self._enabled = enabled
+        self.touch()
 
     def required_data(self) -> tuple[str, ...]:
         return self._required_data
@@ -0,0 +1,139 @@
+from collections import deque as _deque
+from math import sqrt as _sqrt, nan as _nan
+
+from leads.data import DataContainer
+
+
+class RollingStatistics(object):
+    """
+    Incrementally maintained statistics of a field over a count-based or time-based window.
+    Every push and eviction costs O(1) (amortized for the extrema), regardless of the window size.
+    """
+
+    def __init__(self, field: str, size: int | None = None, duration: int | None = None, alpha: float = .1) -> None:
+        """
+        :param field: the field to track
+        :param size: the maximum number of samples in the window or None if unlimited
+        :param duration: the maximum period of the window in milliseconds or None if unlimited
+        :param alpha: the smoothing factor of the exponential moving average
+        """
+        if size is not None and size < 1:
+            raise ValueError("`size` must be greater or equal to 1")
+        if not 0 < alpha <= 1:
+            raise ValueError("`alpha` must be in (0, 1]")
+        self._field: str = field
+        self._size: int | None = size
+        self._duration: int | None = duration
+        self._alpha: float = alpha
+        self._samples: _deque[tuple[float, float]] = _deque()
+        self._min_seq: _deque[tuple[float, float]] = _deque()
+        self._max_seq: _deque[tuple[float, float]] = _deque()
+        self._t0: int | None = None
+        self._y0: float = 0
+        self._sum_x: float = 0
+        self._sum_y: float = 0
+        self._sum_xx: float = 0
+        self._sum_xy: float = 0
+        self._sum_yy: float = 0
+        self._ema: float | None = None
+
+    def field(self) -> str:
+        return self._field
+
+    def _evict(self) -> None:
+        x, s = self._samples.popleft()
+        self._sum_x -= x
+        self._sum_y -= s
+        self._sum_xx -= x * x
+        self._sum_xy -= x * s
+        self._sum_yy -= s * s
+        if self._min_seq[0][0] == x:
+            self._min_seq.popleft()
+        if self._max_seq[0][0] == x:
+            self._max_seq.popleft()
+
+    def append(self, t: int, y: float) -> None:
+        """
+        :param t: the time stamp in milliseconds (must not decrease)
+        :param y: the value
+        """
+        if self._t0 is None:
+            self._t0 = t
+            self._y0 = y
+        # shift both axes by the first sample to avoid cancellation in the sums
+        x, s = (t - self._t0) * .001, y - self._y0
+        if self._samples and x <= self._samples[-1][0]:
+            x = self._samples[-1][0] + 1e-9
+        self._samples.append((x, s))
+        self._sum_x += x
+        self._sum_y += s
+        self._sum_xx += x * x
+        self._sum_xy += x * s
+        self._sum_yy += s * s
+        while self._min_seq and self._min_seq[-1][1] >= y:
+            self._min_seq.pop()
+        self._min_seq.append((x, y))
+        while self._max_seq and self._max_seq[-1][1] <= y:
+            self._max_seq.pop()
+        self._max_seq.append((x, y))
+        self._ema = y if self._ema is None else self._ema + self._alpha * (y - self._ema)
+        if self._size is not None:
+            while len(self._samples) > self._size:
+                self._evict()
+        if self._duration is not None:
+            while x - self._samples[0][0] > self._duration * .001:
+                self._evict()
+
+    def push(self, data: DataContainer) -> None:
+        """
+        Record the field from the data. Data without the field or with non-numeric values are ignored.
+        :param data: the new data
+        """
+        if isinstance(y := getattr(data, self._field, None), int | float):
+            self.append(data.time_stamp(), float(y))
+
+    def clear(self) -> None:
+        self._samples.clear()
+        self._min_seq.clear()
+        self._max_seq.clear()
+        self._t0 = None
+        self._y0 = 0
+        self._sum_x = self._sum_y = self._sum_xx = self._sum_xy = self._sum_yy = 0
+        self._ema = None
+
+    def count(self) -> int:
+        return len(self._samples)
+
+    def mean(self) -> float:
+        return self._y0 + self._sum_y / n if (n := len(self._samples)) > 0 else _nan
+
+    def variance(self) -> float:
+        """
+        :return: the population variance
+        """
+        if (n := len(self._samples)) < 1:
+            return _nan
+        return max(self._sum_yy / n - (self._sum_y / n) ** 2, 0)
+
+    def std(self) -> float:
+        return _sqrt(v) if (v := self.variance()) == v else _nan
+
+    def minimum(self) -> float:
+        return self._min_seq[0][1] if self._min_seq else _nan
+
+    def maximum(self) -> float:
+        return self._max_seq[0][1] if self._max_seq else _nan
+
+    def ema(self) -> float:
+        """
+        :return: the exponential moving average of all the values (not limited to the window)
+        """
+        return _nan if self._ema is None else self._ema
+
+    def slope(self) -> float:
+        """
+        :return: the least-squares slope of the values over time in units per second
+        """
+        if (n := len(self._samples)) < 2 or (d := n * self._sum_xx - self._sum_x ** 2) <= 0:
+            return 0
+        return (n * self._sum_xy - self._sum_x * self._sum_y) / d
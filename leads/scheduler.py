@@ -0,0 +1,130 @@
+from threading import Thread as _Thread
+from time import perf_counter as _perf_counter, sleep as _sleep
+from typing import Callable as _Callable, Any as _Any, Self as _Self
+
+from leads.dt import Controller
+from leads.leads import LEADS
+from leads.logger import L
+from leads.os import _thread_flags
+
+
+class Scheduler(object):
+    """
+    Run a task at a fixed rate.
+    The deadlines are laid on an absolute time grid so that delays do not accumulate. A task that exceeds its period
+    is counted as an overrun and the missed deadlines are skipped.
+    """
+
+    def __init__(self, rate: float, task: _Callable[[], None]) -> None:
+        """
+        :param rate: the target rate in Hz
+        :param task: the task to run every period
+        """
+        if rate <= 0:
+            raise ValueError("`rate` must be greater than 0")
+        self._period: float = 1 / rate
+        self._task: _Callable[[], None] = task
+        self._thread: _Thread | None = None
+        self._active: bool = False
+        self._start_time: float | None = None
+        self._num_frames: int = 0
+        self._num_overruns: int = 0
+        self._sum_jitter: float = 0
+        self._max_jitter: float = 0
+
+    def rate(self) -> float:
+        """
+        :return: the target rate in Hz
+        """
+        return 1 / self._period
+
+    def active(self) -> bool:
+        return self._active
+
+    def num_frames(self) -> int:
+        return self._num_frames
+
+    def num_overruns(self) -> int:
+        return self._num_overruns
+
+    def frame_rate(self) -> float:
+        """
+        :return: the actual rate in Hz
+        """
+        if self._start_time is None or (duration := _perf_counter() - self._start_time) <= 0:
+            return 0
+        return self._num_frames / duration
+
+    def jitter(self) -> float:
+        """
+        :return: the average lateness of the task relative to its deadlines in seconds
+        """
+        return self._sum_jitter / self._num_frames if self._num_frames > 0 else 0
+
+    def max_jitter(self) -> float:
+        """
+        :return: the maximum lateness of the task relative to its deadlines in seconds
+        """
+        return self._max_jitter
+
+    def reset_statistics(self) -> None:
+        self._start_time = _perf_counter() if self._active else None
+        self._num_frames = 0
+        self._num_overruns = 0
+        self._sum_jitter = 0
+        self._max_jitter = 0
+
+    def run(self) -> None:
+        """
+        Loop in the caller thread until `stop()` is called or the program exits.
+        """
+        self._active = True
+        self._start_time = deadline = _perf_counter()
+        while self._active and _thread_flags.active:
+            if (delay := deadline - _perf_counter()) > 0:
+                _sleep(delay)
+            self._sum_jitter += (jitter := max(_perf_counter() - deadline, 0))
+            if jitter > self._max_jitter:
+                self._max_jitter = jitter
+            try:
+                self._task()
+            except Exception as e:
+                L.error(f"Scheduled task error: {repr(e)}")
+            self._num_frames += 1
+            deadline += self._period
+            if (t := _perf_counter()) > deadline:
+                self._num_overruns += 1
+                deadline += (int((t - deadline) / self._period) + 1) * self._period
+        self._active = False
+
+    def start(self, parallel: bool = True) -> _Self:
+        """
+        :param parallel: True: run in a separate thread; False: run in the caller thread
+        :return: self
+        """
+        if self._thread:
+            raise RuntimeError("A scheduler can only run once")
+        if parallel:
+            self._thread = _Thread(name=f"{id(self)} scheduler", target=self.run, daemon=True)
+            self._thread.start()
+        else:
+            self.run()
+        return self
+
+    def stop(self) -> None:
+        self._active = False
+
+
+def acquisition_task(context: LEADS[_Any], controller: Controller) -> _Callable[[], None]:
+    """
+    Create the task that reads the controller and drives the context, which is what the GUI does every frame.
+    :param context: the LEADS context
+    :param controller: the controller to read, usually the main controller
+    :return: the task
+    """
+
+    def _() -> None:
+        context.push(controller.read())
+        context.update()
+
+    return _
@@ -24,6 +24,13 @@ class SystemFailureTracer(object):
         self.on_device_recover: _Callable[[Device], None] = lambda _: None
         self._system_failures: dict[str, int] = {}
         self._device_failures: dict[str, int] = {}
+        self._revision: int = 0
+
+    def revision(self) -> int:
+        """
+        :return: a number that changes whenever the device failure records change
+        """
+        return self._revision
 
     def system_ok(self, system: str) -> bool:
         return system not in self._system_failures or self._system_failures[system] < 1
@@ -39,6 +46,7 @@ class SystemFailureTracer(object):
         if (tag := device.tag()) not in self._device_failures:
             self._device_failures[tag] = 0
         self._device_failures[tag] += 1
+        self._revision += 1
         self.on_device_fail(device, error)
         L.error(f"{device} error: {error}")
         for system in systems:
@@ -53,6 +61,7 @@ class SystemFailureTracer(object):
             raise RuntimeWarning(f"System not marked for device {device}")
         if (tag := device.tag()) in self._device_failures:
             self._device_failures[tag] -= 1
+            self._revision += 1
             if self._device_failures[tag] < 1:
                 self._device_failures.pop(tag)
                 self.on_device_recover(device)
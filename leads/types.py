@@ -1,9 +1,13 @@
 from typing import Callable as _Callable, SupportsInt as _SupportsInt, SupportsFloat as _SupportsFloat
 
+from numpy import ndarray as _ndarray
+
 type Number = int | float | _SupportsInt | _SupportsFloat
 type Compressor[T] = _Callable[[dict[T, float], int], dict[T, float]]
+type ArrayCompressor[T] = _Callable[[_ndarray, _ndarray, int], tuple[_ndarray, _ndarray]]
 type OnRegister[T] = _Callable[[T], None]
 type OnRegisterChain[T] = _Callable[[OnRegister[T]], OnRegister[T]]
+type DeviceStatistics = dict[str, dict[str, dict[str, float]]]
 type SupportedConfigValue = bool | int | float | str | None
 type SupportedConfig = SupportedConfigValue | tuple[SupportedConfig, ...]
 type DefaultHeader = tuple[
@@ -8,7 +8,7 @@ from numpy import ndarray as _ndarray, array as _array
 
 from leads import Controller as _Controller, DataContainer as _DataContainer, get_controller as _get_controller, \
     VisualDataContainer as _VisualDataContainer, Device as _Device
-from leads.data_persistence import CSVDataset as _CSVDataset
+from leads.data_persistence import CSVDataset as _CSVDataset, FrameStore as _FrameStore, frame_column as _frame_column
 from leads_video import Camera as _Camera
 
 T = _TypeVar("T", bound=_DataContainer)
@@ -28,12 +28,17 @@ class ReplayController(_Controller, _Generic[T]):
             d = next(self._iterator)
         except StopIteration:
             return self._constructor()
-        t = d.pop("t")
-        dc = self._constructor(**d)
-        setattr(dc, "_time_stamp", t)
+        dc = self._constructor.from_dict(d)
         self._current_data_container = dc
         return dc
 
+    def seek(self, t: int) -> None:
+        """
+        Continue the replay from the first frame at or after the time stamp.
+        :param t: the time stamp in milliseconds
+        """
+        self._iterator = self._dataset.time_range(t)
+
     def current_data_container(self) -> T | None:
         return self._current_data_container
 
@@ -44,10 +49,17 @@ class ReplayController(_Controller, _Generic[T]):
 
 class ReplayCamera(_Camera):
     def __init__(self, channel: _Literal["front", "left", "right", "rear"],
-                 resolution: tuple[int, int] | None = None) -> None:
+                 resolution: tuple[int, int] | None = None, frame_store: str | None = None) -> None:
+        """
+        :param channel: the camera channel
+        :param resolution: the resolution
+        :param frame_store: the path to the frame store of the channel or None if the frames are in the dataset
+        """
         super().__init__(-1, resolution)
         self._channel: _Literal["front", "left", "right", "rear"] = channel
         self._controller: ReplayController | None = None
+        self._frame_store_path: str | None = frame_store
+        self._frame_store: _FrameStore | None = None
 
     @_override
     def initialize(self, *parent_tags: str) -> None:
@@ -55,6 +67,8 @@ class ReplayCamera(_Camera):
         if not isinstance(controller := _get_controller(parent_tags[-1]), ReplayController):
             raise TypeError("Emulated cameras must be initialized with a replay controller")
         self._controller = controller
+        if self._frame_store_path:
+            self._frame_store = _FrameStore(self._frame_store_path)
 
     @_override
     def read(self) -> _ndarray | None:
@@ -64,8 +78,12 @@ class ReplayCamera(_Camera):
     def read_pil(self) -> _Image | None:
         if not isinstance(dc := self._controller.current_data_container(), _VisualDataContainer):
             raise TypeError("Emulated cameras require visual data containers")
+        if self._frame_store:
+            ref = getattr(dc, _frame_column(self._channel), None)
+            return None if ref is None else _open(_BytesIO(self._frame_store[int(ref)]))
         return _open(_BytesIO(_b64decode(getattr(dc, f"{self._channel}_view_base64"))))
 
     @_override
     def close(self) -> None:
-        pass
+        if self._frame_store:
+            self._frame_store.close()
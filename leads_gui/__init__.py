@@ -12,7 +12,8 @@ from typing import Callable as _Callable, Any as _Any
 from customtkinter import set_default_color_theme as _set_default_color_theme
 
 from leads import LEADS as _LEADS, set_on_register_config as _set_on_register_config, \
-    get_controller as _get_controller, MAIN_CONTROLLER as _MAIN_CONTROLLER
+    get_controller as _get_controller, MAIN_CONTROLLER as _MAIN_CONTROLLER, require_config as _require_config, \
+    Scheduler as _Scheduler, acquisition_task as _acquisition_task
 from leads.types import OnRegister as _OnRegister
 from leads_gui.config import *
 from leads_gui.prototype import *
@@ -46,9 +47,17 @@ def initialize(window: Pot,
     ctx = ContextManager(window)
     render(ctx)
 
-    def on_refresh(_) -> None:
-        leads.push(main_controller.read())
-        leads.update()
+    if (rate := _require_config().acquisition_rate) > 0:
+        window.runtime_data().acquisition = scheduler = _Scheduler(rate, _acquisition_task(leads, main_controller))
+
+        def on_refresh(_) -> None:
+            # the devices are only guaranteed to be initialized at the first refresh
+            scheduler.start()
+            window.set_on_refresh(lambda _: None)
+    else:
+        def on_refresh(_) -> None:
+            leads.push(main_controller.read())
+            leads.update()
 
     window.set_on_refresh(on_refresh)
     return ctx
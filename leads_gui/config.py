@@ -13,6 +13,7 @@ class Config(_ConfigTemplate):
         self.theme_mode: _Literal["system", "light", "dark"] = "system"
         self.manual_mode: bool = False
         self.refresh_rate: int = 30
+        self.acquisition_rate: int = 0
         self.m_ratio: float = .7
         self.num_external_screens: int = 0
         self.font_size_small: int = 14
@@ -12,17 +12,17 @@ from leads_gui.types import Color as _Color
 
 
 class ImageVariable(_Variable):
-    def __init__(self, master: _Misc, image: _Image | None, name: str | None = None) -> None:
+    def __init__(self, master: _Misc, image: _Image | bytes | memoryview | None, name: str | None = None) -> None:
         super().__init__(master, False, name)
-        self._image: _Image | None = image
+        self._image: _Image | bytes | memoryview | None = image
 
     @_override
-    def set(self, value: _Image | None) -> None:
+    def set(self, value: _Image | bytes | memoryview | None) -> None:
         super().set(not super().get())
         self._image = value
 
     @_override
-    def get(self) -> _Image | None:
+    def get(self) -> _Image | bytes | memoryview | None:
         return self._image
 
 
@@ -52,6 +52,8 @@ class Photo(CanvasBased, VariableControlled):
         if image := self._variable.get():
             if isinstance(image, str):
                 image = _open(_BytesIO(_b64decode(image)))
+            elif isinstance(image, bytes | memoryview):
+                image = _open(_BytesIO(image))
             self._image = _PhotoImage(image.resize((int(w), int(h))))
             canvas.collect("d0", canvas.create_image(hc, vc, image=self._image))
 
@@ -12,7 +12,7 @@ from numpy import lcm as _lcm
 from screeninfo import get_monitors as _get_monitors
 
 from leads import require_config as _require_config, DataContainer as _DataContainer, \
-    initialize_main as _initialize_main
+    initialize_main as _initialize_main, BinaryEncoder as _BinaryEncoder, Scheduler as _Scheduler
 from leads.comm import Server as _Server
 from leads_gui.performance_checker import PerformanceChecker
 from leads_gui.system import _ASSETS_PATH, get_system_kernel as _get_system_kernel
@@ -220,6 +220,8 @@ class _RuntimeData(object):
         self.start_time: int = int(_time())
         self.comm: _Server | None = None
         self.comm_stream: _Server | None = None
+        self.comm_encoder: _BinaryEncoder | None = None
+        self.acquisition: _Scheduler | None = None
 
     @_override
     def __setattr__(self, key: str, value: _Any) -> None:
@@ -228,7 +230,12 @@ class _RuntimeData(object):
         raise AttributeError(f"{key} is protected and cannot be reassigned")
 
     def comm_notify(self, d: _DataContainer | dict[str, _Any]) -> None:
-        if self.comm:
+        if not self.comm:
+            return
+        if self.comm_encoder:
+            for msg in self.comm_encoder.encode(d):
+                self.comm.broadcast(msg)
+        else:
             self.comm.broadcast(d.encode() if isinstance(d, _DataContainer) else _dumps(d).encode())
 
     def comm_stream_notify(self, tag: _Literal["frvc", "lfvc", "rtvc", "revc"], frame: bytes) -> None:
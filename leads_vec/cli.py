@@ -1,8 +1,8 @@
 from base64 import b64encode
 from datetime import datetime as _datetime
-from threading import Thread as _Thread
+from threading import Thread as _Thread, Lock as _Lock
 from time import time as _time, sleep as _sleep
-from typing import Callable as _Callable, override as _override
+from typing import Any as _Any, Callable as _Callable, override as _override
 
 from customtkinter import CTkButton as _Button, CTkLabel as _Label, DoubleVar as _DoubleVar, StringVar as _StringVar, \
     CTkSegmentedButton as _CTkSegmentedButton
@@ -12,7 +12,8 @@ from screeninfo import get_monitors as _get_monitors
 from leads import LEADS, SystemLiteral, require_config, register_context, ESCMode, L, \
     EventListener, DataPushedEvent, UpdateEvent, has_device, GPS_RECEIVER, get_device, InterventionEvent, \
     SuspensionEvent, Event, LEFT_INDICATOR, RIGHT_INDICATOR, format_duration, BRAKE_INDICATOR, REAR_VIEW_CAMERA, \
-    FRONT_VIEW_CAMERA, LEFT_VIEW_CAMERA, RIGHT_VIEW_CAMERA, SuspensionExitEvent
+    FRONT_VIEW_CAMERA, LEFT_VIEW_CAMERA, RIGHT_VIEW_CAMERA, SuspensionExitEvent, BinaryEncoder, \
+    instrument_registered_devices, dump_device_statistics, format_device_statistics, encode_device_statistics
 from leads.comm import Callback, Service, start_server, create_server, my_ip_addresses, ConnectionBase
 from leads_audio import DIRECTION_INDICATOR_ON, DIRECTION_INDICATOR_OFF, WARNING, CONFIRM
 from leads_gui import RuntimeData, Window, Pot, GForceVar, FrequencyGenerator, Left, Color, Right, ContextManager, \
@@ -89,6 +90,8 @@ class CommCallback(Callback):
     def on_connect(self, service: Service, connection: ConnectionBase) -> None:
         self.super(service=service, connection=connection)
         self.uim["comm_status"].configure(text="COMM ONLINE", text_color=["black", "white"])
+        if encoder := self.uim.window().runtime_data().comm_encoder:
+            encoder.request_schema()
 
     @_override
     def on_disconnect(self, service: Service, connection: ConnectionBase) -> None:
@@ -113,6 +116,9 @@ class CommCallback(Callback):
                 get_proxy_canvas(self.uim, "m1").next_mode()
             case b"m3":
                 get_proxy_canvas(self.uim, "m3").next_mode()
+            case b"schema":
+                if encoder := self.uim.window().runtime_data().comm_encoder:
+                    encoder.request_schema()
 
 
 def add_secondary_window(context_manager: ContextManager, display: int, var_lap_times: _StringVar,
@@ -259,9 +265,19 @@ def main() -> int:
 
     uim = initialize(w, render, ctx)
 
+    if cfg.comm_binary:
+        w.runtime_data().comm_encoder = BinaryEncoder()
     w.runtime_data().comm = start_server(create_server(cfg.comm_port, CommCallback(ctx, uim)), True)
     if cfg.comm_stream:
         enable_comm_stream(uim, cfg.comm_stream_port)
+    if cfg.device_statistics_interval > 0:
+        instrument_registered_devices()
+
+        def dump(statistics: dict[str, dict[str, dict[str, float]]]) -> None:
+            L.debug(f"DEVICE STATISTICS\n{format_device_statistics(statistics)}")
+            w.runtime_data().comm.broadcast(encode_device_statistics(statistics))
+
+        dump_device_statistics(cfg.device_statistics_interval, dump, True)
 
     class IdleUpdate(FrequencyGenerator):
         @_override
@@ -281,6 +297,67 @@ def main() -> int:
 
     w.add_frequency_generator("idle_update", IdleUpdate(1000))
 
+    # the event handlers may run in the acquisition thread, so they only record the latest configuration of each
+    # widget, which is applied in the GUI thread when the data are rendered
+    pending_configurations: dict[str, _Callable[[], None]] = {}
+    pending_configurations_lock = _Lock()
+
+    def configure_later(key: str, **kwargs) -> None:
+        with pending_configurations_lock:
+            pending_configurations[key] = lambda: uim[key].configure(**kwargs)
+
+    def configure_fault_light_later(key: str, image: _Callable[..., _Any]) -> None:
+        with pending_configurations_lock:
+            pending_configurations[key] = lambda: uim[key].configure(image=image(color=Color.RED))
+
+    def apply_pending_configurations() -> None:
+        nonlocal pending_configurations
+        with pending_configurations_lock:
+            configurations, pending_configurations = pending_configurations, {}
+        for configure in configurations.values():
+            configure()
+
+    def render_data() -> None:
+        apply_pending_configurations()
+        d = ctx.data()
+        lap_times = ctx.lap_times()
+        var_lap_times.set(f"LAP TIMES\n\n{"No Lap Timed" if len(lap_times) < 1 else "\n".join(map(
+            lambda t: format_duration(t * .001), lap_times))}")
+        if has_device(GPS_RECEIVER):
+            gps = get_device(GPS_RECEIVER).read()
+            var_gps.set(f"GPS {"VALID" if d.gps_valid else "NO FIX"} - {gps[4]} {gps[5]}\n\n"
+                        f"{d.gps_ground_speed:.1f} KM / H\n"
+                        f"LAT {d.latitude:.5f}\nLON {d.longitude:.5f}")
+        else:
+            var_gps.set(f"GPS {"VALID" if d.gps_valid else "NO FIX"} - !NF!\n\n"
+                        f"{d.gps_ground_speed:.1f} KM / H\n"
+                        f"LAT {d.latitude:.5f}\nLON {d.longitude:.5f}")
+        if cam := get_camera(REAR_VIEW_CAMERA):
+            var_rear_view.set(cam.read_pil())
+        var_speed.set(d.speed)
+        var_voltage.set(f"{d.voltage:.1f} V")
+        st = ctx.speed_trend()
+        var_speed_trend.set(st)
+        var_g_force.set((d.lateral_acceleration, d.forward_acceleration))
+        if w.runtime_data().control_system_switch_changed:
+            for system in SystemLiteral:
+                system_lowercase = system.lower()
+                if ctx.plugin(SystemLiteral(system)).enabled():
+                    uim[system_lowercase].configure(text=f"{system} ON")
+                else:
+                    uim[system_lowercase].configure(text=f"{system} OFF")
+                    uim[f"{system_lowercase}_status"].configure(text=f"{system} OFF", text_color=("black", "white"))
+            w.runtime_data().control_system_switch_changed = False
+
+    class DataRendering(FrequencyGenerator):
+        @_override
+        def do(self) -> None:
+            render_data()
+
+    if w.runtime_data().acquisition:
+        # the data are acquired in another thread, so the widgets are only touched in the GUI thread
+        w.add_frequency_generator("data_rendering", DataRendering(0))
+
     class CustomListener(EventListener):
         @_override
         def pre_push(self, e: DataPushedEvent) -> None:
@@ -296,47 +373,20 @@ def main() -> int:
         @_override
         def on_update(self, e: UpdateEvent) -> None:
             self.super(e)
-            d = e.context.data()
-            lap_times = ctx.lap_times()
-            var_lap_times.set(f"LAP TIMES\n\n{"No Lap Timed" if len(lap_times) < 1 else "\n".join(map(
-                lambda t: format_duration(t * .001), lap_times))}")
-            if has_device(GPS_RECEIVER):
-                gps = get_device(GPS_RECEIVER).read()
-                var_gps.set(f"GPS {"VALID" if d.gps_valid else "NO FIX"} - {gps[4]} {gps[5]}\n\n"
-                            f"{d.gps_ground_speed:.1f} KM / H\n"
-                            f"LAT {d.latitude:.5f}\nLON {d.longitude:.5f}")
-            else:
-                var_gps.set(f"GPS {"VALID" if d.gps_valid else "NO FIX"} - !NF!\n\n"
-                            f"{d.gps_ground_speed:.1f} KM / H\n"
-                            f"LAT {d.latitude:.5f}\nLON {d.longitude:.5f}")
-            if cam := get_camera(REAR_VIEW_CAMERA):
-                var_rear_view.set(cam.read_pil())
-            var_speed.set(d.speed)
-            var_voltage.set(f"{d.voltage:.1f} V")
-            st = ctx.speed_trend()
-            var_speed_trend.set(st)
-            var_g_force.set((d.lateral_acceleration, d.forward_acceleration))
-            if w.runtime_data().control_system_switch_changed:
-                for system in SystemLiteral:
-                    system_lowercase = system.lower()
-                    if ctx.plugin(SystemLiteral(system)).enabled():
-                        uim[system_lowercase].configure(text=f"{system} ON")
-                    else:
-                        uim[system_lowercase].configure(text=f"{system} OFF")
-                        uim[f"{system_lowercase}_status"].configure(text=f"{system} OFF", text_color=("black", "white"))
-                w.runtime_data().control_system_switch_changed = False
+            if not w.runtime_data().acquisition:
+                render_data()
 
         @_override
         def pre_intervene(self, e: InterventionEvent) -> None:
             self.super(e)
             if e.system in SystemLiteral:
-                uim[f"{e.system.lower()}_status"].configure(text=f"{e.system} INTEV", text_color="red")
+                configure_later(f"{e.system.lower()}_status", text=f"{e.system} INTEV", text_color="red")
 
         @_override
         def post_intervene(self, e: InterventionEvent) -> None:
             self.super(e)
             if e.system in SystemLiteral:
-                uim[f"{e.system.lower()}_status"].configure(text=f"{e.system} READY", text_color="green")
+                configure_later(f"{e.system.lower()}_status", text=f"{e.system} READY", text_color="green")
 
         @_override
         def pre_suspend(self, e: SuspensionEvent) -> None:
@@ -344,23 +394,23 @@ def main() -> int:
             if not w.active():
                 return
             if e.system in SystemLiteral:
-                uim[f"{e.system.lower()}_status"].configure(text=f"{e.system} SUSPD", text_color="gray")
+                configure_later(f"{e.system.lower()}_status", text=f"{e.system} SUSPD", text_color="gray")
             else:
                 match e.system:
                     case "BATT":
-                        uim["battery_fault"].configure(image=Battery(color=Color.RED))
+                        configure_fault_light_later("battery_fault", Battery)
                     case "BRAKE":
-                        uim["brake_fault"].configure(image=Brake(color=Color.RED))
+                        configure_fault_light_later("brake_fault", Brake)
                     case "ESC":
-                        uim["esc_fault"].configure(image=ESC(color=Color.RED))
+                        configure_fault_light_later("esc_fault", ESC)
                     case "GPS":
-                        uim["gps_fault"].configure(image=Satellite(color=Color.RED))
+                        configure_fault_light_later("gps_fault", Satellite)
                     case "LIGHT":
-                        uim["light_fault"].configure(image=Light(color=Color.RED))
+                        configure_fault_light_later("light_fault", Light)
                     case "MOTOR":
-                        uim["motor_fault"].configure(image=Motor(color=Color.RED))
+                        configure_fault_light_later("motor_fault", Motor)
                     case "WSC":
-                        uim["wsc_fault"].configure(image=Speed(color=Color.RED))
+                        configure_fault_light_later("wsc_fault", Speed)
 
         @_override
         def post_suspend(self, e: SuspensionExitEvent) -> None:
@@ -368,23 +418,23 @@ def main() -> int:
             if not w.active():
                 return
             if e.system in SystemLiteral:
-                uim[f"{e.system.lower()}_status"].configure(text=f"{e.system} READY", text_color="green")
+                configure_later(f"{e.system.lower()}_status", text=f"{e.system} READY", text_color="green")
             else:
                 match e.system:
                     case "BATT":
-                        uim["battery_fault"].configure(image=None)
+                        configure_later("battery_fault", image=None)
                     case "BRAKE":
-                        uim["brake_fault"].configure(image=None)
+                        configure_later("brake_fault", image=None)
                     case "ESC":
-                        uim["esc_fault"].configure(image=None)
+                        configure_later("esc_fault", image=None)
                     case "GPS":
-                        uim["gps_fault"].configure(image=None)
+                        configure_later("gps_fault", image=None)
                     case "LIGHT":
-                        uim["light_fault"].configure(image=None)
+                        configure_later("light_fault", image=None)
                     case "MOTOR":
-                        uim["motor_fault"].configure(image=None)
+                        configure_later("motor_fault", image=None)
                     case "WSC":
-                        uim["wsc_fault"].configure(image=None)
+                        configure_later("wsc_fault", image=None)
 
         @_override
         def brake_indicator(self, event: Event, state: bool) -> None:
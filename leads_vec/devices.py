@@ -5,7 +5,7 @@ from leads import device, controller, MAIN_CONTROLLER, LEFT_FRONT_WHEEL_SPEED_SE
     ConcurrentOdometer, LEFT_INDICATOR, RIGHT_INDICATOR, VOLTAGE_SENSOR, DataContainer, has_device, \
     FRONT_VIEW_CAMERA, LEFT_VIEW_CAMERA, RIGHT_VIEW_CAMERA, REAR_VIEW_CAMERA, VisualDataContainer, BRAKE_INDICATOR, \
     SFT, read_device_marker, has_controller, POWER_CONTROLLER, WHEEL_SPEED_CONTROLLER, ACCELEROMETER, require_context, \
-    ltm_get, ltm_set, distance_between
+    ltm_get, ltm_set, distance_between, SamplingEngine
 from leads_arduino import ArduinoMicro, WheelSpeedSensor, VoltageSensor, Accelerometer, Acceleration
 from leads_comm_serial import SOBD
 from leads_gpio import NMEAGPSReceiver, LEDGroup, LED, LEDGroupCommand, LEDCommand, Entire, Transition, Button, \
@@ -28,6 +28,8 @@ NUM_DIVISIONS: int = config.get("num_divisions", 1)
 THROTTLE_PEDAL_PIN: int = config.get("throttle_pedal_pin", 2)
 BRAKE_PEDAL_PIN: int = config.get("brake_pedal_pin", 3)
 VOLTAGE_SENSOR_PIN: int = config.get("voltage_sensor_pin", 4)
+# ((tag, rate), ...), such as (("gps", 10), ("odm", 50))
+SAMPLING_RATES: dict[str, float] = dict(config.get("sampling_rates", ()))
 
 register_plugins()
 
@@ -54,40 +56,52 @@ class VeCController(Controller):
             mark_device(self, "LIGHT")
         if read_device_marker(self):
             SFT.fail(self, RuntimeError("Unexpected system integrity"))
+        # the configured rates override the ones the devices declare
+        rates = {d: r for d in self.devices() if (r := SAMPLING_RATES.get(d.tag(), d.sampling_rate())) > 0}
+        if rates:
+            engine = SamplingEngine()
+            for d, rate in rates.items():
+                engine.register(d, rate)
+            self.sampling_engine(engine)
+            engine.start()
+
+    def _read_camera(self, tag: str, prefix: str, visual: dict[str, str | int]) -> None:
+        visual[f"{prefix}_base64"] = self.read_device(tag, f"{prefix}_base64")
+        # a cached frame is at least as old as the sample that holds it
+        visual[f"{prefix}_latency"] = int(max(get_camera(tag, Base64Camera).latency() * 1000,
+                                              self.staleness()[f"{prefix}_base64"]))
 
     @override
     def read(self) -> DataContainer:
         general = {
-            "gps_valid": (gps := self.device(GPS_RECEIVER).read())[0],
+            "gps_valid": (gps := self.read_device(GPS_RECEIVER, "gps_valid", "gps_ground_speed", "latitude",
+                                                  "longitude"))[0],
             "gps_ground_speed": gps[1],
             "latitude": gps[2],
             "longitude": gps[3],
-            **self.device(POWER_CONTROLLER).read()
+            **self.read_device(POWER_CONTROLLER)
         }
-        wsc = self.device(WHEEL_SPEED_CONTROLLER).read()
+        # copied because the cached value may be shared with the previous frames
+        wsc = self.read_device(WHEEL_SPEED_CONTROLLER).copy()
         odometer = self.device(ODOMETER)
         if GPS_ONLY:
             wsc["speed"] = gps[1]
             prev = require_context().data()
             odometer.write(odometer.read() + distance_between(prev.latitude, prev.longitude, gps[2], gps[3]))
-        general["mileage"] = odometer.read()
+            # read back synchronously because the sampled value predates the write
+            general["mileage"] = odometer.read()
+            self._staleness["mileage"] = 0
+        else:
+            general["mileage"] = self.read_device(ODOMETER, "mileage")
         visual = {}
         if has_device(FRONT_VIEW_CAMERA):
-            cam = get_camera(FRONT_VIEW_CAMERA, Base64Camera)
-            visual["front_view_base64"] = cam.read()
-            visual["front_view_latency"] = int(cam.latency() * 1000)
+            self._read_camera(FRONT_VIEW_CAMERA, "front_view", visual)
         if has_device(LEFT_VIEW_CAMERA):
-            cam = get_camera(LEFT_VIEW_CAMERA, Base64Camera)
-            visual["left_view_base64"] = cam.read()
-            visual["left_view_latency"] = int(cam.latency() * 1000)
+            self._read_camera(LEFT_VIEW_CAMERA, "left_view", visual)
         if has_device(RIGHT_VIEW_CAMERA):
-            cam = get_camera(RIGHT_VIEW_CAMERA, Base64Camera)
-            visual["right_view_base64"] = cam.read()
-            visual["right_view_latency"] = int(cam.latency() * 1000)
+            self._read_camera(RIGHT_VIEW_CAMERA, "right_view", visual)
         if has_device(REAR_VIEW_CAMERA):
-            cam = get_camera(REAR_VIEW_CAMERA, Base64Camera)
-            visual["rear_view_base64"] = cam.read()
-            visual["rear_view_latency"] = int(cam.latency() * 1000)
+            self._read_camera(REAR_VIEW_CAMERA, "rear_view", visual)
         return DataContainer(**wsc, **general) if len(visual) < 1 else VisualDataContainer(**visual, **wsc, **general)
 
 
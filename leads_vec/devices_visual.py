@@ -14,6 +14,7 @@ except ImportError as e:
 config: Config = require_config()
 CAMERA_RESOLUTION: tuple[int, int] | None = config.get("camera_resolution")
 QUALITY: int = config.get("camera_quality", 25)
+SAMPLING_RATE: float = config.get("camera_sampling_rate", 0)  # 0: read synchronously
 CAMERA_TAGS: list[str] = []
 CAMERA_ARGS: list[tuple[int, tuple[int, int] | None, int]] = []
 if (port := config.get("front_view_camera_port")) is not None:
@@ -35,6 +36,7 @@ class Cameras(LightweightBase64Camera):
     @override
     def initialize(self, *parent_tags: str) -> None:
         mark_device(self, "Jarvis")
+        self.sampling_rate(SAMPLING_RATE)
         super().initialize(*parent_tags)
 
 
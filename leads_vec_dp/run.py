@@ -1,10 +1,12 @@
 from atexit import register as _register
+from os.path import exists as _exists, join as _join
 from typing import Any as _Any
 
 from yaml import load as _load, SafeLoader as _SafeLoader
 
 from leads import L as _L
-from leads.data_persistence import CSVDataset as _CSVDataset
+from leads.data_persistence import CSVDataset as _CSVDataset, SegmentedCSVDataset as _SegmentedCSVDataset, \
+    FrameStore as _FrameStore, list_segments as _list_segments, BinaryDataset as _BinaryDataset
 from leads.data_persistence.analyzer import InferredDataset as _InferredDataset, Inference as _Inference, \
     SafeSpeedInference as _SafeSpeedInference, SpeedInferenceByAcceleration as _SpeedInferenceByAcceleration, \
     SpeedInferenceByMileage as _SpeedInferenceByMileage, \
@@ -14,8 +16,8 @@ from leads.data_persistence.analyzer import InferredDataset as _InferredDataset,
     MileageInferenceBySpeed as _MileageInferenceBySpeed, \
     MileageInferenceByGPSPosition as _MileageInferenceByGPSPosition, \
     VisualDataRealignmentByLatency as _VisualDataRealignmentByLatency
-from leads.data_persistence.analyzer.processor import Processor as _Processor
-from leads_video import extract_video as _extract_video
+from leads.data_persistence.analyzer.processor import Processor as _Processor, PROCESSOR_HEADER as _PROCESSOR_HEADER
+from leads_video import extract_video as _extract_video, extract_video_from_store as _extract_video_from_store
 
 INFERENCE_METHODS: dict[str, type[_Inference]] = {
     "safe-speed": _SafeSpeedInference,
@@ -38,25 +40,34 @@ def run(target: str) -> int:
     with open(target) as f:
         target = _load(f.read(), _SafeLoader)
     if "inferences" in target:
-        dataset = _InferredDataset(target["dataset"])
         inferences = target["inferences"]
-        if "clear" in inferences:
-            dataset.clear_all(inferences["clear"])
-            inferences.pop("clear")
         methods = []
         for method in inferences["methods"]:
             methods.append(INFERENCE_METHODS[method]())
         inferences.pop("methods")
+        usecols = None
+        if not {job["uses"] for job in target["jobs"]} & {"extract-video", "save-as"}:
+            # only load the columns that the inferences and the processor use
+            usecols = set(_PROCESSOR_HEADER)
+            for method in methods:
+                usecols.update(method.header())
+        dataset = _InferredDataset(target["dataset"], usecols=usecols)
+        if "clear" in inferences:
+            dataset.clear_all(inferences["clear"])
+            inferences.pop("clear")
         repeat = 1
         if "repeat" in inferences:
             repeat = inferences["repeat"]
             inferences.pop("repeat")
         for _ in range(repeat):
             _L.info(f"Affected {(n := dataset.complete(*methods, **inferences))} row{"s" if n > 1 else ""}")
+    elif _exists(_join(target["dataset"], "schema.json")):
+        dataset = _BinaryDataset(target["dataset"])
     else:
-        dataset = _CSVDataset(target["dataset"])
+        dataset = _SegmentedCSVDataset(target["dataset"]) if not _exists(target["dataset"]) and _list_segments(
+            target["dataset"]) else _CSVDataset(target["dataset"])
     _register(dataset.close)
-    processor = _Processor(dataset)
+    processor = _Processor(dataset, target.get("cache"))
     for job in target["jobs"]:
         _L.info(f"Executing job {job["name"]}...")
         match job["uses"]:
@@ -72,8 +83,15 @@ def run(target: str) -> int:
                 _L.info(*processor.suggest_on_lap(job["with"]["lap_index"]), sep="\n")
             case "draw-comparison-of-laps":
                 processor.draw_comparison_of_laps(**_optional_kwargs(job, "with"))
+            case "export-laps":
+                _L.info("Exported", *processor.export_laps(**job["with"]), sep="\n")
+            case "lap-delta":
+                _L.info(*processor.lap_delta(**_optional_kwargs(job, "with")).summary(), sep="\n")
             case "extract-video":
-                _extract_video(dataset, file := job["with"]["file"], job["with"]["tag"])
+                if "frame_store" in job["with"]:
+                    _extract_video_from_store(_FrameStore(job["with"]["frame_store"]), file := job["with"]["file"])
+                else:
+                    _extract_video(dataset, file := job["with"]["file"], job["with"]["tag"])
                 _L.info(f"Video saved as {file}")
             case "save-as":
                 dataset.save(file := job["with"]["file"])
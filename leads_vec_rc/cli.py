@@ -1,17 +1,21 @@
 from atexit import register
+from base64 import b64decode
+from binascii import Error as BinasciiError
 from datetime import datetime
 from json import loads, JSONDecodeError
 from os import makedirs
 from os.path import abspath, exists
+from struct import error as StructError
 from time import sleep
 from typing import Any, override
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from leads import require_config, L, DataContainer
+from leads import require_config, L, DataContainer, BinaryDecoder, is_binary, SCHEMA_REQUEST
 from leads.comm import Service, Client, start_client, create_client, Callback, Connection, ConnectionBase
-from leads.data_persistence import DataPersistence, CSV, DEFAULT_HEADER_FULL, VISUAL_HEADER_FULL
+from leads.data_persistence import DataPersistence, CSV, DEFAULT_HEADER_FULL, VISUAL_HEADER_FULL, FrameStoreWriter, \
+    frame_column
 from leads_vec_rc.config import Config
 
 config: Config = require_config()
@@ -25,18 +29,36 @@ CAR_CENTER_OF_MASS: float = config.get("car_center_of_mass", .25)
 
 time_stamp_record: DataPersistence[int] = DataPersistence(2000)
 csv: CSV | None = None
+frame_stores: dict[str, FrameStoreWriter] = {}
+CHANNELS: tuple[str, str, str, str] = ("front", "left", "right", "rear")
 
 
 def try_create_csv(data: dict[str, Any]) -> None:
     global csv
     if csv:
         return
-    csv = CSV(f"{config.data_dir}/{datetime.now().strftime("%Y-%m-%d_%H-%M-%S")}.csv",
-              VISUAL_HEADER_FULL if set(VISUAL_HEADER_FULL).issubset(data.keys()) else DEFAULT_HEADER_FULL,
-              time_stamp_record)
+    name = f"{config.data_dir}/{datetime.now().strftime("%Y-%m-%d_%H-%M-%S")}"
+    header = DEFAULT_HEADER_FULL
+    if set(VISUAL_HEADER_FULL).issubset(data.keys()):
+        if config.save_frames:
+            for channel in CHANNELS:
+                frame_stores[channel] = store = FrameStoreWriter(f"{name}.{channel}")
+                register(store.close)
+                header += (frame_column(channel), f"{channel}_view_latency")
+        else:
+            header = VISUAL_HEADER_FULL
+    csv = CSV(f"{name}.csv", header, time_stamp_record, buffer_size=config.save_data_buffer_size,
+              segment_size=config.save_data_segment_size, segment_duration=config.save_data_segment_duration,
+              compression=config.save_data_compression or None)
     register(csv.close)
 
 
+def store_frames(data: dict[str, Any]) -> None:
+    for channel, store in frame_stores.items():
+        frame = data[f"{channel}_view_base64"]
+        data[frame_column(channel)] = store.append(int(data["t"]), b64decode(frame)) if frame else None
+
+
 def retry(service: Service) -> Client:
     L.warn("Retrying connection...")
     return start_client(config.comm_addr, create_client(service.port(), callback), True)
@@ -45,6 +67,7 @@ def retry(service: Service) -> Client:
 class CommCallback(Callback):
     def __init__(self) -> None:
         super().__init__()
+        self.decoder: BinaryDecoder = BinaryDecoder()
         self.client: Client = start_client(config.comm_addr, create_client(config.comm_port, self), True)
         self.current_data: dict[str, Any] = DataContainer().to_dict()
         self.current_data.update({"report_rate": 0, "cfc_fl": 0, "cfc_fr": 0, "cfc_rl": 0, "cfc_rr": 0})
@@ -65,7 +88,18 @@ class CommCallback(Callback):
     def on_receive(self, service: Service, msg: bytes) -> None:
         self.super(service=service, msg=msg)
         try:
-            d = loads(msg.decode())
+            if is_binary(msg):
+                try:
+                    if (d := self.decoder.decode(msg)) is None:
+                        return
+                except LookupError:
+                    return self.client.send(SCHEMA_REQUEST)
+                except (StructError, BinasciiError, UnicodeDecodeError, ValueError) as e:
+                    # a truncated or corrupt frame is dropped
+                    L.debug(f"Dropped a corrupt frame: {repr(e)}")
+                    return
+            else:
+                d = loads(msg.decode())
             mg = CAR_MASS * 2.451675
             d["report_rate"] = 1000 * num_ts / (time_stamp_record[-1] - time_stamp_record[0]) if (num_ts := len(
                 time_stamp_record)) > 1 else 0
@@ -78,10 +112,11 @@ class CommCallback(Callback):
             self.current_data = d
             if config.save_data:
                 try_create_csv(d)
+                store_frames(d)
                 csv.write_frame(*(d[key] for key in csv.header()))
             else:
                 time_stamp_record.append(int(d["t"]))
-        except JSONDecodeError:
+        except (JSONDecodeError, UnicodeDecodeError):
             pass
 
     @override
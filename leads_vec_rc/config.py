@@ -9,4 +9,9 @@ class Config(_ConfigTemplate):
         self.comm_port: int = 16900
         self.data_dir: str = "data"
         self.save_data: bool = False
+        self.save_data_buffer_size: int = 64
+        self.save_data_segment_size: int = 0
+        self.save_data_segment_duration: float = 0
+        self.save_data_compression: str = ""
+        self.save_frames: bool = False
         super().__init__(base)
@@ -5,11 +5,11 @@ from typing import Any as _Any, Literal as _Literal
 
 from PIL.Image import Image as _Image, open as _open, UnidentifiedImageError as _UnidentifiedImageError
 from cv2 import VideoWriter as _VideoWriter, VideoWriter_fourcc as _VideoWriter_fourcc, cvtColor as _cvtColor, \
-    COLOR_RGB2BGR as _COLOR_RGB2BGR
-from numpy import array as _array
+    COLOR_RGB2BGR as _COLOR_RGB2BGR, imdecode as _imdecode, IMREAD_COLOR as _IMREAD_COLOR
+from numpy import ndarray as _ndarray, array as _array, frombuffer as _frombuffer, uint8 as _uint8, diff as _diff
 
 from leads import has_device as _has_device, get_device as _get_device
-from leads.data_persistence import CSVDataset as _CSVDataset
+from leads.data_persistence import CSVDataset as _CSVDataset, FrameStore as _FrameStore
 from leads_video.camera import Camera
 
 
@@ -28,6 +28,37 @@ def _decode_frame(row: dict[str, _Any], tag: str) -> _Image:
     return _open(_BytesIO(_b64decode(frame)))
 
 
+def _decode_stored_frame(store: _FrameStore, ref: int) -> _ndarray | None:
+    return _imdecode(_frombuffer(frame, _uint8), _IMREAD_COLOR) if len(frame := store[ref]) > 0 else None
+
+
+def extract_video_from_store(store: _FrameStore, file: str) -> None:
+    """
+    Write the frames of a frame store into a video without any base64 decoding.
+    :param store: the frame store of a channel
+    :param file: the output file
+    """
+    if not file.endswith(".mp4"):
+        file += ".mp4"
+    if len(store) < 1:
+        raise AttributeError("Failed to determine video resolution, frame rate, or cache")
+    fps = 1000 / d if len(store) > 1 and (d := _diff(store.time_stamps()).min()) > 0 else 1
+    # like `extract_video()`, a frame that fails to decode is replaced by the previous one, or the first decodable one
+    # if there is no previous one, so that the video keeps its duration
+    cache = None
+    for ref in range(len(store)):
+        if (cache := _decode_stored_frame(store, ref)) is not None:
+            break
+    if cache is None:
+        raise AttributeError("Failed to determine video resolution, frame rate, or cache")
+    writer = _VideoWriter(file, _VideoWriter_fourcc(*"mp4v"), fps, (cache.shape[1], cache.shape[0]))
+    for ref in range(len(store)):
+        if (frame := _decode_stored_frame(store, ref)) is not None:
+            cache = frame
+        writer.write(cache)
+    writer.release()
+
+
 def extract_video(dataset: _CSVDataset, file: str, channel: _Literal["front", "left", "right", "rear"]) -> None:
     if not file.endswith(".mp4"):
         file += ".mp4"
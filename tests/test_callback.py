@@ -0,0 +1,156 @@
+from threading import Thread
+from time import perf_counter
+from typing import Self, override
+
+from leads import DataPushedEvent, Event, EventListener, LEADS
+from leads.os import _currentframe
+
+
+class BaselineCallbackChain(object):
+    # a copy of the chain as it was before the successors were resolved at bind time
+    def __init__(self, chain: Self | None = None) -> None:
+        self._chain: BaselineCallbackChain | None = chain
+
+    def bind_chain(self, chain: Self | None) -> None:
+        self._chain = chain
+
+    def super(self, *args, **kwargs) -> None:
+        if not self._chain:
+            return
+        cf = _currentframe().f_back
+        while (cn := cf.f_code.co_name) == "super":
+            cf = cf.f_back
+        getattr(self._chain, cn)(*args, **kwargs)
+
+
+class BaselineEventListener(BaselineCallbackChain):
+    @override
+    def super(self, e: Event) -> None:
+        super().super(e)
+
+    def pre_push(self, event: DataPushedEvent) -> None: ...
+
+
+def fan_out(base: type, chain_length: int, num_events: int) -> float:
+    """
+    :return: events per second passed along a chain of listeners that all call `super()`
+    """
+
+    class Listener(base):
+        @override
+        def pre_push(self, e: DataPushedEvent) -> None:
+            self.super(e)
+
+    context = LEADS()
+    event = DataPushedEvent(context, context.data())
+    listener = base()
+    for _ in range(chain_length):
+        successor = Listener()
+        successor.bind_chain(listener)
+        listener = successor
+    start = perf_counter()
+    for _ in range(num_events):
+        listener.pre_push(event)
+    return num_events / (perf_counter() - start)
+
+
+def test_fan_out_throughput() -> None:
+    baseline = resolved = 0
+    # interleaved so that both cases see the same load on the machine
+    for _ in range(7):
+        baseline = max(baseline, fan_out(BaselineEventListener, 3, 20000))
+        resolved = max(resolved, fan_out(EventListener, 3, 20000))
+    print(f"baseline: {baseline:.0f} events/s, resolved: {resolved:.0f} events/s")
+    assert resolved > baseline
+
+
+class Recorder(EventListener):
+    def __init__(self, name: str, log: list[str]) -> None:
+        super().__init__()
+        self.name: str = name
+        self.log: list[str] = log
+
+    @override
+    def pre_push(self, event: DataPushedEvent) -> None:
+        self.log.append(self.name)
+        self.super(event)
+
+
+class HelperRecorder(Recorder):
+    @override
+    def pre_push(self, event: DataPushedEvent) -> None:
+        self.log.append(self.name)
+        self._forward(event)
+
+    def _forward(self, event: DataPushedEvent) -> None:
+        self.super(event)
+
+
+def chain(*listeners: EventListener) -> EventListener:
+    for successor, listener in zip(listeners[1:], listeners):
+        successor.bind_chain(listener)
+    return listeners[-1]
+
+
+def test_chain_order() -> None:
+    log = []
+    context = LEADS()
+    chain(Recorder("a", log), HelperRecorder("b", log), Recorder("c", log)).pre_push(
+        DataPushedEvent(context, context.data()))
+    assert log == ["c", "b", "a"]
+
+
+def test_inherited_hook() -> None:
+    log = []
+    context = LEADS()
+
+    class Child(Recorder):
+        @override
+        def pre_push(self, event: DataPushedEvent) -> None:
+            log.append("child")
+            super().pre_push(event)
+
+    chain(Recorder("a", log), Child("b", log)).pre_push(DataPushedEvent(context, context.data()))
+    assert log == ["child", "b", "a"]
+
+
+def test_threads() -> None:
+    context = LEADS()
+    event = DataPushedEvent(context, context.data())
+    counts = {"push": 0, "update": 0}
+
+    class Counter(EventListener):
+        @override
+        def pre_push(self, e: DataPushedEvent) -> None:
+            counts["push"] += 1
+
+        @override
+        def on_update(self, e: Event) -> None:
+            counts["update"] += 1
+
+    class Forwarder(EventListener):
+        @override
+        def pre_push(self, e: DataPushedEvent) -> None:
+            self.super(e)
+
+        @override
+        def on_update(self, e: Event) -> None:
+            self.super(e)
+
+    listener = chain(Counter(), Forwarder())
+    threads = [Thread(target=lambda m=m: [getattr(listener, m)(event) for _ in range(10000)])
+               for m in ("pre_push", "on_update")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert counts == {"push": 10000, "update": 10000}
+
+
+def test_outside_callback() -> None:
+    listener = chain(EventListener(), EventListener())
+    try:
+        listener.super(None)
+    except RuntimeError:
+        return
+    raise AssertionError("`super()` outside any callback method must raise")
@@ -0,0 +1,54 @@
+from numpy import arange, sin
+
+from leads.data_persistence import DataPersistence, Vector, lttb_compressor, mean_compressor, minmax_compressor
+
+
+COMPRESSORS = (mean_compressor, lttb_compressor, minmax_compressor)
+
+
+def test_max_size_holds() -> None:
+    signal = (sin(arange(600) * .05) * 10).tolist()
+    for compressor in COMPRESSORS:
+        for incremental in (False, True):
+            for crop_ratio in (2, 3, 4, 5):
+                for max_size in range(crop_ratio, 41, crop_ratio):
+                    case = f"{compressor.__name__} incremental={incremental} {max_size}/{crop_ratio}"
+                    appended = DataPersistence(max_size, crop_ratio, compressor, incremental)
+                    for e in signal:
+                        appended.append(e)
+                        assert len(appended.indexes()) <= max_size, case
+                        assert appended.last() == e, case
+                    assert len(appended) == len(signal), case
+                    assert appended.indexes() == sorted(appended.indexes()), case
+                    extended = DataPersistence(max_size, crop_ratio, compressor, incremental)
+                    for i in range(0, len(signal), 7):
+                        extended.extend(signal[i: i + 7])
+                        assert len(extended.indexes()) <= max_size, case
+                    assert len(extended) == len(signal), case
+
+
+def test_vectors() -> None:
+    for compressor in COMPRESSORS:
+        d = DataPersistence(8, 2, compressor, True)
+        for i in range(100):
+            d.append(Vector(i, -i))
+        assert len(d.indexes()) <= 8
+        assert d.last() == Vector(99, -99)
+
+
+def test_legacy_compressor() -> None:
+    def keep_every_other(sequence: dict[float, float], target_size: int) -> dict[float, float]:
+        return dict(tuple(sequence.items())[::2])
+
+    d = DataPersistence(10, 2, keep_every_other)
+    for i in range(100):
+        d.append(float(i))
+    assert len(d.indexes()) <= 10
+    assert d[0] == 0
+    assert d.last() == 99
+
+
+def test_legacy_mean_compressor() -> None:
+    assert mean_compressor({1.0: 0, 3.0: 1, 5.0: 2, 7.0: 3}, 2) == {2.0: 0, 6.0: 2}
+    sequence = {1.0: 0, 2.0: 1}
+    assert mean_compressor(sequence, 2) is sequence